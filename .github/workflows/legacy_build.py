@@ -1,14 +1,20 @@
 import os
+import sys
 import json
-import hashlib
 import time
 import logging
 import tkinter as tk
 import datetime
 import importlib.util
 import shutil
+from pathlib import Path
 from tkinter import messagebox, filedialog
 
+# This script is run by path from .github/workflows, so Python puts that
+# directory, not the repo root, on sys.path; add the root for ``modules``.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from modules.hash_service import hash_file, hash_files  # noqa: E402
+
 TARGET_DIRS = ["F:/", "D:/"]
 EXTENSIONS = [".py", ".json", ".txt", ".docx"]
 MANIFEST_FILE = "codex_manifest.json"
@@ -54,10 +60,10 @@ def validate_file(filepath):
         return False
 
 
-def get_metadata(filepath):
+def get_metadata(filepath, sha256=None):
     try:
         stat = os.stat(filepath)
-        sha256 = hashlib.sha256(open(filepath, "rb").read()).hexdigest()
+        sha256 = sha256 or hash_file(filepath)
         legal_function = classify_legal_function(filepath)
         validated = validate_file(filepath)
         return {
@@ -74,12 +80,15 @@ def get_metadata(filepath):
 
 def scan_drives():
     manifest = {}
+    paths = []
     for root_dir in TARGET_DIRS:
         for subdir, _, files in os.walk(root_dir):
             for file in files:
                 if any(file.endswith(ext) for ext in EXTENSIONS):
-                    filepath = os.path.join(subdir, file)
-                    manifest[filepath] = get_metadata(filepath)
+                    paths.append(os.path.join(subdir, file))
+    hashes = hash_files(paths)
+    for filepath in paths:
+        manifest[filepath] = get_metadata(filepath, hashes.get(filepath))
     try:
         with open(MANIFEST_FILE, "w") as out:
             json.dump(manifest, out, indent=2)
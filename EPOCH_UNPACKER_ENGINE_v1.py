@@ -3,16 +3,29 @@
 
 import zipfile
 import os
+import io
 import json
-from pathlib import Path
-from PyPDF2 import PdfReader
-from PIL import Image
-import pytesseract
+from pathlib import Path, PurePosixPath
 import hashlib
+from PIL import Image
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import threading
 import argparse
+import functools
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from modules.atomic_write import atomic_open
+from modules.epoch_queue import EpochQueue
+from modules.result_store import ResultStore
+from modules.pdf_pipeline import extract_pdf_text, read_text_layer, MIN_TEXT_CHARS, OCR_DPI, PAGE_SEPARATOR
+from modules.text_cache import TextCache, file_sha256
+from modules.parallel_unzip import unpack_parallel
+from modules.pattern_matcher import PatternMatcher
+from modules.image_preprocess import ocr_image, preprocess_image, tesseract_config, DEFAULT_SETTINGS, OCR_PRESETS
+from modules.batch_ocr import ocr_batch
+from modules.run_metrics import RunMetrics
 
 # === CONFIGURATION === #
 # Allow overriding the base working directory so this tool can
@@ -23,134 +36,573 @@ BASE_DIR = Path(os.environ.get("LITIGATION_DATA_DIR", "."))
 
 def set_base_dir(path: Path):
     """Update all file paths to use a new base directory."""
-    global BASE_DIR, EXTRACT_DIR, QUEUE_FILE, OCR_LOG, CANON_LOG, EXHIBIT_LOG, PROGRESS_FILE
+    global BASE_DIR, EXTRACT_DIR, QUEUE_FILE, LEGACY_QUEUE_FILE, OCR_LOG, CANON_LOG, EXHIBIT_LOG, PROGRESS_FILE
+    global RESULTS_FILE, RESULTS_INDEX
+    close_stores()
     BASE_DIR = Path(path)
     EXTRACT_DIR = BASE_DIR / "unzipped_epoch"
-    QUEUE_FILE = BASE_DIR / "epoch_queue.json"
+    QUEUE_FILE = BASE_DIR / "epoch_queue.db"
+    LEGACY_QUEUE_FILE = BASE_DIR / "epoch_queue.json"
     OCR_LOG = BASE_DIR / "ocr_output.json"
     CANON_LOG = BASE_DIR / "canon_flags.json"
     EXHIBIT_LOG = BASE_DIR / "exhibit_log.json"
     PROGRESS_FILE = BASE_DIR / "progress_status.json"
+    RESULTS_FILE = BASE_DIR / "epoch_results.jsonl"
+    RESULTS_INDEX = BASE_DIR / "epoch_results.idx"
 
+def close_stores():
+    """Flush and close the queue and result store for the current base directory."""
+    global _queue, _results
+    if _results is not None:
+        _results.close()
+    if _queue is not None:
+        _queue.close()
+    _queue = None
+    _results = None
+
+_queue = None
+_results = None
 set_base_dir(BASE_DIR)
 
 # === UTILITIES === #
-def sha256_hash(text):
-    return hashlib.sha256(text.encode('utf-8')).hexdigest()
-
-def load_queue():
-    if QUEUE_FILE.exists():
-        with open(QUEUE_FILE, 'r') as f:
-            return json.load(f)
-    return {"index": []}
-
-def save_queue(queue):
-    with open(QUEUE_FILE, 'w') as f:
-        json.dump(queue, f, indent=2)
-
-def log_ocr(filename, content):
-    logs = {}
-    if OCR_LOG.exists():
-        with open(OCR_LOG, 'r') as f:
-            logs = json.load(f)
-    logs[filename] = content
-    with open(OCR_LOG, 'w') as f:
-        json.dump(logs, f, indent=2)
+def get_queue():
+    """Open the SQLite work queue, importing a legacy JSON queue on first use.
+
+    Items a previous run claimed but never finished are returned to pending,
+    so an interrupted run resumes where it stopped.
+    """
+    global _queue
+    if _queue is None:
+        _queue = EpochQueue(QUEUE_FILE)
+        if LEGACY_QUEUE_FILE.exists():
+            _queue.import_legacy(LEGACY_QUEUE_FILE)
+            LEGACY_QUEUE_FILE.rename(LEGACY_QUEUE_FILE.with_suffix(".json.migrated"))
+        resumed = _queue.requeue_processing()
+        if resumed:
+            print(f"Resuming: returned {resumed} interrupted items to the queue")
+    return _queue
+
+def get_results():
+    """Open the append-only result store that replaces the per-file JSON logs."""
+    global _results
+    if _results is None:
+        _results = ResultStore(RESULTS_FILE, RESULTS_INDEX)
+    return _results
+
+def log_result(filename, text, canon_flags, exhibit_tags, hits=None):
+    get_results().append(filename, text, canon_flags, exhibit_tags, hits)
+
+def export_logs():
+    """Write the legacy OCR, canon and exhibit JSON logs from the result store."""
+    count = get_results().export_legacy(OCR_LOG, CANON_LOG, EXHIBIT_LOG)
+    print(f"Exported {count} results to {OCR_LOG}, {CANON_LOG} and {EXHIBIT_LOG}")
+    return count
 
 def log_progress(status):
-    with open(PROGRESS_FILE, 'w') as f:
+    """Write the progress file atomically so readers never see a partial write."""
+    with atomic_open(PROGRESS_FILE, fsync=True) as f:
         json.dump(status, f, indent=2)
 
+# === CANON + EXHIBIT TRIGGERS === #
+# Both trigger sets are compiled into one matcher so each document is scanned
+# once.  They can be extended without code changes through a JSON file with
+# "canon_triggers" (list of terms) and/or "exhibit_keywords"
+# ({exhibit type: [terms]}), located via `EPOCH_TRIGGERS_FILE`.
+TRIGGERS_FILE = Path(os.environ.get(
+    "EPOCH_TRIGGERS_FILE", Path(__file__).resolve().parent / "config" / "epoch_triggers.json"))
+CANON_TRIGGERS = ["bias", "impartiality", "canon", "due process", "appearance of impropriety", "judicial misconduct"]
+EXHIBIT_KEYWORDS = {
+    "Rent Ledger": ["rent", "balance", "amount due", "ledger"],
+    "Utility Bill": ["electric", "water", "sewer", "usage", "trash"],
+    "Eviction Notice": ["notice to quit", "7-day", "termination", "possession"],
+    "Judicial Order": ["order", "signed by judge", "court order"],
+    "Custody Record": ["parenting time", "custody", "visitation"]
+}
+CANON_CATEGORY = "canon"
+EXHIBIT_PREFIX = "exhibit:"
+_triggers = None
+
+def load_triggers():
+    """Return the canon terms and a pattern matcher over all triggers."""
+    global _triggers
+    if _triggers is None:
+        canon, exhibits = CANON_TRIGGERS, EXHIBIT_KEYWORDS
+        if TRIGGERS_FILE.exists():
+            with open(TRIGGERS_FILE, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            canon = config.get("canon_triggers", canon)
+            exhibits = config.get("exhibit_keywords", exhibits)
+        groups = {CANON_CATEGORY: canon}
+        groups.update({EXHIBIT_PREFIX + exhibit_type: terms for exhibit_type, terms in exhibits.items()})
+        _triggers = ([term.lower() for term in canon], PatternMatcher(groups))
+    return _triggers
+
+def classify_text(text):
+    """Scan a document once for every trigger.
+
+    Returns:
+        The canon flags, the exhibit types and the raw hits as
+        ``[start, end, term]`` offsets into the lowercased text.
+    """
+    canon_terms, matcher = load_triggers()
+    hits = matcher.find_all(text)
+    found = {hit.term for hit in hits if CANON_CATEGORY in hit.categories}
+    flags = [f"\u26a0\ufe0f Canon Flag: '{term}'" for term in canon_terms if term in found]
+    exhibit_types = {c[len(EXHIBIT_PREFIX):] for hit in hits for c in hit.categories if c.startswith(EXHIBIT_PREFIX)}
+    return flags, list(exhibit_types), [[hit.start, hit.end, hit.term] for hit in hits]
+
 def run_canon_validator(text):
-    flags = []
-    canon_triggers = ["bias", "impartiality", "canon", "due process", "appearance of impropriety", "judicial misconduct"]
-    for term in canon_triggers:
-        if term in text.lower():
-            flags.append(f"\u26a0\ufe0f Canon Flag: '{term}'")
-    return flags
-
-def log_canon(filename, flags):
-    logs = {}
-    if CANON_LOG.exists():
-        with open(CANON_LOG, 'r') as f:
-            logs = json.load(f)
-    logs[filename] = flags
-    with open(CANON_LOG, 'w') as f:
-        json.dump(logs, f, indent=2)
+    return classify_text(text)[0]
 
 def run_exhibit_classifier(text):
-    classifications = []
-    keywords = {
-        "Rent Ledger": ["rent", "balance", "amount due", "ledger"],
-        "Utility Bill": ["electric", "water", "sewer", "usage", "trash"],
-        "Eviction Notice": ["notice to quit", "7-day", "termination", "possession"],
-        "Judicial Order": ["order", "signed by judge", "court order"],
-        "Custody Record": ["parenting time", "custody", "visitation"]
-    }
-    for exhibit_type, triggers in keywords.items():
-        for word in triggers:
-            if word in text.lower():
-                classifications.append(exhibit_type)
-                break
-    return list(set(classifications))
-
-def log_exhibit(filename, types):
-    logs = {}
-    if EXHIBIT_LOG.exists():
-        with open(EXHIBIT_LOG, 'r') as f:
-            logs = json.load(f)
-    logs[filename] = types
-    with open(EXHIBIT_LOG, 'w') as f:
-        json.dump(logs, f, indent=2)
+    return classify_text(text)[1]
 
 # === ZIP UNPACKER === #
-def unpack_zip(zip_path):
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+ARCHIVE_SUFFIXES = ('.zip',)
+STREAM_BUFFER_LIMIT = 64 * 1024 * 1024
+NESTED_SEPARATOR = "!/"
+ENQUEUE_BATCH = 500
+
+def member_parts(filename):
+    parts = [p for p in PurePosixPath(filename.replace('\\', '/')).parts if p not in ('/', '.', '..')]
+    if parts and parts[0].endswith(':'):
+        parts = parts[1:]
+    return parts
+
+def member_name(prefix, filename):
+    """Queue name of an archive member: always relative, so never mistaken for a watched file."""
+    return prefix + "/".join(member_parts(filename))
+
+def member_path(filename):
+    """Map an archive member name to a safe path under ``EXTRACT_DIR``."""
+    return EXTRACT_DIR.joinpath(*member_parts(filename))
+
+def item_path(filename):
+    """Locate a queued file: watched files are queued by absolute path, archive members relative to ``EXTRACT_DIR``."""
+    return Path(filename) if os.path.isabs(filename) else member_path(filename)
+
+def read_member(zip_ref, info):
+    """Hash a member while reading it, buffering it in memory when small enough.
+
+    Returns:
+        The SHA-256 of the member and its bytes, or ``None`` for members over
+        ``STREAM_BUFFER_LIMIT``.
+    """
+    digest = hashlib.sha256()
+    buffer = io.BytesIO() if info.file_size <= STREAM_BUFFER_LIMIT else None
+    with zip_ref.open(info) as member:
+        for chunk in iter(lambda: member.read(1024 * 1024), b""):
+            digest.update(chunk)
+            if buffer is not None:
+                buffer.write(chunk)
+    return digest.hexdigest(), buffer.getvalue() if buffer is not None else None
+
+def materialize(zip_ref, info, name, data):
+    target = member_path(name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if data is not None:
+        target.write_bytes(data)
+    else:
+        with zip_ref.open(info) as member, open(target, 'wb') as out:
+            for chunk in iter(lambda: member.read(1024 * 1024), b""):
+                out.write(chunk)
+
+def ingest_member(zip_ref, info, name, file_hash, data, stream=False):
+    """Decide what to do with a member that is not in the queue yet.
+
+    Nested archives are written out so they can be unpacked in turn.  In
+    streaming mode, text members and PDFs with a full text layer are
+    classified straight from memory; everything else (images, scanned or
+    unreadable PDFs, oversized members, or any member when not streaming) is
+    written to ``EXTRACT_DIR`` for the OCR workers.
+
+    Returns:
+        A record for ``commit_records`` whose status is ``"archive"``,
+        ``"done"`` (with text and classifications) or ``"pending"``.
+    """
+    lower = name.lower()
+    if lower.endswith(ARCHIVE_SUFFIXES):
+        materialize(zip_ref, info, name, data)
+        return {"filename": name, "hash": file_hash, "status": "archive"}
+    text = None
+    if stream and data is not None and not lower.endswith(IMAGE_SUFFIXES):
+        if lower.endswith('.pdf'):
+            try:
+                texts, missing = read_text_layer(io.BytesIO(data))
+            except Exception:
+                # The OCR workers try it again and record the error for this file only.
+                missing = True
+            if not missing:
+                text = PAGE_SEPARATOR.join(texts)
+                get_text_cache().put(TextCache.make_key(file_hash, PDF_EXTRACTOR, PDF_SETTINGS), text)
+        else:
+            text = data.decode('utf-8', errors='ignore')
+    if text is None:
+        materialize(zip_ref, info, name, data)
+        return {"filename": name, "hash": file_hash, "status": "pending"}
+    canon_flags, exhibit_tags, hits = classify_text(text)
+    return {
+        "filename": name,
+        "hash": file_hash,
+        "status": "done",
+        "text": text.strip(),
+        "canon": canon_flags,
+        "exhibits": exhibit_tags,
+        "hits": hits,
+    }
+
+def commit_records(records):
+    """Queue a batch of new members with ``enqueue_many`` and store the parsed ones."""
+    queue = get_queue()
+    queue.enqueue_many((r["filename"], r["hash"]) for r in records if r["status"] == "pending")
+    queue.enqueue_many(((r["filename"], r["hash"]) for r in records if r["status"] != "pending"), status="done")
+    for record in records:
+        if record["status"] == "done":
+            log_result(record["filename"], record["text"], record["canon"], record["exhibits"], record["hits"])
+
+def unpack_zip(zip_path, stream=False, workers=1, prefix=""):
+    """Queue every new member of an archive, recursing into nested archives.
+
+    Members are queued ``ENQUEUE_BATCH`` at a time, and nested archives are
+    unpacked once their parent's members are committed.  With ``stream``
+    set, members are parsed from memory instead of being extracted first.
+    With more than one worker the archive is decompressed by
+    ``unpack_zip_parallel``.
+    """
+    if workers > 1:
+        return unpack_zip_parallel(zip_path, stream, workers)
+    queue = get_queue()
+    seen = set()
+    batch = []
+    nested = []
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+            file_hash, data = read_member(zip_ref, info)
+            if file_hash in seen or queue.contains(file_hash):
+                continue
+            seen.add(file_hash)
+            record = ingest_member(zip_ref, info, member_name(prefix, info.filename), file_hash, data, stream)
+            batch.append(record)
+            if record["status"] == "archive":
+                nested.append(record["filename"])
+            if len(batch) >= ENQUEUE_BATCH:
+                commit_records(batch)
+                batch = []
+    commit_records(batch)
+    for name in nested:
+        unpack_zip(member_path(name), stream, prefix=name + NESTED_SEPARATOR)
+    get_results().flush()
+
+# === PARALLEL UNPACKER === #
+_seen_queue = None
+
+def unpack_member_range(zip_path, indices, prefix, stream=False):
+    """Worker entry point: hash and ingest a range of members of one archive.
+
+    Each worker opens the archive itself and skips members already in a
+    read-only view of the queue or earlier in its range; the parent commits
+    the returned records.
+    """
+    global _seen_queue
+    if _seen_queue is None:
+        _seen_queue = EpochQueue(QUEUE_FILE, readonly=True)
+    seen = set()
+    records = []
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        file_list = zip_ref.namelist()
-        queue = load_queue()
-        for file in file_list:
-            file_hash = sha256_hash(file)
-            if not any(q["hash"] == file_hash for q in queue["index"]):
-                zip_ref.extract(file, EXTRACT_DIR)
-                queue["index"].append({"filename": file, "hash": file_hash, "status": "pending"})
-        save_queue(queue)
+        infos = zip_ref.infolist()
+        for index in indices:
+            info = infos[index]
+            file_hash, data = read_member(zip_ref, info)
+            if file_hash in seen or _seen_queue.contains(file_hash):
+                continue
+            seen.add(file_hash)
+            records.append(ingest_member(zip_ref, info, member_name(prefix, info.filename), file_hash, data, stream))
+    return records
+
+def unpack_zip_parallel(zip_path, stream=False, workers=None):
+    """Decompress an archive across worker processes, balanced by compressed size.
+
+    Each finished range is committed as one batch.  Workers cannot see each
+    other's members, so copies of the same content in different ranges are
+    dropped here and the files they extracted are removed.
+    """
+    get_queue()
+    kept = {}
+
+    def on_records(records):
+        fresh = []
+        for record in records:
+            first = kept.get(record["hash"])
+            if first is None:
+                kept[record["hash"]] = record["filename"]
+                fresh.append(record)
+            elif record["status"] != "done" and member_path(record["filename"]) != member_path(first):
+                member_path(record["filename"]).unlink(missing_ok=True)
+        commit_records(fresh)
+        nested = [r["filename"] for r in fresh if r["status"] == "archive"]
+        return [(member_path(name), name + NESTED_SEPARATOR) for name in nested]
+
+    unpack_parallel(
+        zip_path,
+        functools.partial(unpack_member_range, stream=stream),
+        on_records,
+        workers=workers,
+        initializer=set_base_dir,
+        initargs=(BASE_DIR,),
+    )
+    get_results().flush()
 
 # === OCR + Canon + Exhibit Processor === #
-def process_next_file():
-    queue = load_queue()
-    for item in queue["index"]:
-        if item["status"] == "pending":
-            full_path = EXTRACT_DIR / item["filename"]
-            try:
-                if str(full_path).lower().endswith(".pdf"):
-                    reader = PdfReader(full_path)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() or ""
-                elif str(full_path).lower().endswith(('.png', '.jpg', '.jpeg')):
-                    image = Image.open(full_path)
-                    text = pytesseract.image_to_string(image)
-                else:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        text = f.read()
-
-                log_ocr(item["filename"], text.strip())
-                canon_flags = run_canon_validator(text)
-                log_canon(item["filename"], canon_flags)
-                exhibit_tags = run_exhibit_classifier(text)
-                log_exhibit(item["filename"], exhibit_tags)
-
-                item["status"] = "done"
-                save_queue(queue)
-                log_progress({"current": item["filename"], "status": "done"})
-                return item["filename"]
-            except Exception as e:
-                item["status"] = "error"
-                item["error"] = str(e)
-                save_queue(queue)
-                log_progress({"current": item["filename"], "status": f"error: {e}"})
-                return None
-    return None
+PDF_EXTRACTOR = "pdf_pipeline/1"
+IMAGE_EXTRACTOR = "tesseract/2"
+# Image pre-processing and tesseract preset; see modules.image_preprocess.
+OCR_SETTINGS = dict(DEFAULT_SETTINGS)
+PDF_SETTINGS = {"min_chars": MIN_TEXT_CHARS, "dpi": OCR_DPI}
+_text_cache = None
+
+def get_text_cache():
+    """Open the shared text cache once per process."""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+def extract_text(full_path, page_workers=None, content_hash=None, ocr_settings=None, timings=None):
+    """Extract text, serving PDFs and images from the content-addressed cache.
+
+    When ``timings`` is given, seconds spent in tesseract are added to its
+    ``"ocr"`` entry.
+    """
+    name = str(full_path).lower()
+    ocr_settings = ocr_settings or OCR_SETTINGS
+    if name.endswith(".pdf"):
+        return get_text_cache().get_or_extract(
+            full_path, PDF_EXTRACTOR, lambda p: extract_text_uncached(p, page_workers, timings=timings),
+            PDF_SETTINGS, content_hash
+        )
+    if name.endswith(IMAGE_SUFFIXES):
+        return get_text_cache().get_or_extract(
+            full_path, IMAGE_EXTRACTOR, lambda p: extract_text_uncached(p, ocr_settings=ocr_settings, timings=timings),
+            ocr_settings, content_hash
+        )
+    return extract_text_uncached(full_path)
+
+def extract_text_uncached(full_path, page_workers=None, ocr_settings=None, timings=None):
+    if str(full_path).lower().endswith(".pdf"):
+        text = extract_pdf_text(full_path, workers=page_workers, timings=timings)
+    elif str(full_path).lower().endswith(IMAGE_SUFFIXES):
+        started = time.perf_counter()
+        text = ocr_image(full_path, ocr_settings or OCR_SETTINGS)
+        if timings is not None:
+            timings["ocr"] = timings.get("ocr", 0.0) + time.perf_counter() - started
+    else:
+        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+    return text
+
+def analyze_file(item, full_path, page_workers=None, ocr_settings=None):
+    """Extract and classify one queued file.
+
+    Runs in worker processes, so it only touches its arguments and returns
+    everything the parent needs to commit.  ``page_workers`` bounds the page
+    pool used for scanned PDFs; pool workers pass 1 to avoid nesting pools.
+    Every result carries the file size and the seconds spent per stage.
+    """
+    timings = {}
+    started = time.perf_counter()
+    try:
+        text = extract_text(full_path, page_workers, content_hash_of(item), ocr_settings, timings)
+    except Exception as e:
+        return {"filename": item["filename"], "hash": item["hash"], "error": str(e), "bytes": file_size(full_path)}
+    timings["extract"] = time.perf_counter() - started - timings.get("ocr", 0.0)
+    return build_result(item, text, timings, file_size(full_path))
+
+def content_hash_of(item):
+    return None if item["hash"].startswith("legacy:") else item["hash"]
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def build_result(item, text, timings, nbytes):
+    started = time.perf_counter()
+    canon_flags, exhibit_tags, hits = classify_text(text)
+    timings["classify"] = time.perf_counter() - started
+    return {
+        "filename": item["filename"],
+        "hash": item["hash"],
+        "text": text.strip(),
+        "canon": canon_flags,
+        "exhibits": exhibit_tags,
+        "hits": hits,
+        "bytes": nbytes,
+        "timings": timings,
+    }
+
+IMAGE_BATCH_SIZE = 32
+
+def analyze_image_batch(items, paths, ocr_settings=None):
+    """Extract and classify a batch of images with one tesseract process.
+
+    Cached images are served from the text cache; the rest are pre-processed
+    and OCR'd together through a tesseract list file, falling back to one
+    call per image if the batch run fails.
+    """
+    ocr_settings = ocr_settings or OCR_SETTINGS
+    cache = get_text_cache()
+    texts, misses, images, timings = {}, [], [], {}
+    for item, path in zip(items, paths):
+        started = time.perf_counter()
+        timings[item["hash"]] = {}
+        try:
+            key = TextCache.make_key(content_hash_of(item) or file_sha256(path), IMAGE_EXTRACTOR, ocr_settings)
+            cached = cache.get(key)
+            if cached is None:
+                images.append(preprocess_image(Image.open(path), ocr_settings))
+                misses.append((item, key))
+            else:
+                texts[item["hash"]] = cached
+        except Exception as e:
+            texts[item["hash"]] = e
+        timings[item["hash"]]["extract"] = time.perf_counter() - started
+    started = time.perf_counter()
+    ocr_texts = ocr_batch(images, tesseract_config(ocr_settings), IMAGE_BATCH_SIZE, return_exceptions=True)
+    ocr_seconds = (time.perf_counter() - started) / max(len(misses), 1)
+    for (item, key), text in zip(misses, ocr_texts):
+        if not isinstance(text, Exception):
+            cache.put(key, text)
+        texts[item["hash"]] = text
+        timings[item["hash"]]["ocr"] = ocr_seconds
+    results = []
+    for item, path in zip(items, paths):
+        text = texts[item["hash"]]
+        if isinstance(text, Exception):
+            results.append({"filename": item["filename"], "hash": item["hash"], "error": str(text),
+                            "bytes": file_size(path), "timings": timings[item["hash"]]})
+        else:
+            results.append(build_result(item, text, timings[item["hash"]], file_size(path)))
+    return results
+
+def analyze_files(items, paths, ocr_settings=None):
+    """Pool entry point for non-image files; returns one result per item."""
+    return [analyze_file(item, path, 1, ocr_settings) for item, path in zip(items, paths)]
+
+def submit_items(pool, items):
+    """Submit claimed items, grouping images so tesseract starts once per batch.
+
+    Returns:
+        ``(future, items)`` pairs; every future resolves to a list of results.
+    """
+    images = [item for item in items if item["filename"].lower().endswith(IMAGE_SUFFIXES)]
+    others = [item for item in items if not item["filename"].lower().endswith(IMAGE_SUFFIXES)]
+    submitted = []
+    for start in range(0, len(images), IMAGE_BATCH_SIZE):
+        batch = images[start:start + IMAGE_BATCH_SIZE]
+        paths = [item_path(item["filename"]) for item in batch]
+        submitted.append((pool.submit(analyze_image_batch, batch, paths, OCR_SETTINGS), batch))
+    for item in others:
+        future = pool.submit(analyze_files, [item], [item_path(item["filename"])], OCR_SETTINGS)
+        submitted.append((future, [item]))
+    return submitted
+
+def process_next_file(metrics=None):
+    queue = get_queue()
+    item = queue.next_pending()
+    if item is None:
+        return None
+    result = analyze_file(item, item_path(item["filename"]))
+    if metrics is not None:
+        metrics.record(result["bytes"], result.get("timings"), "error" in result)
+    stats = metrics.snapshot() if metrics is not None else {}
+    if "error" in result:
+        queue.mark_error(item["hash"], result["error"])
+        log_progress({"current": item["filename"], "status": f"error: {result['error']}", **stats})
+        return None
+    log_result(item["filename"], result["text"], result["canon"], result["exhibits"], result["hits"])
+    queue.mark_done(item["hash"])
+    log_progress({"current": item["filename"], "status": "done", **stats})
+    return item["filename"]
+
+PROGRESS_INTERVAL = 2.0
+
+def process_pending(workers=None, on_progress=None, commit_every=200):
+    """Process every pending queue item across a pool of worker processes.
+
+    Images are OCR'd in batches of ``IMAGE_BATCH_SIZE``; other files are
+    submitted one by one.  At most ``workers * IMAGE_BATCH_SIZE`` items are
+    claimed and in flight at once.  Finished
+    items are written to the result store as they arrive and their queue
+    status is committed every ``commit_every`` files.  Throughput, per-stage
+    latency and the ETA are passed to ``on_progress(processed, total,
+    filename, metrics)`` and written to ``PROGRESS_FILE`` every
+    ``PROGRESS_INTERVAL`` seconds.
+
+    Returns:
+        The number of files processed, including ones that failed.
+    """
+    workers = workers or os.cpu_count() or 1
+    queue = get_queue()
+    results = get_results()
+    total = queue.counts().get("pending", 0)
+    max_in_flight = workers * max(4, IMAGE_BATCH_SIZE)
+    in_flight = {}
+    in_flight_items = 0
+    done, errors = [], []
+    processed = 0
+    metrics = RunMetrics(total)
+    last_report = time.monotonic()
+
+    def commit():
+        results.flush()
+        queue.mark_many(done, errors)
+        done.clear()
+        errors.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                if in_flight_items < max_in_flight:
+                    claimed = queue.claim(max_in_flight - in_flight_items)
+                    for future, items in submit_items(pool, claimed):
+                        in_flight[future] = items
+                    in_flight_items += len(claimed)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    items = in_flight.pop(future)
+                    in_flight_items -= len(items)
+                    try:
+                        batch_results = future.result()
+                    except Exception as e:
+                        batch_results = [{"filename": i["filename"], "hash": i["hash"], "error": str(e)} for i in items]
+                    for item, result in zip(items, batch_results):
+                        metrics.record(result.get("bytes", 0), result.get("timings"), "error" in result)
+                        if "error" in result:
+                            errors.append((item["hash"], result["error"]))
+                        else:
+                            results.append(
+                                item["filename"], result["text"], result["canon"], result["exhibits"], result["hits"]
+                            )
+                            done.append(item["hash"])
+                        processed += 1
+                        if on_progress:
+                            on_progress(processed, total, item["filename"], metrics)
+                if len(done) + len(errors) >= commit_every:
+                    commit()
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    log_progress({"current": item["filename"], "status": "running", **metrics.snapshot()})
+    finally:
+        commit()
+        queue.release(item["hash"] for items in in_flight.values() for item in items)
+    log_progress({"status": "done", **metrics.snapshot()})
+    return processed
 
 # === GUI === #
 def run_gui():
@@ -165,14 +617,12 @@ def run_gui():
             zip_path = zip_entry.get()
             if not EXTRACT_DIR.exists():
                 EXTRACT_DIR.mkdir(parents=True)
-            unpack_zip(zip_path)
-            processed = 0
-            while True:
-                result = process_next_file()
-                if not result:
-                    break
-                processed += 1
-                progress_var.set(f"Processed {processed} files...")
+            unpack_zip(zip_path, stream=stream_var.get(), workers=int(workers_var.get()))
+
+            def report(processed, total, filename, metrics):
+                progress_var.set(metrics.summary())
+
+            process_pending(workers=int(workers_var.get()), on_progress=report)
             progress_var.set("All files processed.")
             messagebox.showinfo("Done", "All files processed.")
         threading.Thread(target=run, daemon=True).start()
@@ -180,26 +630,75 @@ def run_gui():
     window = tk.Tk()
     window.title("EPOCH UNPACKER | Litigation OS Panel")
     progress_var = tk.StringVar(value="Idle")
+    workers_var = tk.StringVar(value=str(os.cpu_count() or 1))
+    stream_var = tk.BooleanVar(value=False)
     tk.Label(window, text="ZIP File Path:").pack()
     zip_entry = tk.Entry(window, width=60)
     zip_entry.pack()
     tk.Button(window, text="Browse", command=select_file).pack()
+    tk.Label(window, text="OCR Workers:").pack()
+    tk.Spinbox(window, from_=1, to=64, textvariable=workers_var, width=5).pack()
+    tk.Checkbutton(window, text="Stream from archive (no extraction)", variable=stream_var).pack()
     tk.Button(window, text="Start Scan", command=start_processing).pack()
     tk.Label(window, textvariable=progress_var).pack()
     window.mainloop()
 
 # === HEADLESS MODE === #
-def run_headless(zip_path):
+def run_headless(zip_path, workers=1, stream=False):
     if not EXTRACT_DIR.exists():
         EXTRACT_DIR.mkdir(parents=True)
-    unpack_zip(zip_path)
+    unpack_zip(zip_path, stream=stream, workers=workers)
+    if workers > 1:
+        def report(processed, total, filename, metrics):
+            print(f"{metrics.summary()} | {filename}")
+
+        process_pending(workers=workers, on_progress=report)
+        print("All files processed.")
+        return
+    metrics = RunMetrics(get_queue().counts().get("pending", 0))
     while True:
-        result = process_next_file()
+        result = process_next_file(metrics)
         if not result:
             break
-        print(f"Processed {result}")
+        print(f"{metrics.summary()} | {result}")
+    get_results().flush()
     print("All files processed.")
 
+# === WATCH MODE === #
+WATCH_EXTENSIONS = ('.pdf', '.txt', '.docx') + IMAGE_SUFFIXES
+OCR_EXTENSIONS = ('.pdf', '.txt') + IMAGE_SUFFIXES
+
+def run_watch(paths, workers=1, index_path=None):
+    """OCR and classify evidence as it lands in the watched folders.
+
+    Each batch of changes from the drop-folder watcher updates the scan
+    index, queues new and modified files by content hash and runs them
+    through the worker pool, so nothing waits for a full rescan.
+    """
+    from scanner.scan_index import DEFAULT_INDEX
+    from scanner.watcher import DropFolderWatcher, ScanIndexUpdater, enqueue_files
+    from scanner.walker import DEFAULT_EXTENSIONS
+
+    updater = ScanIndexUpdater(index_path or DEFAULT_INDEX, DEFAULT_EXTENSIONS)
+
+    def on_batch(batch):
+        changes = updater.apply(batch)
+        arrived = [p for p in changes["added"] + changes["modified"] if p.lower().endswith(OCR_EXTENSIONS)]
+        if enqueue_files(get_queue(), arrived):
+            process_pending(workers=workers)
+        print(f"{len(changes['added'])} added, {len(changes['modified'])} modified, "
+              f"{len(changes['removed'])} removed")
+
+    with DropFolderWatcher(paths, on_batch, WATCH_EXTENSIONS) as watcher:
+        print(f"Watching {', '.join(watcher.paths)}; Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    updater.close()
+    get_results().flush()
+
 # === ENTRY POINT === #
 def parse_args():
     parser = argparse.ArgumentParser(description="EPOCH Unpacker")
@@ -211,13 +710,32 @@ def parse_args():
     proc_p = sub.add_parser("process", help="Process ZIP without GUI")
     proc_p.add_argument('zip', help='Path to ZIP archive to process')
     proc_p.add_argument('--dir', default=str(EXTRACT_DIR), help='Base directory for extracted files and logs')
+    proc_p.add_argument('--workers', type=int, default=1, help='Number of worker processes for unpacking and OCR')
+    proc_p.add_argument('--ocr-preset', choices=sorted(OCR_PRESETS), default=DEFAULT_SETTINGS["preset"],
+                        help='Tesseract engine/page-segmentation preset for images')
+    proc_p.add_argument('--no-preprocess', action='store_true', help='OCR images at full resolution, unmodified')
+    proc_p.add_argument('--detect-orientation', action='store_true', help='Correct image rotation with tesseract OSD')
+    proc_p.add_argument('--stream', action='store_true',
+                        help='Parse members straight from the archive instead of extracting them')
+
+    watch_p = sub.add_parser("watch", help="OCR and classify new evidence as it lands in watched folders")
+    watch_p.add_argument('paths', nargs='+', help='Drives or folders to watch')
+    watch_p.add_argument('--dir', default=str(BASE_DIR), help='Base directory for the queue and results')
+    watch_p.add_argument('--workers', type=int, default=1, help='Number of worker processes for OCR')
+    watch_p.add_argument('--index', help='Scan index database to keep current (default: data/scan_index.db)')
+
+    export_p = sub.add_parser("export", help="Write legacy OCR/canon/exhibit JSON logs from the result store")
+    export_p.add_argument('--dir', default=str(BASE_DIR), help='Base directory for extracted files and logs')
 
     parser.add_argument('--reset', action='store_true', help='Clear cached logs and queue')
     return parser.parse_args()
 
 
 def reset_logs():
-    for path in [QUEUE_FILE, OCR_LOG, CANON_LOG, EXHIBIT_LOG, PROGRESS_FILE]:
+    close_stores()
+    wal_files = [QUEUE_FILE.with_name(QUEUE_FILE.name + suffix) for suffix in ("-wal", "-shm")]
+    result_files = [RESULTS_FILE, RESULTS_INDEX, OCR_LOG, CANON_LOG, EXHIBIT_LOG]
+    for path in [QUEUE_FILE, *wal_files, LEGACY_QUEUE_FILE, *result_files, PROGRESS_FILE]:
         if path.exists():
             path.unlink()
 
@@ -230,8 +748,17 @@ if __name__ == '__main__':
 
     if args.command == 'process':
         set_base_dir(Path(args.dir))
-        run_headless(args.zip)
+        OCR_SETTINGS.update(preset=args.ocr_preset, enabled=not args.no_preprocess,
+                            detect_orientation=args.detect_orientation)
+        run_headless(args.zip, workers=args.workers, stream=args.stream)
+    elif args.command == 'watch':
+        set_base_dir(Path(args.dir))
+        run_watch(args.paths, workers=args.workers, index_path=args.index)
+    elif args.command == 'export':
+        set_base_dir(Path(args.dir))
+        export_logs()
     else:
         if args.command == 'gui' and hasattr(args, 'dir'):
             set_base_dir(Path(args.dir))
         run_gui()
+    close_stores()
@@ -5,7 +5,6 @@ import sys
 import json
 import argparse
 import logging
-import hashlib
 import smtplib
 import threading
 from email.message import EmailMessage
@@ -26,6 +25,7 @@ from db_repo import PostgresDBRepo, DBRepository
 from metrics import doc_build_counter
 from behavior_manager import BehaviorManager
 from alerts import send_sms, send_email
+from modules.hash_service import hash_file
 
 # === Logging Configuration ===
 logger = logging.getLogger('LitigationEngine')
@@ -74,8 +74,7 @@ class GPTClient:
 
 # === SHA256 Hasher ===
 def compute_sha256(path):
-    with open(path, 'rb') as f:
-        return hashlib.sha256(f.read()).hexdigest()
+    return hash_file(path)
 
 # === Evidence Pipeline with GPTClient, Prefect, and Logging ===
 def run_evidence_pipeline(case_num: str, cfg: ConfigSchema, db: DBRepository):
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""CLI entrypoint for benchmarking OCR image pre-processing."""
+import sys
+from pathlib import Path
+
+# Ensure repo root is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import argparse
+import json
+from modules.image_preprocess import DEFAULT_SETTINGS, OCR_PRESETS
+from scripts.benchmark_ocr import benchmark_preprocessing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare OCR latency and accuracy with and without pre-processing",
+        epilog="Every sample image needs a <name>.txt ground-truth transcript beside it; "
+               "accuracy is the similarity of each OCR output to that transcript.",
+    )
+    parser.add_argument("samples", help="Directory of sample images, each with a <name>.txt ground truth")
+    parser.add_argument("--preset", choices=sorted(OCR_PRESETS), default=DEFAULT_SETTINGS["preset"])
+    parser.add_argument("--target-dpi", type=int, default=DEFAULT_SETTINGS["target_dpi"])
+    parser.add_argument("--no-binarize", action="store_true", help="Skip adaptive binarization")
+    parser.add_argument("-o", "--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = benchmark_preprocessing(
+            args.samples,
+            {"preset": args.preset, "target_dpi": args.target_dpi, "binarize": not args.no_binarize},
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{'file':40} {'raw s':>8} {'prep s':>8} {'raw acc':>8} {'prep acc':>8}")
+    for row in report["samples"]:
+        print(f"{row['file'][:40]:40} {row['raw_seconds']:8.2f} {row['processed_seconds']:8.2f} "
+              f"{row['raw_accuracy']:8.3f} {row['processed_accuracy']:8.3f}")
+    if report["speedup"]:
+        print(f"Speedup: {report['speedup']:.2f}x, mean accuracy {report['mean_raw_accuracy']:.3f} raw, "
+              f"{report['mean_accuracy']:.3f} pre-processed")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,21 @@
-import hashlib
 import json
 from pathlib import Path
 
 from modules.codex_guardian import run_guardian
 from modules.codex_supreme import self_diagnostic
+from modules.hash_service import hash_file as _hash_file, hash_files
 
 MANIFEST = "codex_manifest.json"
 
 
 def hash_file(path: Path) -> str:
-    data = path.read_bytes()
-    return hashlib.sha256(data).hexdigest()
+    return _hash_file(path)
 
 
 def update_manifest():
-    manifest = []
-    for p in Path(".").rglob("*.py"):
-        if p.parts[0].startswith("."):  # skip hidden dirs
-            continue
-        manifest.append({"module": p.stem, "path": str(p), "hash": hash_file(p)})
+    paths = [p for p in Path(".").rglob("*.py") if not p.parts[0].startswith(".")]  # skip hidden dirs
+    hashes = hash_files(paths)
+    manifest = [{"module": p.stem, "path": str(p), "hash": hashes[str(p)]} for p in paths if str(p) in hashes]
     Path(MANIFEST).write_text(json.dumps(manifest, indent=2))
 
 
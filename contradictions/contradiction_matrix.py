@@ -1,25 +1,219 @@
+import heapq
 import json
 import os
+from itertools import chain, groupby, islice
+
+from modules.atomic_write import write_json_array
+from modules.hash_service import hash_files
+from scanner.scan_index import BATCH_SIZE, DEFAULT_INDEX, open_index
 
 OUTPUT_PATH = os.path.join('data', 'contradiction_matrix.json')
 
+SAME_NAME_DIFFERENT_CONTENT = 'same name, different content'
+SAME_CONTENT_DIFFERENT_NAMES = 'same content, different names'
+IDENTICAL_COPIES = 'identical copies'
+# Same name where some copies could not be hashed, so the content is unknown.
+DUPLICATE_FILENAME = 'duplicate filename'
+# Written from the OCR text by ``contradictions.near_duplicates`` and
+# ``contradictions.fact_index`` respectively.
+NEAR_DUPLICATE_TEXT = 'near-duplicate text'
+CONFLICTING_FACTS = 'conflicting facts'
+TEXT_KINDS = (NEAR_DUPLICATE_TEXT, CONFLICTING_FACTS)
+
+# Change sets touching more names or hashes than this rebuild the matrix;
+# the grouped queries over the whole index are cheaper than long IN lists.
+MAX_UPDATE_KEYS = 500
+# Characters read at a time when streaming an existing matrix.
+READ_CHUNK = 1 << 16
+
+# The matrix is a list of groups, one per shared name or shared content:
+#   {"contradiction": kind, "basename": name,
+#    "files": [{"path": ..., "size": ..., "hash": ...}, ...]}
+#   {"contradiction": "same content, different names", "hash": sha256, "size": n,
+#    "files": [{"path": ..., "basename": ...}, ...]}
+#   {"contradiction": "near-duplicate text", "similarity": 0.0-1.0,
+#    "files": [{"path": ...}, {"path": ...}]}
+#   {"contradiction": "conflicting facts", "kind": ..., "label": ..., "entity": ...,
+#    "files": [{"path": ..., "value": ..., "offset": ...}, ...]}
+# Name groups come first in name order, then content groups in hash order,
+# then near-duplicate pairs, most similar first, then fact conflicts by key.
+
+
+def hash_candidates(index, batch_size=BATCH_SIZE):
+    """Hash the indexed files that share a name or a size with another file.
+
+    Hashes are stored in the index and cleared when a file changes, so
+    each file is read at most once between changes.
+    """
+    paths = index.iter_unhashed_duplicates()
+    while True:
+        batch = list(islice(paths, batch_size))
+        if not batch:
+            return
+        index.set_hashes(hash_files(batch).items())
+
+
+def name_group(basename, rows):
+    hashes = {row['hash'] for row in rows}
+    if None in hashes:
+        kind = SAME_NAME_DIFFERENT_CONTENT if len(hashes) > 2 else DUPLICATE_FILENAME
+    else:
+        kind = IDENTICAL_COPIES if len(hashes) == 1 else SAME_NAME_DIFFERENT_CONTENT
+    files = [{'path': row['path'], 'size': row['size'], 'hash': row['hash']} for row in rows]
+    return {'contradiction': kind, 'basename': basename, 'files': files}
+
+
+def content_group(file_hash, rows):
+    files = [{'path': row['path'], 'basename': row['basename']} for row in rows]
+    return {'contradiction': SAME_CONTENT_DIFFERENT_NAMES, 'hash': file_hash, 'size': rows[0]['size'],
+            'files': files}
+
+
+def group_key(group):
+    if group.get('contradiction') == CONFLICTING_FACTS:
+        return (3, group['kind'], group['label'], group['entity'])
+    if group.get('contradiction') == NEAR_DUPLICATE_TEXT:
+        return (2, -group['similarity'], *(entry['path'] for entry in group['files']))
+    if 'basename' in group:
+        return (0, group['basename'])
+    return (1, group['hash'])
+
+
+def is_text_group(group):
+    return group.get('contradiction') in TEXT_KINDS
+
+
+def iter_groups(index, basenames=None, hashes=None):
+    """Yield matrix groups from the index's grouped queries.
+
+    Rows arrive sorted by their group key, so each group is built from a
+    run of consecutive rows and yielded before the next run is read.
+
+    Args:
+        basenames, hashes: Only build the groups for these keys.
+    """
+    if basenames is None or basenames:
+        for basename, rows in groupby(index.iter_name_groups(basenames), key=lambda row: row['basename']):
+            yield name_group(basename, list(rows))
+    if hashes is None or hashes:
+        for file_hash, rows in groupby(index.iter_content_groups(hashes), key=lambda row: row['hash']):
+            yield content_group(file_hash, list(rows))
 
-def detect_contradictions(index_path='data/scan_index.json', output_path=OUTPUT_PATH):
-    matrix = []
+
+def read_groups(path, chunk_size=READ_CHUNK):
+    """Yield the groups of the matrix at ``path`` one at a time.
+
+    The array is decoded element by element from fixed-size reads, so
+    memory is bounded by the largest group rather than the whole matrix.
+    """
+    decoder = json.JSONDecoder()
+    with open(path) as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith('['):
+            raise ValueError(f'{path} is not a JSON array')
+        buf = buf[1:]
+        while True:
+            buf = buf.lstrip()
+            if buf.startswith(','):
+                buf = buf[1:].lstrip()
+            if buf.startswith(']'):
+                return
+            try:
+                group, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buf += chunk
+                continue
+            yield group
+            buf = buf[end:]
+
+
+def update_groups(matrix_path, index, changes):
+    """Apply a scan change set to the matrix at ``matrix_path``.
+
+    Groups keyed by the name or content of a changed file are rebuilt from
+    the index; the rest are streamed from the existing matrix as they are.
+    The matrix is read twice, once for the hashes of the touched groups and
+    once while merging, so neither pass holds more than one group.
+
+    Returns:
+        An iterator of groups, or ``None`` if the change set is large enough
+        that rebuilding the matrix is cheaper.
+    """
+    touched = set(changes.get('removed', ())) | set(changes.get('added', ())) | set(changes.get('modified', ()))
+    names = {os.path.basename(path) for path in touched}
+    hashes = {row['hash'] for row in index.get_many(sorted(touched)).values() if row['hash']}
+    for group in read_groups(matrix_path):
+        for entry in group['files']:
+            if entry['path'] in touched:
+                hashes.add(group.get('hash') or entry.get('hash'))
+    hashes.discard(None)
+    if len(names) + len(hashes) > MAX_UPDATE_KEYS:
+        return None
+    kept = (g for g in read_groups(matrix_path)
+            if g.get('basename') not in names and g.get('hash') not in hashes
+            and not any(entry['path'] in touched for entry in g['files']))
+    fresh = iter_groups(index, sorted(names), sorted(hashes))
+    return heapq.merge(kept, fresh, key=group_key)
+
+
+def replace_text_groups(kind, groups, output_path=OUTPUT_PATH):
+    """Swap the groups of contradiction ``kind`` in the matrix at ``output_path`` for ``groups``.
+
+    The existing matrix is streamed into the merge rather than loaded.
+    """
+    existing = ()
+    if os.path.exists(output_path):
+        existing = (g for g in read_groups(output_path) if 'files' in g and g.get('contradiction') != kind)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    return write_groups(heapq.merge(existing, sorted(groups, key=group_key), key=group_key), output_path)
+
+
+def write_groups(groups, output):
+    """Stream groups to ``output`` as an indented JSON array, replacing it atomically once complete."""
+    return write_json_array(groups, output)
+
+
+def detect_contradictions(index_path=DEFAULT_INDEX, output_path=OUTPUT_PATH, changes=None):
+    """Write the contradiction matrix for the scan index.
+
+    Files are grouped by name and by content hash with SQL ``GROUP BY``
+    rather than compared pairwise, and only files sharing a name or size
+    with another file are hashed.  Each group is reported once, as
+    same-name/different-content, same-content/different-names, or
+    identical copies.
+
+    With the change set of an incremental scan as ``changes``, the existing
+    matrix is updated for the names and contents of the changed files only.
+    Groups found in the OCR text by ``contradictions.near_duplicates`` and
+    ``contradictions.fact_index`` are kept.
+    A legacy ``scan_index.json`` is still accepted as ``index_path``.
+
+    Returns:
+        The number of groups written.
+    """
     if not os.path.exists(index_path):
-        return matrix
-    with open(index_path) as f:
-        docs = json.load(f)
-    paths = list(docs.keys())
-    for i, a in enumerate(paths):
-        for b in paths[i+1:]:
-            if a.split('/')[-1] == b.split('/')[-1]:
-                matrix.append({'file_a': a, 'file_b': b, 'contradiction': 'duplicate filename'})
+        return 0
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(matrix, f, indent=2)
-    print(f'Contradiction matrix written to {output_path}')
-    return matrix
+    existing = False
+    if os.path.exists(output_path):
+        first = next(read_groups(output_path), None)
+        # Matrices written before grouping listed pairs; those are rebuilt.
+        existing = first is not None and 'files' in first
+    with open_index(index_path) as index:
+        hash_candidates(index)
+        groups = update_groups(output_path, index, changes) if changes is not None and existing else None
+        if groups is None:
+            # Near-duplicate and fact groups come from the OCR text, not the
+            # index, and are kept until their own stages run again.
+            text_groups = (g for g in read_groups(output_path) if is_text_group(g)) if existing else ()
+            groups = chain(iter_groups(index), text_groups)
+        count = write_groups(groups, output_path)
+    print(f'Contradiction matrix written to {output_path} with {count} groups')
+    return count
+
 
 if __name__ == '__main__':
     detect_contradictions()
@@ -0,0 +1,272 @@
+import os
+import re
+import sqlite3
+from bisect import bisect_right
+from itertools import groupby
+from pathlib import Path
+
+from contradictions.contradiction_matrix import CONFLICTING_FACTS, OUTPUT_PATH, group_key, replace_text_groups
+from contradictions.near_duplicates import RESULTS_FILE, result_texts
+from modules.document_digests import DocumentDigests
+from modules.pattern_matcher import PatternMatcher
+from timeline.date_extraction import SENTENCE_BREAK, find_dates
+from timeline.fusion_engine import DEFAULT_EVENTS
+
+DEFAULT_INDEX = os.path.join('data', 'fact_index.db')
+BATCH_SIZE = 500
+
+# A value takes the label of the nearest label term at most this many
+# characters before it in the same sentence, and the entity of the nearest entity mention within
+# ``ENTITY_WINDOW`` characters before it, or failing that after it.
+LABEL_WINDOW = 80
+ENTITY_WINDOW = 200
+
+LABELS = {
+    'rent': ['rent', 'monthly rent', 'lot rent', 'site rent'],
+    'deposit': ['deposit', 'security deposit'],
+    'late fee': ['late fee', 'late charge'],
+    'balance': ['balance', 'amount due', 'past due', 'arrears', 'owed'],
+    'payment': ['payment', 'paid'],
+    'shutoff': ['shutoff', 'shut off', 'shut-off', 'disconnected', 'disconnection'],
+    'eviction': ['eviction', 'writ', 'judgment of possession', 'lockout'],
+    'notice': ['notice', 'notified'],
+    'hearing': ['hearing', 'trial', 'court date'],
+    'lease': ['lease', 'rental agreement', 'tenancy'],
+    'move-in': ['move-in', 'moved in', 'move in'],
+}
+LABEL_OF = {term: label for label, terms in LABELS.items() for term in terms}
+KNOWN_ENTITIES = sorted({event['entity'] for event in DEFAULT_EVENTS} | {'Shady Oaks', 'EGLE'})
+
+CORPORATE_SUFFIXES = {'llc', 'inc', 'corp', 'corporation', 'company', 'co'}
+
+AMOUNT = re.compile(r'\$\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{2}))?(?!\d)')
+LOT = re.compile(r'\b(?:lot|site|space)\s*(?:no\.?|number|#)?\s*(\d+[a-z]?)\b', re.IGNORECASE)
+ORGANIZATION = re.compile(
+    r"\b((?:[A-Z][\w&'.-]*,?\s+(?:(?:of|the|and|&)\s+)?){1,4}"
+    r"(?:LLC|L\.L\.C\.|Inc\.?|Corp\.?|Corporation|Company|Association|Authority|Department|Court))\b"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    value TEXT NOT NULL,
+    file TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_facts_key ON facts (kind, label, entity, value, file);
+CREATE INDEX IF NOT EXISTS idx_facts_file ON facts (file);
+CREATE TABLE IF NOT EXISTS documents (
+    file TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+"""
+
+# A key is a conflict when it holds more than one value and those values
+# come from more than one document; a single notice saying rent went "from
+# $395 to $695" is a change, not a contradiction.
+CONFLICTS = """
+SELECT f.kind, f.label, f.entity, f.value, f.file, MIN(f.offset)
+FROM facts f
+JOIN (SELECT kind, label, entity FROM facts GROUP BY kind, label, entity
+      HAVING COUNT(DISTINCT value) > 1 AND COUNT(DISTINCT file) > 1) k
+  ON f.kind = k.kind AND f.label = k.label AND f.entity = k.entity
+GROUP BY f.kind, f.label, f.entity, f.value, f.file
+ORDER BY f.kind, f.label, f.entity, f.value, f.file
+"""
+
+_label_matcher = PatternMatcher(LABELS)
+_entity_matcher = PatternMatcher({'entity': KNOWN_ENTITIES})
+
+
+def _whole_words(text, hits):
+    """Drop matcher hits that start or end inside a word ("rent" in "current")."""
+    for hit in hits:
+        before = text[hit.start - 1] if hit.start else ' '
+        after = text[hit.end] if hit.end < len(text) else ' '
+        if not before.isalnum() and not after.isalnum():
+            yield hit
+
+
+def normalize_entity(name):
+    """Lower-case ``name`` and drop a corporate suffix, so "Homes of America, LLC" keys as "homes of america"."""
+    words = name.lower().replace('.', '').replace(',', ' ').split()
+    while len(words) > 1 and words[-1] in CORPORATE_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def find_values(text):
+    """Yield ``(kind, value, offset)`` for every amount, lot number and date in ``text``."""
+    for match in AMOUNT.finditer(text):
+        yield 'amount', f"{int(match.group(1).replace(',', ''))}.{match.group(2) or '00'}", match.start()
+    for match in LOT.finditer(text):
+        yield 'lot', match.group(1).upper(), match.start()
+    for value, offset, _ in find_dates(text):
+        yield 'date', value, offset
+
+
+def find_entities(text):
+    """Return ``(offset, normalized_name)`` for every entity mention, sorted by offset."""
+    mentions = [(hit.start, hit.term) for hit in _whole_words(text.lower(), _entity_matcher.find_all(text))]
+    mentions.extend((match.start(), match.group(1)) for match in ORGANIZATION.finditer(text))
+    return sorted((offset, normalize_entity(name)) for offset, name in mentions)
+
+
+def extract_facts(text):
+    """Extract ``(kind, label, entity, value, offset)`` facts from one document.
+
+    Lot numbers are labelled ``lot``; amounts and dates take the nearest
+    preceding label term in the same sentence, and those with none are
+    dropped, because a bare "$50" cannot contradict anything.
+    """
+    lowered = text.lower()
+    labels = sorted((hit.end, LABEL_OF[hit.term]) for hit in _whole_words(lowered, _label_matcher.find_all(text)))
+    label_ends = [end for end, _ in labels]
+    entities = find_entities(text)
+    entity_offsets = [offset for offset, _ in entities]
+    facts = []
+    for kind, value, offset in find_values(text):
+        if kind == 'lot':
+            label = 'lot'
+        else:
+            i = bisect_right(label_ends, offset) - 1
+            if i < 0 or offset - label_ends[i] > LABEL_WINDOW or SENTENCE_BREAK.search(text, label_ends[i], offset):
+                continue
+            label = labels[i][1]
+        entity = ''
+        i = bisect_right(entity_offsets, offset) - 1
+        if i >= 0 and offset - entity_offsets[i] <= ENTITY_WINDOW:
+            entity = entities[i][1]
+        elif i + 1 < len(entities) and entity_offsets[i + 1] - offset <= ENTITY_WINDOW:
+            entity = entities[i + 1][1]
+        facts.append((kind, label, entity, value, offset))
+    return facts
+
+
+class FactIndex:
+    """Facts extracted from the OCR text, indexed by ``(kind, label, entity, value)``.
+
+    The key index keeps facts sorted, so the conflicts are found by one
+    grouped scan over it instead of comparing documents pairwise.  Each
+    document's text digest is recorded so unchanged documents are skipped
+    when the index is refreshed.
+    """
+
+    def __init__(self, db_path=DEFAULT_INDEX):
+        self.db_path = str(db_path)
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def digests(self, files):
+        return DocumentDigests(self.conn).known(files)
+
+    def replace_documents(self, documents):
+        """Store the facts of ``(file, digest, facts)`` documents, replacing their previous facts."""
+        with self.conn:
+            for file, digest, facts in documents:
+                self.conn.execute("DELETE FROM facts WHERE file = ?", (file,))
+                self.conn.executemany(
+                    "INSERT INTO facts VALUES (?, ?, ?, ?, ?, ?)",
+                    ((kind, label, entity, value, file, offset) for kind, label, entity, value, offset in facts),
+                )
+                self.conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?)", (file, digest))
+
+    def remove_documents(self, files):
+        """Drop the facts and digests of ``files``."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM facts WHERE file = ?", ((file,) for file in files))
+            self.conn.executemany("DELETE FROM documents WHERE file = ?", ((file,) for file in files))
+
+    def update(self, records, batch_size=BATCH_SIZE):
+        """Extract facts from ``(file, text)`` records whose text changed since the last update.
+
+        Documents no longer in ``records`` lose their facts.
+
+        Returns:
+            The number of documents (re-)indexed.
+        """
+        digests = DocumentDigests(self.conn)
+        indexed = 0
+        for changed in digests.changed(records, batch_size):
+            self.replace_documents([(file, digest, extract_facts(text)) for file, digest, text in changed])
+            indexed += len(changed)
+        gone = digests.gone()
+        if gone:
+            self.remove_documents(gone)
+        return indexed
+
+    def facts_for(self, kind, label, entity=''):
+        """Return ``(value, file, offset)`` for one key, in value order."""
+        return self.conn.execute(
+            "SELECT value, file, offset FROM facts WHERE kind = ? AND label = ? AND entity = ? ORDER BY value, file",
+            (kind, label, entity),
+        ).fetchall()
+
+    def conflicts(self):
+        """Yield one contradiction-matrix group per key with disagreeing values across documents."""
+        rows = self.conn.execute(CONFLICTS)
+        for (kind, label, entity), facts in groupby(rows, key=lambda row: row[:3]):
+            yield {
+                'contradiction': CONFLICTING_FACTS,
+                'kind': kind,
+                'label': label,
+                'entity': entity,
+                'files': [{'path': file, 'value': value, 'offset': offset} for *_, value, file, offset in facts],
+            }
+
+
+def detect_fact_conflicts(results_path=RESULTS_FILE, index_path=DEFAULT_INDEX, matrix_path=OUTPUT_PATH):
+    """Index the facts in the OCR results and add their conflicts to the contradiction matrix.
+
+    Dates, dollar amounts and lot numbers are pulled out with compiled
+    regexes, labelled by the nearest term such as "rent" or "shutoff" and
+    attributed to the nearest named entity.  Keys holding different values
+    in different documents replace the previous fact conflicts in
+    ``matrix_path``.
+
+    Returns:
+        The number of conflicting keys.
+    """
+    if not Path(results_path).exists():
+        print(f'No OCR results at {results_path}; run the unpacker first.')
+        return 0
+    with FactIndex(index_path) as index:
+        indexed = index.update(result_texts(results_path))
+        groups = sorted(index.conflicts(), key=group_key)
+    replace_text_groups(CONFLICTING_FACTS, groups, matrix_path)
+    print(f'Indexed facts from {indexed} changed documents; {len(groups)} conflicts written to {matrix_path}')
+    return len(groups)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find documents that disagree on dates, amounts and lot numbers')
+    parser.add_argument('--results', default=str(RESULTS_FILE), help='Unpacker result store (epoch_results.jsonl)')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Fact index database')
+    parser.add_argument('--matrix', default=OUTPUT_PATH, help='Contradiction matrix to update')
+    parser.add_argument('--show', nargs=2, metavar=('KIND', 'LABEL'), help='List the indexed values for one key')
+    parser.add_argument('--entity', default='', help='Entity for --show')
+    args = parser.parse_args()
+    if args.show:
+        with FactIndex(args.index) as index:
+            for value, file, offset in index.facts_for(*args.show, normalize_entity(args.entity)):
+                print(f'{value:>12}  {file}:{offset}')
+    else:
+        detect_fact_conflicts(args.results, args.index, args.matrix)
@@ -0,0 +1,222 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from zlib import crc32
+
+import numpy as np
+
+from contradictions.contradiction_matrix import NEAR_DUPLICATE_TEXT, OUTPUT_PATH, group_key, replace_text_groups
+from modules.result_store import ResultStore
+
+BASE_DIR = Path(os.environ.get('LITIGATION_DATA_DIR', '.'))
+RESULTS_FILE = BASE_DIR / 'epoch_results.jsonl'
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+THRESHOLD = 0.8
+# Documents shorter than this are OCR noise, cover sheets and the like;
+# they match each other far more often than they matter.
+MIN_TOKENS = 20
+# Buckets larger than this are linked as a star around their first member
+# instead of pairwise, so boilerplate shared by thousands of documents
+# cannot blow up the candidate count.
+MAX_BUCKET = 100
+BATCH_SIZE = 2048
+SHINGLE_CHUNK = 4096
+SEED = 1
+
+SHIFT = np.uint64(32)
+MIX = np.uint64(0x9E3779B97F4A7C15)
+TOKEN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=4)
+def permutations(num_perm=NUM_PERM, seed=SEED):
+    """Coefficients of the multiply-shift hashes ``(a*x + b) >> 32`` standing in for permutations.
+
+    With random 64-bit ``a`` (odd) and ``b`` this family is universal over
+    32-bit inputs and needs no modulo, which keeps signatures cheap.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2)
+    return a[:, None], b[:, None]
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Return the distinct 32-bit hashes of the ``k``-word shingles of ``text``.
+
+    Words are lower-cased so OCR and re-typing differences in case do not
+    count; consecutive word hashes are combined with a vectorised
+    polynomial hash.
+    """
+    tokens = TOKEN.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return np.empty(0, dtype=np.uint64)
+    words = np.fromiter((crc32(t.encode('utf-8')) for t in tokens), dtype=np.uint64, count=len(tokens))
+    count = len(words) - k + 1
+    combined = words[:count].copy()
+    for offset in range(1, k):
+        combined = combined * MIX + words[offset:offset + count]
+    return np.unique((combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+
+def minhash(text, num_perm=NUM_PERM, k=SHINGLE_SIZE, seed=SEED):
+    """MinHash signature of ``text`` as ``num_perm`` uint32 values, or ``None`` if it is too short."""
+    values = shingles(text, k)
+    if not len(values):
+        return None
+    a, b = permutations(num_perm, seed)
+    signature = np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(values), SHINGLE_CHUNK):
+        chunk = values[start:start + SHINGLE_CHUNK]
+        np.minimum(signature, ((a * chunk + b) >> SHIFT).min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def choose_bands(num_perm, threshold):
+    """Pick ``(bands, rows)`` for banded LSH.
+
+    The largest band height whose detection threshold ``(1/bands)**(1/rows)``
+    is at or below ``threshold`` keeps recall high; false candidates are
+    dropped when signatures are compared.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def candidate_pairs(signatures, bands, rows):
+    """Find document pairs sharing at least one LSH band.
+
+    Each band is reduced to one 64-bit key per document, and the keys are
+    sorted; runs of equal keys are the buckets.  Work is ``O(n log n)`` per
+    band instead of comparing all pairs.
+
+    Returns:
+        A ``(m, 2)`` array of distinct index pairs ``i < j``.
+    """
+    n = len(signatures)
+    found = []
+    for band in range(bands):
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys = keys * MIX + column.astype(np.uint64)
+        order = np.argsort(keys, kind='stable')
+        ordered = keys[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        ends = np.r_[starts[1:], n]
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = order[start:end]
+            if len(members) > MAX_BUCKET:
+                first = np.full(len(members) - 1, members[0])
+                found.append(np.column_stack([first, members[1:]]))
+            else:
+                i, j = np.triu_indices(len(members), k=1)
+                found.append(np.column_stack([members[i], members[j]]))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def similar_pairs(signatures, threshold=THRESHOLD, chunk=65536):
+    """Yield ``(i, j, similarity)`` for candidates whose estimated Jaccard similarity reaches ``threshold``."""
+    bands, rows = choose_bands(signatures.shape[1], threshold)
+    pairs = candidate_pairs(signatures, bands, rows)
+    for start in range(0, len(pairs), chunk):
+        block = pairs[start:start + chunk]
+        scores = (signatures[block[:, 0]] == signatures[block[:, 1]]).mean(axis=1)
+        for (i, j), score in zip(block[scores >= threshold], scores[scores >= threshold]):
+            yield int(i), int(j), float(score)
+
+
+def signatures_for(records, workers=None, num_perm=NUM_PERM):
+    """Compute signatures for ``(name, text)`` records.
+
+    Texts are handed to a process pool ``BATCH_SIZE`` at a time, so the
+    whole corpus is never in memory; only the signatures are kept.
+
+    Returns:
+        ``(names, signatures)`` for the documents long enough to compare.
+    """
+    names, rows = [], []
+    records = iter(records)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        while True:
+            batch = list(islice(records, BATCH_SIZE))
+            if not batch:
+                break
+            texts = [text for _, text in batch]
+            results = pool.map(minhash, texts, chunksize=64) if pool else map(minhash, texts)
+            for (name, _), signature in zip(batch, results):
+                if signature is not None:
+                    names.append(name)
+                    rows.append(signature)
+    finally:
+        if pool:
+            pool.shutdown()
+    signatures = np.vstack(rows) if rows else np.empty((0, num_perm), dtype=np.uint32)
+    return names, signatures
+
+
+def near_duplicate_groups(records, threshold=THRESHOLD, workers=None):
+    """Return contradiction-matrix groups for near-duplicate texts, most similar first."""
+    names, signatures = signatures_for(records, workers)
+    groups = []
+    for i, j, score in similar_pairs(signatures, threshold):
+        a, b = sorted((names[i], names[j]))
+        groups.append({'contradiction': NEAR_DUPLICATE_TEXT, 'similarity': round(score, 3),
+                       'files': [{'path': a}, {'path': b}]})
+    groups.sort(key=group_key)
+    return groups
+
+
+def result_texts(results_path=RESULTS_FILE):
+    """Stream ``(filename, text)`` from the unpacker's result store."""
+    with ResultStore(Path(results_path)) as store:
+        for record in store.records():
+            yield record['filename'], record.get('text') or ''
+
+
+def detect_near_duplicates(results_path=RESULTS_FILE, matrix_path=OUTPUT_PATH, threshold=THRESHOLD, workers=None):
+    """Find near-duplicate documents in the OCR results and add them to the contradiction matrix.
+
+    Re-scans, re-saved PDFs and lightly edited copies hash differently but
+    share most of their text.  Documents are compared by MinHash signatures
+    of their word shingles, and candidates come from banded LSH, so the
+    work grows near-linearly with the number of documents.  Each pair is a
+    group with its estimated ``similarity``, replacing the near-duplicate
+    groups of the previous run in ``matrix_path``.
+
+    Returns:
+        The number of near-duplicate pairs found.
+    """
+    if not Path(results_path).exists():
+        print(f'No OCR results at {results_path}; run the unpacker first.')
+        return 0
+    groups = near_duplicate_groups(result_texts(results_path), threshold, workers)
+    replace_text_groups(NEAR_DUPLICATE_TEXT, groups, matrix_path)
+    print(f'{len(groups)} near-duplicate pairs written to {matrix_path}')
+    return len(groups)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find near-duplicate documents in the OCR results')
+    parser.add_argument('--results', default=str(RESULTS_FILE), help='Unpacker result store (epoch_results.jsonl)')
+    parser.add_argument('--matrix', default=OUTPUT_PATH, help='Contradiction matrix to update')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Minimum estimated text similarity')
+    parser.add_argument('--workers', type=int, help='Signature processes (default: one per CPU)')
+    args = parser.parse_args()
+    detect_near_duplicates(args.results, args.matrix, args.threshold, args.workers)
@@ -1,4 +1,3 @@
-import os
 import tkinter as tk
 from tkinter import ttk
 from tkinterweb import HtmlFrame
@@ -6,7 +5,11 @@ from warboard.warboard_engine import deploy_supra_warboard
 from warboard.ppo_warboard import build_ppo_warboard
 from warboard.custody_interference_engine import build_custody_warboard
 from scheduling.scheduler import build_schedule
+from scheduling.scheduler import load_events as load_schedule
 from gui.modules.entity_suppression_feed import load_events
+from timeline.columnar import ColumnarTimeline
+from warboard.lod_renderer import MAX_LEVEL, TiledWarboard
+from warboard.svg_renderer import motion_href
 
 
 def launch_dashboard():
@@ -40,11 +43,36 @@ def launch_dashboard():
     suppression_text = tk.Text(suppression_tab)
     suppression_text.pack(fill='both', expand=True)
 
+    # Zoomable view of the timeline: level 0 is the whole timeline and each
+    # zoom halves the span shown; tiles are rendered as they are visited.
+    board = {'tiles': None, 'level': 0, 'x': 0}
+
+    def show_tile():
+        with open(board['tiles'].tile(board['level'], board['x'])) as f:
+            frame.set_content(f.read())
+
     def refresh_warboard():
         deploy_supra_warboard()
+        if ColumnarTimeline.exists():
+            board.update(tiles=TiledWarboard.from_columns(link=motion_href), level=0, x=0)
         with open('warboard/exports/SHADY_OAKS_WARBOARD.svg') as f:
             frame.set_content(f.read())
 
+    def zoom(step):
+        if board['tiles'] is None:
+            return
+        if step > 0 and board['level'] < MAX_LEVEL:
+            board.update(level=board['level'] + 1, x=board['x'] * 2)
+        elif board['level'] > 0:
+            board.update(level=board['level'] - 1, x=board['x'] // 2)
+        show_tile()
+
+    def pan(step):
+        if board['tiles'] is None:
+            return
+        board['x'] = max(0, min(board['x'] + step, (1 << board['level']) - 1))
+        show_tile()
+
     def refresh_ppo():
         build_ppo_warboard()
         with open('warboard/exports/PPO_WARBOARD.svg') as f:
@@ -57,13 +85,9 @@ def launch_dashboard():
 
     def refresh_schedule():
         build_schedule()
-        if os.path.exists('data/timeline.json'):
-            import json
-            with open('data/timeline.json') as f:
-                events = json.load(f)
-            schedule_text.delete('1.0', tk.END)
-            for e in events:
-                schedule_text.insert(tk.END, f"{e['date']} - {e['description']}\n")
+        schedule_text.delete('1.0', tk.END)
+        for e in load_schedule():
+            schedule_text.insert(tk.END, f"{e['date']} - {e['description']}\n")
 
     def refresh_suppression():
         events = load_events()
@@ -72,6 +96,12 @@ def launch_dashboard():
             suppression_text.insert(tk.END, f"{ev['entity']}: {ev['action']}\n")
 
     ttk.Button(warboard_tab, text='Build Warboard', command=refresh_warboard).pack(pady=5)
+    zoom_bar = ttk.Frame(warboard_tab)
+    zoom_bar.pack(pady=5)
+    ttk.Button(zoom_bar, text='◀', command=lambda: pan(-1)).pack(side='left')
+    ttk.Button(zoom_bar, text='Zoom Out', command=lambda: zoom(-1)).pack(side='left')
+    ttk.Button(zoom_bar, text='Zoom In', command=lambda: zoom(1)).pack(side='left')
+    ttk.Button(zoom_bar, text='▶', command=lambda: pan(1)).pack(side='left')
     ttk.Button(ppo_tab, text='Build PPO Warboard', command=refresh_ppo).pack(pady=5)
     ttk.Button(custody_tab, text='Build Custody Map', command=refresh_custody).pack(pady=5)
     ttk.Button(schedule_tab, text='Sync From File', command=refresh_schedule).pack(pady=5)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from typing import IO, Any, Iterable, Iterator, Union
+
+PathLike = Union[str, os.PathLike]
+
+
+@contextmanager
+def atomic_open(path: PathLike, mode: str = "w", fsync: bool = False) -> Iterator[IO[Any]]:
+    """Open a temporary file beside ``path`` that replaces it when the block completes.
+
+    Readers see either the old file or the new one, never a partial write.
+    If the block raises, the temporary file is removed and ``path`` is left
+    as it was.
+
+    Args:
+        fsync: Flush the data to disk before the replace.
+    """
+    tmp = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_json_array(items: Iterable[Any], path: PathLike) -> int:
+    """Stream ``items`` to ``path`` in the layout ``json.dump(items, f, indent=2)`` produces.
+
+    The file is replaced atomically once complete.
+
+    Returns:
+        The number of items written.
+    """
+    count = 0
+    with atomic_open(path) as f:
+        f.write("[")
+        for item in items:
+            body = json.dumps(item, indent=2).replace("\n", "\n  ")
+            f.write(f"{',' if count else ''}\n  {body}")
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import shlex
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from PIL import Image
+
+PAGE_BREAK = "@@EPOCH_PAGE_BREAK@@"
+DEFAULT_BATCH_SIZE = 32
+
+ImageSource = Union[str, Path, Image.Image]
+
+
+def _tesseract_cmd() -> str:
+    import pytesseract
+
+    return pytesseract.pytesseract.tesseract_cmd
+
+
+def _split_pages(output: str, expected: int) -> Optional[List[str]]:
+    """Split list-file output into per-image texts, or ``None`` if counts disagree."""
+    pages = output.split(PAGE_BREAK)
+    if len(pages) == expected + 1 and not pages[-1].strip():
+        pages = pages[:-1]
+    if len(pages) != expected:
+        return None
+    return pages
+
+
+def ocr_list_file(images: Sequence[Image.Image], config: str = "", timeout: Optional[float] = None) -> List[str]:
+    """OCR several images with a single tesseract process.
+
+    The images are written to a temporary directory and passed to tesseract as
+    a list file, so the engine and language data are loaded once for the
+    whole batch.  A unique page separator splits the output back per image.
+
+    Raises:
+        RuntimeError: If tesseract fails or its output cannot be split.
+    """
+    with tempfile.TemporaryDirectory(prefix="epoch_ocr_") as tmp:
+        paths = []
+        for number, image in enumerate(images):
+            path = Path(tmp) / f"{number:06d}.png"
+            image.save(path)
+            paths.append(str(path))
+        list_file = Path(tmp) / "images.txt"
+        list_file.write_text("\n".join(paths) + "\n", encoding="utf-8")
+        cmd = [_tesseract_cmd(), str(list_file), "stdout", "-c", f"page_separator={PAGE_BREAK}", *shlex.split(config)]
+        proc = subprocess.run(cmd, capture_output=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", errors="ignore").strip() or "tesseract failed")
+    pages = _split_pages(proc.stdout.decode("utf-8", errors="ignore"), len(images))
+    if pages is None:
+        raise RuntimeError("tesseract output does not match the number of images")
+    return [page.strip() for page in pages]
+
+
+def ocr_batch(
+    images: Sequence[ImageSource],
+    config: str = "",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    timeout: Optional[float] = None,
+    return_exceptions: bool = False,
+) -> List[Union[str, Exception]]:
+    """OCR many images, ``batch_size`` per tesseract run.
+
+    A batch that fails as a whole is retried image by image with
+    ``pytesseract`` so one unreadable file cannot sink its neighbours.
+
+    Returns:
+        The text of each image, in input order.  With ``return_exceptions``
+        an image that also fails on its own yields its exception instead of
+        raising it.
+    """
+    import pytesseract
+
+    opened = [image if isinstance(image, Image.Image) else Image.open(image) for image in images]
+    texts: List[Union[str, Exception]] = []
+    for start in range(0, len(opened), batch_size):
+        batch = opened[start:start + batch_size]
+        try:
+            texts.extend(ocr_list_file(batch, config, timeout))
+            continue
+        except (RuntimeError, OSError, subprocess.TimeoutExpired):
+            pass
+        for image in batch:
+            try:
+                texts.append(pytesseract.image_to_string(image, config=config, timeout=timeout or 0).strip())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                texts.append(e)
+    return texts
@@ -1,26 +1,37 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from PyPDF2 import PdfReader
 
+from modules.text_cache import TextCache
 
-def load_benchbook_texts(directory: str) -> Dict[str, str]:
+EXTRACTOR = "benchbook_text_layer/1"
+
+
+def _extract_text(pdf_path: Path) -> str:
+    reader = PdfReader(str(pdf_path))
+    content = ""
+    for page in reader.pages:
+        content += page.extract_text() or ""
+    return content
+
+
+def load_benchbook_texts(directory: str, cache: Optional[TextCache] = None) -> Dict[str, str]:
     """Load text from all PDF benchbooks in a directory.
 
     Args:
         directory: Path to a directory containing benchbook PDFs.
+        cache: Text cache to consult before parsing a PDF. Defaults to the
+            shared cache used by the epoch unpacker.
 
     Returns:
         A mapping of PDF file names to their extracted text.
     """
     dir_path = Path(directory)
+    cache = cache if cache is not None else TextCache()
     texts: Dict[str, str] = {}
     for pdf_path in dir_path.glob("*.pdf"):
-        reader = PdfReader(str(pdf_path))
-        content = ""
-        for page in reader.pages:
-            content += page.extract_text() or ""
-        texts[pdf_path.name] = content
+        texts[pdf_path.name] = cache.get_or_extract(pdf_path, EXTRACTOR, _extract_text)
     return texts
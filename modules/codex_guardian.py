@@ -1,10 +1,11 @@
-import hashlib
 import json
 import os
 import re
 import subprocess
 from pathlib import Path
 
+from modules.hash_service import hash_file as _hash_file, hash_files
+
 MANIFEST_FILE = "codex_manifest.json"
 BANNED_KEYWORDS = ["TODO", "WIP", "temp_var", "placeholder"]
 
@@ -22,7 +23,7 @@ def get_last_commit_message() -> str:
 
 
 def hash_file(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    return _hash_file(path)
 
 
 def load_manifest() -> list[dict]:
@@ -60,7 +61,10 @@ def verify_manifest_hashes() -> None:
         path = Path(entry["path"])
         if not path.exists():
             raise FileNotFoundError(f"Missing file: {path}")
-        if hash_file(path) != entry["hash"]:
+    hashes = hash_files(str(Path(entry["path"])) for entry in manifest)
+    for entry in manifest:
+        path = Path(entry["path"])
+        if hashes.get(str(path)) != entry["hash"]:
             raise ValueError(f"Hash mismatch for {path}")
 
 
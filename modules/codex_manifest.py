@@ -1,18 +1,21 @@
 import json
-import hashlib
 from pathlib import Path
 from typing import Iterable, Dict, Any
 
+from modules.hash_service import hash_files
+
 
 def generate_manifest(modules: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """Generate a manifest mapping module paths to metadata."""
     manifest: Dict[str, Dict[str, Any]] = {}
+    modules = list(modules)
+    hashes = hash_files(str(Path(item["path"])) for item in modules)
     for item in modules:
         path = Path(item["path"])
-        with open(path, "rb") as f:
-            sha256 = hashlib.sha256(f.read()).hexdigest()
+        if str(path) not in hashes:
+            raise FileNotFoundError(f"Cannot read module: {path}")
         manifest[str(path)] = {
-            "sha256": sha256,
+            "sha256": hashes[str(path)],
             "legal_function": item.get("legal_function"),
             "dependencies": item.get("dependencies", []),
         }
@@ -33,10 +36,9 @@ def verify_all_modules(manifest: Dict[str, Dict[str, Any]]) -> None:
             raise ValueError(f"Manifest entry for {path} missing 'dependencies'")
         if not isinstance(info["dependencies"], list):
             raise ValueError(f"Dependencies for {path} must be a list")
-        p = Path(path)
-        if not p.exists():
+        if not Path(path).exists():
             raise FileNotFoundError(f"Missing file: {path}")
-        with open(p, "rb") as f:
-            sha256 = hashlib.sha256(f.read()).hexdigest()
-        if sha256 != info["sha256"]:
+    hashes = hash_files(manifest)
+    for path, info in manifest.items():
+        if hashes.get(path) != info["sha256"]:
             raise ValueError(f"Hash mismatch for {path}")
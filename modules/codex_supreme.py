@@ -4,6 +4,8 @@ import json
 import os
 from pathlib import Path
 
+from modules.hash_service import hash_file, hash_files
+
 PERSISTENT_STATE_FILE = "codex_state.json"
 AUDIT_LOG = "audit_chain.log"
 MANIFEST_FILE = "codex_manifest.json"
@@ -13,7 +15,7 @@ PATCH_HISTORY = "patch_history.json"
 
 def sha256_file(fpath: str) -> str:
     try:
-        return hashlib.sha256(Path(fpath).read_bytes()).hexdigest()
+        return hash_file(fpath)
     except Exception:
         return ""
 
@@ -47,9 +49,10 @@ def self_diagnostic() -> list[str]:
     manifest = []
     if os.path.exists(MANIFEST_FILE):
         manifest = json.loads(Path(MANIFEST_FILE).read_text())
+        hashes = hash_files(str(Path(entry["path"])) for entry in manifest)
         for entry in manifest:
             p = Path(entry["path"])
-            if p.exists() and sha256_file(p) != entry.get("hash"):
+            if p.exists() and hashes.get(str(p), "") != entry.get("hash"):
                 diagnostics.append(f"File hash mismatch: {p}")
     save_state({"last_diagnostic": diagnostics})
     return diagnostics
@@ -60,9 +63,10 @@ def forensic_integrity_check() -> list[str]:
     if not os.path.exists(MANIFEST_FILE):
         return issues
     manifest = json.loads(Path(MANIFEST_FILE).read_text())
+    hashes = hash_files(str(Path(entry["path"])) for entry in manifest)
     for entry in manifest:
         path = Path(entry["path"])
-        if path.exists() and sha256_file(path) != entry.get("hash"):
+        if path.exists() and hashes.get(str(path), "") != entry.get("hash"):
             issues.append(f"Tampered: {path}")
     save_state({"last_integrity_check": issues})
     return issues
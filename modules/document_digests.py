@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS documents (file TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+# Files looked up per query, under SQLite's default limit on bound parameters.
+LOOKUP_CHUNK = 500
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class DocumentDigests:
+    """The text digest of each document an index was built from, kept in its ``documents`` table.
+
+    ``changed`` walks the current documents and yields those whose text no
+    longer matches the recorded digest; once it is exhausted, ``gone`` lists
+    the recorded documents it did not see.  The caller records the new
+    digests, so it can do so in the same transaction as the rows they
+    describe, or after them.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.seen: Set[str] = set()
+        with self.conn:
+            self.conn.execute(SCHEMA)
+
+    def known(self, files: Sequence[str]) -> Dict[str, str]:
+        """Return the recorded digest of each of ``files`` that has one."""
+        found: Dict[str, str] = {}
+        for start in range(0, len(files), LOOKUP_CHUNK):
+            chunk = files[start:start + LOOKUP_CHUNK]
+            query = f"SELECT file, digest FROM documents WHERE file IN ({', '.join('?' * len(chunk))})"
+            found.update(self.conn.execute(query, chunk))
+        return found
+
+    def changed(
+        self, records: Iterable[Tuple[str, str]], batch_size: int
+    ) -> Iterator[List[Tuple[str, str, str]]]:
+        """Yield ``(file, digest, text)`` for the changed ``(file, text)`` records, a batch at a time.
+
+        Batches in which nothing changed are skipped.
+        """
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            self.seen.update(file for file, _ in batch)
+            known = self.known([file for file, _ in batch])
+            changed = []
+            for file, text in batch:
+                digest = text_digest(text)
+                if known.get(file) != digest:
+                    changed.append((file, digest, text))
+            if changed:
+                yield changed
+
+    def gone(self) -> List[str]:
+        """List the recorded documents that ``changed`` did not see."""
+        return [file for (file,) in self.conn.execute("SELECT file FROM documents") if file not in self.seen]
+
+    def save(self, digests: Iterable[Tuple[str, str]]) -> None:
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?)", digests)
+
+    def forget(self, files: Iterable[str]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM documents WHERE file = ?", ((file,) for file in files))
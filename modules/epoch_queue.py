@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    hash TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_queue_status ON queue (status, seq);
+"""
+
+
+class EpochQueue:
+    """Work queue for the epoch unpacker backed by SQLite.
+
+    Items are keyed by the SHA-256 of their content, so the same evidence
+    stored under different names is only queued once.  The ``(status, seq)``
+    index keeps enqueue, duplicate checks and dequeue at O(log n).  Worker
+    processes that only need duplicate checks open it with ``readonly=True``.
+    """
+
+    def __init__(self, db_path: Path, readonly: bool = False) -> None:
+        self.db_path = Path(db_path)
+        if readonly:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "EpochQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def contains(self, file_hash: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM queue WHERE hash = ?", (file_hash,)).fetchone()
+        return row is not None
+
+    def enqueue(self, filename: str, file_hash: str, status: str = "pending") -> bool:
+        """Add an item unless its hash is already queued.
+
+        Returns:
+            ``True`` when the item was new and has been queued.
+        """
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO queue (hash, filename, status) VALUES (?, ?, ?)",
+            (file_hash, filename, status),
+        )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    def enqueue_many(self, items: Iterable[Tuple[str, str]], status: str = "pending") -> int:
+        """Queue ``(filename, hash)`` pairs in one transaction.
+
+        Returns:
+            The number of items that were not already queued.
+        """
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO queue (hash, filename, status) VALUES (?, ?, ?)",
+                ((file_hash, filename, status) for filename, file_hash in items),
+            )
+        return self.conn.total_changes - before
+
+    def next_pending(self) -> Optional[Dict[str, str]]:
+        """Return the oldest pending item or ``None`` when the queue is drained."""
+        row = self.conn.execute(
+            "SELECT filename, hash, status FROM queue WHERE status = 'pending' ORDER BY seq LIMIT 1"
+        ).fetchone()
+        return dict(row) if row else None
+
+    def claim(self, limit: int) -> List[Dict[str, str]]:
+        """Move up to ``limit`` pending items to ``processing`` and return them."""
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT seq, filename, hash FROM queue WHERE status = 'pending' ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE queue SET status = 'processing' WHERE seq = ?", ((r["seq"],) for r in rows)
+            )
+        return [{"filename": r["filename"], "hash": r["hash"], "status": "processing"} for r in rows]
+
+    def release(self, hashes: Iterable[str]) -> None:
+        """Return claimed items to ``pending`` so they are picked up again."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE queue SET status = 'pending' WHERE hash = ? AND status = 'processing'",
+                ((h,) for h in hashes),
+            )
+
+    def requeue_processing(self) -> int:
+        """Return items left in ``processing`` by a run that died to ``pending``.
+
+        Returns:
+            The number of items requeued.
+        """
+        with self.conn:
+            return self.conn.execute("UPDATE queue SET status = 'pending' WHERE status = 'processing'").rowcount
+
+    def mark_many(self, done: Iterable[str], errors: Iterable[Tuple[str, str]] = ()) -> None:
+        """Record a batch of finished items in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE queue SET status = 'done', error = NULL WHERE hash = ?", ((h,) for h in done)
+            )
+            self.conn.executemany(
+                "UPDATE queue SET status = 'error', error = ? WHERE hash = ?", ((e, h) for h, e in errors)
+            )
+
+    def mark_done(self, file_hash: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE queue SET status = 'done', error = NULL WHERE hash = ?", (file_hash,))
+
+    def mark_error(self, file_hash: str, error: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE queue SET status = 'error', error = ? WHERE hash = ?", (error, file_hash))
+
+    def counts(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM queue GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def items(self, status: Optional[str] = None) -> Iterator[Dict[str, str]]:
+        """Stream queue entries in insertion order, optionally filtered by status."""
+        if status is None:
+            cur = self.conn.execute("SELECT filename, hash, status, error FROM queue ORDER BY seq")
+        else:
+            cur = self.conn.execute(
+                "SELECT filename, hash, status, error FROM queue WHERE status = ? ORDER BY seq", (status,)
+            )
+        for row in cur:
+            item = dict(row)
+            if item["error"] is None:
+                del item["error"]
+            yield item
+
+    def import_legacy(self, json_path: Path) -> int:
+        """Load entries from a legacy ``epoch_queue.json`` file.
+
+        Legacy hashes were computed from member names rather than content, so
+        they are stored with a ``legacy:`` prefix and never mistaken for
+        content hashes.
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+        with open(json_path, "r") as f:
+            legacy = json.load(f)
+        rows: List[Tuple[str, str, str, Optional[str]]] = [
+            (f"legacy:{q['hash']}", q["filename"], q.get("status", "pending"), q.get("error"))
+            for q in legacy.get("index", [])
+        ]
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO queue (hash, filename, status, error) VALUES (?, ?, ?, ?)", rows
+            )
+        return self.conn.total_changes - before
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from modules.text_cache import CACHE_ROOT
+
+DEFAULT_CACHE_PATH = CACHE_ROOT / "hash_cache.db"
+CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_WORKERS = 8
+# Files modified this recently are hashed but not cached: a write landing in
+# the same mtime tick as the hash would otherwise go unnoticed.
+RACY_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns)
+);
+"""
+
+PathLike = Union[str, os.PathLike]
+StatKey = Tuple[int, int, int, int]
+
+
+def stream_sha256(path: PathLike, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash a file in fixed-size chunks so memory use does not grow with file size."""
+    digest = hashlib.sha256()
+    with open(path, "rb", buffering=0) as f:
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def stat_key(stat: os.stat_result) -> StatKey:
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class HashService:
+    """SHA-256 of files, cached by ``(device, inode, size, mtime_ns)``.
+
+    A file whose stat signature matches a cached entry is never read again,
+    so re-verifying an unchanged tree costs one ``stat`` per file.  Misses
+    are streamed in large chunks across a thread pool; ``hashlib`` releases
+    the GIL while hashing, so threads hash in parallel.
+
+    Args:
+        cache_path: SQLite cache location, or ``None`` to disable caching.
+        workers: Threads used by ``hash_many``.
+    """
+
+    def __init__(self, cache_path: Optional[PathLike] = DEFAULT_CACHE_PATH, workers: int = DEFAULT_WORKERS,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(cache_path), timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+
+    def __enter__(self) -> "HashService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _lookup(self, keys: List[StatKey]) -> Dict[StatKey, str]:
+        if self.conn is None or not keys:
+            return {}
+        found: Dict[StatKey, str] = {}
+        with self._lock:
+            for key in keys:
+                row = self.conn.execute(
+                    "SELECT sha256 FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?", key
+                ).fetchone()
+                if row:
+                    found[key] = row[0]
+        return found
+
+    def _store(self, entries: List[Tuple[StatKey, str]]) -> None:
+        if self.conn is None:
+            return
+        cutoff = (time.time() - RACY_SECONDS) * 1e9
+        rows = [(*key, digest) for key, digest in entries if key[3] < cutoff]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _read(self, path: PathLike, key: StatKey) -> Tuple[str, bool]:
+        """Hash the file; the flag is False if it changed while being read and must not be cached."""
+        digest = stream_sha256(path, self.chunk_size)
+        return digest, stat_key(os.stat(path)) == key
+
+    def hash_file(self, path: PathLike) -> str:
+        """Return the SHA-256 of ``path``, reading it only on a cache miss.
+
+        Raises:
+            OSError: If the file cannot be stat'ed or read.
+        """
+        key = stat_key(os.stat(path))
+        cached = self._lookup([key]).get(key)
+        if cached is not None:
+            return cached
+        digest, stable = self._read(path, key)
+        if stable:
+            self._store([(key, digest)])
+        return digest
+
+    def hash_many(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """Hash many files: a stat sweep, then parallel reads of the misses only.
+
+        Returns:
+            ``{str(path): sha256}`` for every file that could be read;
+            unreadable files are left out.
+        """
+        keys: Dict[str, StatKey] = {}
+        for path in paths:
+            try:
+                keys[str(path)] = stat_key(os.stat(path))
+            except OSError:
+                continue
+        cached = self._lookup(list(set(keys.values())))
+        result = {path: cached[key] for path, key in keys.items() if key in cached}
+        misses = [path for path in keys if path not in result]
+
+        def work(path: str) -> Optional[Tuple[str, bool]]:
+            try:
+                return self._read(path, keys[path])
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            outcomes = list(pool.map(work, misses))
+        fresh = [(path, outcome) for path, outcome in zip(misses, outcomes) if outcome is not None]
+        self._store([(keys[path], digest) for path, (digest, stable) in fresh if stable])
+        result.update((path, digest) for path, (digest, _) in fresh)
+        return result
+
+
+_default: Optional[HashService] = None
+_default_lock = threading.Lock()
+
+
+def default_service() -> HashService:
+    """Return the process-wide service, falling back to no cache if it cannot be opened."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            try:
+                _default = HashService()
+            except (OSError, sqlite3.Error):
+                _default = HashService(cache_path=None)
+        return _default
+
+
+def hash_file(path: PathLike) -> str:
+    return default_service().hash_file(path)
+
+
+def hash_files(paths: Iterable[PathLike]) -> Dict[str, str]:
+    return default_service().hash_many(paths)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+# Tesseract engine/page-segmentation presets.  ``--oem 1`` selects the LSTM
+# engine only; ``--psm 6`` treats the image as one uniform text block, which
+# skips most of the layout analysis that dominates runtime on photos.
+OCR_PRESETS = {
+    "accurate": "--oem 1 --psm 3",
+    "fast": "--oem 1 --psm 6",
+    "sparse": "--oem 1 --psm 11",
+}
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "grayscale": True,
+    "target_dpi": 200,
+    "page_inches": 11.0,
+    "binarize": True,
+    "block_radius": 15,
+    "threshold_offset": 10,
+    "detect_orientation": False,
+    "preset": "fast",
+}
+
+
+def effective_dpi(image: Image.Image, page_inches: float) -> float:
+    """Estimate the resolution of the document in an image.
+
+    Scanner DPI metadata is trusted when present.  Phone photos usually carry
+    72/96 DPI placeholders, so the long side is assumed to span a page of
+    ``page_inches`` instead.
+    """
+    dpi = image.info.get("dpi")
+    if dpi and float(dpi[0]) > 96:
+        return float(dpi[0])
+    return max(image.size) / page_inches
+
+
+def adaptive_binarize(image: Image.Image, radius: int, offset: int) -> Image.Image:
+    """Threshold each pixel against the mean of its neighbourhood.
+
+    Handles uneven lighting in photos far better than a global threshold and
+    runs entirely inside Pillow's C filters.
+    """
+    gray = image.convert("L")
+    local_mean = gray.filter(ImageFilter.BoxBlur(radius))
+    darker = ImageChops.subtract(local_mean, gray)
+    return darker.point(lambda v: 0 if v > offset else 255, mode="1").convert("L")
+
+
+def detect_rotation(image: Image.Image) -> int:
+    """Return the clockwise rotation tesseract's OSD suggests, or 0 if unknown."""
+    import pytesseract
+
+    try:
+        osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+    except pytesseract.TesseractError:
+        return 0
+    return int(osd.get("rotate", 0))
+
+
+def preprocess_image(image: Image.Image, settings: Optional[Dict[str, Any]] = None) -> Image.Image:
+    """Prepare a photo or scan for OCR.
+
+    Steps, each controlled by ``settings``: apply the EXIF orientation,
+    convert to grayscale, downscale to ``target_dpi``, binarize adaptively
+    and optionally correct the rotation reported by tesseract's OSD.
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    if not settings["enabled"]:
+        return image
+    image = ImageOps.exif_transpose(image)
+    if settings["grayscale"]:
+        image = image.convert("L")
+    scale = settings["target_dpi"] / effective_dpi(image, settings["page_inches"])
+    if scale < 1:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+    if settings["binarize"]:
+        image = adaptive_binarize(image, settings["block_radius"], settings["threshold_offset"])
+    if settings["detect_orientation"]:
+        rotation = detect_rotation(image)
+        if rotation:
+            image = image.rotate(-rotation, expand=True, fillcolor=255)
+    return image
+
+
+def tesseract_config(settings: Optional[Dict[str, Any]] = None) -> str:
+    """Return the tesseract command-line options for ``settings``."""
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    return OCR_PRESETS[settings["preset"]] if settings["enabled"] else ""
+
+
+def ocr_image(source: Union[str, Path, Image.Image], settings: Optional[Dict[str, Any]] = None) -> str:
+    """Pre-process an image and OCR it with the configured tesseract preset."""
+    import pytesseract
+
+    image = source if isinstance(source, Image.Image) else Image.open(source)
+    return pytesseract.image_to_string(preprocess_image(image, settings), config=tesseract_config(settings))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import heapq
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# A worker receives (archive path, member indices, name prefix) and returns
+# one record per member it handled.
+RangeWorker = Callable[[str, List[int], str], List[Dict[str, Any]]]
+# Called in the parent with the records of one finished range, so they can be
+# committed together; returns (archive path, prefix) for every nested archive
+# that should be unpacked with the same pool.
+BatchHandler = Callable[[List[Dict[str, Any]]], Iterable[Tuple[Path, str]]]
+
+
+def partition_members(infos: Sequence[zipfile.ZipInfo], parts: int) -> List[List[int]]:
+    """Split archive members into ``parts`` ranges of similar compressed size.
+
+    Members are assigned largest-first to the currently lightest range, so a
+    few huge members do not leave one worker decompressing long after the
+    rest have finished.  Each range is returned in archive order to keep reads
+    within a worker sequential.
+
+    Returns:
+        Lists of indices into ``infos``; empty ranges are dropped.
+    """
+    bins: List[Tuple[int, int]] = [(0, n) for n in range(max(parts, 1))]
+    ranges: List[List[int]] = [[] for _ in bins]
+    order = sorted(range(len(infos)), key=lambda i: infos[i].compress_size, reverse=True)
+    for index in order:
+        load, n = heapq.heappop(bins)
+        ranges[n].append(index)
+        heapq.heappush(bins, (load + infos[index].compress_size, n))
+    return [sorted(r) for r in ranges if r]
+
+
+def unpack_parallel(
+    zip_path: Path,
+    unpack_range: RangeWorker,
+    on_records: BatchHandler,
+    workers: Optional[int] = None,
+    ranges_per_worker: int = 4,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> int:
+    """Decompress an archive across worker processes.
+
+    Every worker opens the archive independently and handles a disjoint range
+    of members, balanced by compressed size.  Each range's records are handed
+    to ``on_records`` as one batch, and the nested archives it reports are
+    partitioned and fed to the same pool.
+
+    Returns:
+        The number of records handed to ``on_records``.
+    """
+    workers = workers or os.cpu_count() or 1
+    handled = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        in_flight = set()
+
+        def submit_archive(path: Path, prefix: str) -> None:
+            with zipfile.ZipFile(path, "r") as zf:
+                infos = zf.infolist()
+            members = [i for i, info in enumerate(infos) if not info.is_dir()]
+            selected = [infos[i] for i in members]
+            for indices in partition_members(selected, workers * ranges_per_worker):
+                in_flight.add(pool.submit(unpack_range, str(path), [members[i] for i in indices], prefix))
+
+        submit_archive(Path(zip_path), "")
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.discard(future)
+                records = future.result()
+                handled += len(records)
+                for nested in on_records(records):
+                    submit_archive(*nested)
+    return handled
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Set
+
+_END = ""
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    term: str
+    categories: tuple
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a trie as a regex whose alternatives share common prefixes."""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+class PatternMatcher:
+    """Match many literal terms against a text in a single pass.
+
+    Terms are compiled into one trie-shaped regular expression, so the cost of
+    a scan depends on the text length rather than the number of terms.  The
+    text is lowercased once and every occurrence of every term is reported,
+    including overlapping ones, with offsets into the lowercased text.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]) -> None:
+        self.terms: Dict[str, List[str]] = {}
+        for category, terms in groups.items():
+            for term in terms:
+                self.terms.setdefault(term.lower(), []).append(category)
+        self._trie: dict = {}
+        for term in self.terms:
+            node = self._trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[_END] = term
+        self._regex = re.compile(_trie_pattern(self._trie) or "(?!)")
+
+    @classmethod
+    def from_json(cls, path: Path, key: str) -> "PatternMatcher":
+        """Build a matcher from ``{key: {category: [terms]}}`` in a JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)[key])
+
+    def find_all(self, text: str) -> List[Hit]:
+        lowered = text.lower()
+        hits: List[Hit] = []
+        pos = 0
+        while True:
+            match = self._regex.search(lowered, pos)
+            if match is None:
+                break
+            start = match.start()
+            node = self._trie
+            for offset, ch in enumerate(match.group(), 1):
+                node = node[ch]
+                if _END in node:
+                    term = node[_END]
+                    hits.append(Hit(start, start + offset, term, tuple(self.terms[term])))
+            pos = start + 1
+        return hits
+
+    def categories(self, text: str) -> Set[str]:
+        return {category for hit in self.find_all(text) for category in hit.categories}
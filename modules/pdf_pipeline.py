@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from PyPDF2 import PdfReader
+
+PAGE_SEPARATOR = "\f"
+MIN_TEXT_CHARS = 25
+OCR_DPI = 300
+
+PdfSource = Union[str, os.PathLike, BinaryIO]
+
+
+def has_text_layer(text: str, min_chars: int = MIN_TEXT_CHARS) -> bool:
+    """Return ``True`` when a page's embedded text is substantial enough to trust."""
+    return sum(1 for ch in text if ch.isalnum()) >= min_chars
+
+
+def read_text_layer(source: PdfSource, min_chars: int = MIN_TEXT_CHARS) -> Tuple[List[str], List[int]]:
+    """Read the embedded text of every page.
+
+    Args:
+        source: Path to a PDF or a binary file object positioned at its start.
+        min_chars: Minimum alphanumeric characters for a page to count as text.
+
+    Returns:
+        The per-page texts (empty for pages without a usable text layer) and
+        the zero-based numbers of the pages that still need OCR.
+    """
+    reader = PdfReader(source)
+    texts: List[str] = []
+    missing: List[int] = []
+    for number, page in enumerate(reader.pages):
+        text = page.extract_text() or ""
+        if has_text_layer(text, min_chars):
+            texts.append(text)
+        else:
+            texts.append("")
+            missing.append(number)
+    return texts, missing
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: int = OCR_DPI) -> str:
+    """Rasterize a single page with ``pdf2image`` and OCR it with tesseract."""
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number + 1, last_page=page_number + 1)
+    return "\n".join(pytesseract.image_to_string(image).strip() for image in images)
+
+
+def ocr_pages(pdf_path: str, page_numbers: List[int], workers: Optional[int] = None, dpi: int = OCR_DPI) -> List[str]:
+    """OCR the given pages, in parallel when more than one worker is allowed.
+
+    Returns:
+        The OCR text of each page, in the order of ``page_numbers``.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(page_numbers))
+    if workers <= 1:
+        return [ocr_page(pdf_path, number, dpi) for number in page_numbers]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(ocr_page, [pdf_path] * len(page_numbers), page_numbers, [dpi] * len(page_numbers)))
+
+
+def extract_pdf_text(
+    pdf_path: str,
+    workers: Optional[int] = None,
+    min_chars: int = MIN_TEXT_CHARS,
+    dpi: int = OCR_DPI,
+    timings: Optional[Dict[str, float]] = None,
+) -> str:
+    """Extract text from a PDF, OCR'ing only the pages without a text layer.
+
+    Born-digital pages are read straight from the text layer.  Scanned pages
+    are rasterized one at a time and OCR'd across ``workers`` processes, then
+    reassembled in page order with ``PAGE_SEPARATOR`` between pages.  When
+    ``timings`` is given, the seconds spent on OCR are added to its ``"ocr"``
+    entry.
+    """
+    pdf_path = str(pdf_path)
+    texts, missing = read_text_layer(pdf_path, min_chars)
+    if missing:
+        started = time.perf_counter()
+        for number, text in zip(missing, ocr_pages(pdf_path, missing, workers, dpi)):
+            texts[number] = text
+        if timings is not None:
+            timings["ocr"] = timings.get("ocr", 0.0) + time.perf_counter() - started
+    return PAGE_SEPARATOR.join(texts)
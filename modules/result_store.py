@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    filename TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+"""
+
+
+class ResultStore:
+    """Append-only store for per-file OCR text, canon flags and exhibit tags.
+
+    Every processed file becomes one JSON line appended to ``data_path``.  Writes
+    are buffered and made durable in batches (``fsync`` every ``batch_size``
+    records or ``sync_interval`` seconds), after which their byte offsets are
+    committed to a SQLite index so a single filename can be read back with one
+    seek.  Re-processing a file appends a new record; the index always points at
+    the latest one.
+    """
+
+    def __init__(
+        self,
+        data_path: Path,
+        index_path: Optional[Path] = None,
+        batch_size: int = 500,
+        sync_interval: float = 5.0,
+    ) -> None:
+        self.data_path = Path(data_path)
+        self.index_path = Path(index_path) if index_path else self.data_path.with_suffix(".idx")
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.executescript(INDEX_SCHEMA)
+        self.conn.commit()
+        self._recover()
+        self._writer = open(self.data_path, "ab")
+        self._offset = self._writer.tell()
+        self._pending: Dict[str, Tuple[int, int, bytes]] = {}
+        self._last_sync = time.monotonic()
+
+    def _recover(self) -> None:
+        """Index records that reached disk after the last index commit."""
+        row = self.conn.execute("SELECT MAX(offset + length) FROM results").fetchone()
+        indexed_end = row[0] or 0
+        if not self.data_path.exists():
+            return
+        entries: List[Tuple[str, int, int]] = []
+        with open(self.data_path, "r+b") as f:
+            f.seek(indexed_end)
+            offset = indexed_end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                entries.append((record["filename"], offset, len(line)))
+                offset += len(line)
+            f.truncate(offset)
+        if entries:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO results (filename, offset, length) VALUES (?, ?, ?)", entries
+                )
+
+    def append(
+        self,
+        filename: str,
+        text: str,
+        canon_flags: List[str],
+        exhibit_tags: List[str],
+        hits: Optional[List[List[Any]]] = None,
+    ) -> None:
+        """Buffer one file's results; ``hits`` holds trigger offsets for highlighting."""
+        record: Dict[str, Any] = {"filename": filename, "text": text, "canon": canon_flags, "exhibits": exhibit_tags}
+        if hits is not None:
+            record["hits"] = hits
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        self._writer.write(line)
+        self._pending[filename] = (self._offset, len(line), line)
+        self._offset += len(line)
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Make buffered records durable and publish them in the index."""
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        if self._pending:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO results (filename, offset, length) VALUES (?, ?, ?)",
+                    ((name, offset, length) for name, (offset, length, _) in self._pending.items()),
+                )
+            self._pending.clear()
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._writer.closed:
+            return
+        self.flush()
+        self._writer.close()
+        self.conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the latest record for ``filename`` without scanning the log."""
+        if filename in self._pending:
+            return json.loads(self._pending[filename][2])
+        row = self.conn.execute("SELECT offset, length FROM results WHERE filename = ?", (filename,)).fetchone()
+        if row is None:
+            return None
+        with open(self.data_path, "rb") as f:
+            f.seek(row[0])
+            return json.loads(f.read(row[1]))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Stream the latest record of every file in log order."""
+        self.flush()
+        rows = self.conn.execute("SELECT offset, length FROM results ORDER BY offset")
+        with open(self.data_path, "rb") as f:
+            for offset, length in rows:
+                f.seek(offset)
+                yield json.loads(f.read(length))
+
+    def export_legacy(self, ocr_path: Path, canon_path: Path, exhibit_path: Path) -> int:
+        """Write ``ocr_output.json``, ``canon_flags.json`` and ``exhibit_log.json``.
+
+        The files match what the old ``log_*`` helpers produced but are written
+        incrementally, so memory use does not grow with the size of the log.
+
+        Returns:
+            The number of files exported.
+        """
+        targets = ((ocr_path, "text"), (canon_path, "canon"), (exhibit_path, "exhibits"))
+        outputs = [(open(path, "w"), key) for path, key in targets]
+        count = 0
+        try:
+            for f, _ in outputs:
+                f.write("{")
+            for record in self.records():
+                name = json.dumps(record["filename"])
+                for f, key in outputs:
+                    value = json.dumps(record[key], indent=2).replace("\n", "\n  ")
+                    f.write(("," if count else "") + f"\n  {name}: {value}")
+                count += 1
+            for f, _ in outputs:
+                f.write("\n}" if count else "}")
+        finally:
+            for f, _ in outputs:
+                f.close()
+        return count
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+STAGES = ("extract", "ocr", "classify")
+
+
+class RunMetrics:
+    """Live throughput, per-stage latency and ETA for a processing run.
+
+    Workers time their own stages and the parent feeds the results to
+    ``record``.  Stage times are summed across workers, so the stage with the
+    largest share is where the run spends its effort regardless of how many
+    processes are involved.  The ETA uses the rate over the last ``window``
+    seconds so it follows slowdowns instead of the run's long-term average.
+    """
+
+    def __init__(self, total: int, window: float = 60.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.total = total
+        self.window = window
+        self.clock = clock
+        self.started = clock()
+        self.processed = 0
+        self.errors = 0
+        self.bytes = 0
+        self.stage_seconds: Dict[str, float] = {}
+        self.stage_counts: Dict[str, int] = {}
+        self._recent: Deque[Tuple[float, int, int]] = deque([(self.started, 0, 0)])
+
+    def record(self, nbytes: int = 0, stages: Optional[Mapping[str, float]] = None, error: bool = False) -> None:
+        """Account for one finished file and the seconds each stage took."""
+        self.processed += 1
+        self.errors += int(error)
+        self.bytes += nbytes
+        for stage, seconds in (stages or {}).items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            self.stage_counts[stage] = self.stage_counts.get(stage, 0) + 1
+        now = self.clock()
+        self._recent.append((now, self.processed, self.bytes))
+        while len(self._recent) > 2 and now - self._recent[1][0] >= self.window:
+            self._recent.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current figures as a JSON-serialisable dict."""
+        now = self.clock()
+        elapsed = now - self.started
+        first_time, first_files, first_bytes = self._recent[0]
+        span = now - first_time
+        recent_rate = (self.processed - first_files) / span if span > 0 else 0.0
+        recent_bytes_rate = (self.bytes - first_bytes) / span if span > 0 else 0.0
+        remaining = max(self.total - self.processed, 0)
+        busy = sum(self.stage_seconds.values())
+        stages = {
+            stage: {
+                "count": self.stage_counts[stage],
+                "mean_ms": round(1000 * seconds / self.stage_counts[stage], 1),
+                "total_seconds": round(seconds, 3),
+                "share": round(seconds / busy, 3) if busy else 0.0,
+            }
+            for stage, seconds in self.stage_seconds.items()
+        }
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "total": self.total,
+            "bytes": self.bytes,
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_sec": round(self.processed / elapsed, 3) if elapsed > 0 else 0.0,
+            "bytes_per_sec": round(self.bytes / elapsed, 1) if elapsed > 0 else 0.0,
+            "recent_files_per_sec": round(recent_rate, 3),
+            "recent_bytes_per_sec": round(recent_bytes_rate, 1),
+            "eta_seconds": round(remaining / recent_rate, 1) if recent_rate > 0 else None,
+            "stages": stages,
+            "bottleneck": max(self.stage_seconds, key=self.stage_seconds.get) if self.stage_seconds else None,
+        }
+
+    def summary(self) -> str:
+        """Format the snapshot as a single status line."""
+        snap = self.snapshot()
+        eta = snap["eta_seconds"]
+        if eta is None:
+            eta_text = "--:--:--"
+        else:
+            minutes, seconds = divmod(int(eta), 60)
+            eta_text = f"{minutes // 60}:{minutes % 60:02d}:{seconds:02d}"
+        line = (
+            f"{snap['processed']}/{snap['total']} files | {snap['recent_files_per_sec']:.2f} files/s | "
+            f"{snap['recent_bytes_per_sec'] / 1e6:.2f} MB/s | ETA {eta_text}"
+        )
+        if snap["stages"]:
+            order = [stage for stage in STAGES if stage in snap["stages"]]
+            order += sorted(set(snap["stages"]) - set(STAGES))
+            line += " | " + " ".join(f"{stage} {snap['stages'][stage]['mean_ms']:.0f}ms" for stage in order)
+            line += f" | bottleneck: {snap['bottleneck']}"
+        return line
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from modules.atomic_write import atomic_open
+
+CACHE_ROOT = Path(os.environ.get("LITIGATION_CACHE_DIR", Path.home() / ".litigation_os"))
+DEFAULT_CACHE_DIR = CACHE_ROOT / "text_cache"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# Eviction trims the cache to this fraction of max_bytes, so the full scan it
+# needs is paid once per many puts rather than on every put once full.
+LOW_WATER = 0.9
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+"""
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Persistent, content-addressed cache of extracted document text.
+
+    Entries are keyed by the SHA-256 of the source bytes together with the
+    extractor name and its settings, so changing OCR options never serves
+    stale text.  Text is stored zlib-compressed, one file per entry, and the
+    least recently used entries are evicted down to ``LOW_WATER`` of
+    ``max_bytes`` once it is exceeded.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.root / "index.db"), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(INDEX_SCHEMA)
+        self.conn.commit()
+        self._total = self._stored_bytes()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @staticmethod
+    def make_key(content_hash: str, extractor: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        material = json.dumps([content_hash, extractor, settings or {}], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.z"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            data = self._entry_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return zlib.decompress(data).decode("utf-8")
+
+    def put(self, key: str, text: str) -> None:
+        data = zlib.compress(text.encode("utf-8"), 6)
+        path = self._entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        with atomic_open(path, "wb") as f:
+            f.write(data)
+        with self.conn:
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_used) VALUES (?, ?, ?)",
+                (key, len(data), time.time()),
+            )
+        self._total += len(data) - (old[0] if old else 0)
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _stored_bytes(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        # Other processes share the cache, so the running total kept by put()
+        # is only a trigger; the real size is summed once before evicting.
+        total = self._stored_bytes()
+        if total <= self.max_bytes:
+            self._total = total
+            return
+        target = int(self.max_bytes * LOW_WATER)
+        evicted = []
+        for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            if total <= target:
+                break
+            self._entry_path(key).unlink(missing_ok=True)
+            evicted.append((key,))
+            total -= size
+        with self.conn:
+            self.conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self._total = total
+
+    def get_or_extract(
+        self,
+        path: Path,
+        extractor: str,
+        extract: Callable[[Path], str],
+        settings: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None,
+    ) -> str:
+        """Return cached text for ``path`` or run ``extract`` and cache the result.
+
+        Args:
+            path: File to extract text from.
+            extractor: Name and version of the extraction routine.
+            extract: Callable that produces the text on a cache miss.
+            settings: Options that influence the extracted text.
+            content_hash: SHA-256 of the file, when the caller already has it.
+        """
+        key = self.make_key(content_hash or file_sha256(path), extractor, settings)
+        text = self.get(key)
+        if text is None:
+            text = extract(path)
+            self.put(key, text)
+        return text
@@ -0,0 +1,136 @@
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from modules.atomic_write import atomic_open
+from scanner.walker import DEFAULT_EXTENSIONS, DEFAULT_WORKERS, scan_dir
+
+DEFAULT_STATE = os.path.join('data', 'scan_state.json')
+DEFAULT_CHANGES = os.path.join('data', 'scan_changes.json')
+STATE_VERSION = 1
+
+# Scan state layout:
+#   {"version": 1, "options": {"extensions": [...], "exclude": [...]},
+#    "dirs": {dir path: {"mtime": ns, "subdirs": [name, ...],
+#                        "files": {name: [size, mtime_ns, inode, ctime]}}}}
+# A directory's mtime only changes when entries are added, removed or renamed
+# in it, so unchanged directories are not listed again; their files and
+# subdirectories are carried over from the state.  In-place edits to a file do
+# not touch its directory, which is what ``verify`` is for.
+
+
+def load_state(path=DEFAULT_STATE):
+    if not os.path.exists(path):
+        return {'version': STATE_VERSION, 'options': {}, 'dirs': {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_state(state, path=DEFAULT_STATE):
+    write_json_atomic(state, path)
+
+
+def write_json_atomic(data, path, indent=None):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent)
+
+
+def load_changes(path=DEFAULT_CHANGES):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def file_signature(stat):
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime]
+
+
+def visit_dir(path, previous, extensions, exclude, verify):
+    """Return the state entry for one directory, listing it only if needed.
+
+    Returns:
+        ``(entry, listed)``; ``entry`` is ``None`` when the directory is gone.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+    if previous is not None and previous['mtime'] == mtime and not verify:
+        return previous, False
+    files, subdirs = scan_dir(path, extensions, exclude)
+    return {
+        'mtime': mtime,
+        'subdirs': sorted(os.path.basename(d) for d in subdirs),
+        'files': {os.path.basename(p): file_signature(stat) for p, stat in files},
+    }, True
+
+
+def incremental_scan(roots, state, extensions=DEFAULT_EXTENSIONS, exclude=(), workers=DEFAULT_WORKERS,
+                     verify=False):
+    """Rescan ``roots`` against a previous scan state.
+
+    Directories are visited concurrently; those whose mtime has not changed
+    are not listed.  Changing the extension or exclude options, or passing
+    ``verify``, lists every directory so in-place modifications are caught.
+
+    Returns:
+        ``(new_state, changes)`` where ``changes`` has sorted ``added``,
+        ``modified`` and ``removed`` path lists plus the number of
+        directories ``listed`` and ``skipped``.
+    """
+    extensions = tuple(e.lower() for e in extensions)
+    exclude = tuple(exclude or ())
+    options = {'extensions': list(extensions), 'exclude': list(exclude)}
+    old_dirs = state.get('dirs', {})
+    verify = verify or state.get('options') != options
+    new_dirs = {}
+    added, modified = [], []
+    listed = skipped = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(visit_dir, root, old_dirs.get(root), extensions, exclude, verify): root
+                   for root in roots}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path = pending.pop(future)
+                entry, was_listed = future.result()
+                if entry is None:
+                    continue
+                new_dirs[path] = entry
+                if was_listed:
+                    listed += 1
+                    old_files = old_dirs.get(path, {}).get('files', {})
+                    for name, signature in entry['files'].items():
+                        old = old_files.get(name)
+                        if old is None:
+                            added.append(os.path.join(path, name))
+                        elif old[:3] != signature[:3]:
+                            modified.append(os.path.join(path, name))
+                else:
+                    skipped += 1
+                for name in entry['subdirs']:
+                    subdir = os.path.join(path, name)
+                    future = pool.submit(visit_dir, subdir, old_dirs.get(subdir), extensions, exclude, verify)
+                    pending[future] = subdir
+    removed = [
+        os.path.join(path, name)
+        for path, entry in old_dirs.items()
+        for name in entry['files']
+        if name not in new_dirs.get(path, {}).get('files', {})
+    ]
+    new_state = {'version': STATE_VERSION, 'options': options, 'dirs': new_dirs}
+    changes = {
+        'added': sorted(added),
+        'modified': sorted(modified),
+        'removed': sorted(removed),
+        'listed': listed,
+        'skipped': skipped,
+    }
+    return new_state, changes
+
+
+def iter_files(state):
+    """Yield ``(path, signature)`` for every file recorded in a scan state."""
+    for path, entry in state['dirs'].items():
+        for name, signature in entry['files'].items():
+            yield os.path.join(path, name), signature
@@ -0,0 +1,267 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from xml.etree import ElementTree
+
+DEFAULT_WORKERS = 16
+BATCH_SIZE = 1000
+# How much of each end of a PDF is read looking for the trailer and Info
+# dictionary; the payload in between is never touched.
+PDF_WINDOW = 64 * 1024
+PDF_OBJECT_READ = 4096
+MAX_XREF_SECTIONS = 32
+
+PDF_EXTENSIONS = ('.pdf',)
+EXIF_EXTENSIONS = ('.jpg', '.jpeg', '.tif', '.tiff', '.png', '.webp')
+OOXML_EXTENSIONS = ('.docx', '.xlsx', '.pptx')
+METADATA_EXTENSIONS = PDF_EXTENSIONS + EXIF_EXTENSIONS + OOXML_EXTENSIONS
+
+# Document dates are stored like the scan index's filesystem times: naive
+# local-time ISO strings, so the two sort and compare as one column.
+
+PDF_DATE = re.compile(
+    rb"(?:D:)?(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?\s*(?:([Zz])|([+\-])(\d{2})'?(\d{2})?'?)?"
+)
+PDF_INFO_REF = re.compile(rb"/Info\s+(\d+)\s+(\d+)\s+R")
+PDF_CREATION = re.compile(rb"/CreationDate\s*\(([^)]*)\)")
+PDF_PREV = re.compile(rb"/Prev\s+(\d+)")
+PDF_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+XMP_CREATE = re.compile(rb"<xmp:CreateDate>([^<]+)</xmp:CreateDate>|xmp:CreateDate=\"([^\"]+)\"")
+
+EXIF_IFD = 0x8769
+EXIF_DATETIME = 306
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_DATETIME_DIGITIZED = 36868
+EXIF_OFFSET_ORIGINAL = 36881
+
+CORE_XML = 'docProps/core.xml'
+DCTERMS_CREATED = '{http://purl.org/dc/terms/}created'
+
+
+def local_iso(moment):
+    """Render a datetime as naive local time; aware values are converted first."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+
+def parse_pdf_date(raw):
+    """Parse a PDF date string such as ``D:20190304101100-05'00'``."""
+    match = PDF_DATE.match(raw.strip())
+    if not match:
+        return None
+    year, month, day, hour, minute, second, utc, sign, tz_hour, tz_minute = match.groups()
+    try:
+        moment = datetime(int(year), int(month or 1), int(day or 1), int(hour or 0), int(minute or 0),
+                          int(second or 0))
+    except ValueError:
+        return None
+    if utc:
+        moment = moment.replace(tzinfo=timezone.utc)
+    elif sign:
+        offset = timedelta(hours=int(tz_hour), minutes=int(tz_minute or 0))
+        moment = moment.replace(tzinfo=timezone(offset if sign == b'+' else -offset))
+    return local_iso(moment)
+
+
+def parse_iso_date(raw):
+    """Parse a W3C/ISO 8601 timestamp as found in OOXML core properties and XMP."""
+    raw = raw.strip()
+    if raw.endswith(('Z', 'z')):
+        raw = raw[:-1] + '+00:00'
+    try:
+        return local_iso(datetime.fromisoformat(raw))
+    except ValueError:
+        return None
+
+
+def _xref_offset(f, startxref, number):
+    """Find the byte offset of object ``number`` through classic xref tables.
+
+    Follows ``/Prev`` links through incremental updates.  Returns ``None``
+    for cross-reference streams (PDF 1.5+), which would need decoding.
+    """
+    seen = set()
+    while startxref is not None and startxref not in seen and len(seen) < MAX_XREF_SECTIONS:
+        seen.add(startxref)
+        f.seek(startxref)
+        if f.readline().strip() != b'xref':
+            return None
+        while True:
+            line = f.readline()
+            header = line.split()
+            if len(header) != 2 or not all(part.isdigit() for part in header):
+                break
+            first, count = int(header[0]), int(header[1])
+            section = f.tell()
+            if first <= number < first + count:
+                f.seek(section + (number - first) * 20)
+                entry = f.read(20).split()
+                if len(entry) == 3 and entry[2] == b'n':
+                    return int(entry[0])
+                return None
+            f.seek(section + count * 20)
+        trailer = line + f.read(1024)
+        prev = PDF_PREV.search(trailer)
+        startxref = int(prev.group(1)) if prev else None
+    return None
+
+
+def _pdf_object(f, offset, number, generation):
+    f.seek(offset)
+    chunk = f.read(PDF_OBJECT_READ)
+    if not re.match(rb"\s*%d\s+%d\s+obj" % (number, generation), chunk):
+        return None
+    return chunk
+
+
+def pdf_date(path):
+    """Creation date of a PDF from its Info dictionary, reading only the ends of the file.
+
+    The trailer's ``/Info`` reference is resolved through the xref table;
+    files whose Info object cannot be located that way fall back to a
+    ``/CreationDate`` or XMP ``CreateDate`` in the first or last
+    ``PDF_WINDOW`` bytes.
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - PDF_WINDOW))
+        tail = f.read(PDF_WINDOW)
+        f.seek(0)
+        head = f.read(min(PDF_WINDOW, max(0, size - PDF_WINDOW)))
+        info_refs = PDF_INFO_REF.findall(tail)
+        if info_refs:
+            number, generation = (int(part) for part in info_refs[-1])
+            starts = PDF_STARTXREF.findall(tail)
+            offset = _xref_offset(f, int(starts[-1]), number) if starts else None
+            chunk = _pdf_object(f, offset, number, generation) if offset is not None else None
+            if chunk is None:
+                # Without a usable xref, look for the object in the bytes already read.
+                for window in (tail, head):
+                    found = re.search(rb"(?<!\d)%d\s+%d\s+obj" % (number, generation), window)
+                    if found:
+                        chunk = window[found.start():found.start() + PDF_OBJECT_READ]
+                        break
+            if chunk is not None:
+                created = PDF_CREATION.search(chunk.split(b'endobj', 1)[0])
+                if created:
+                    return parse_pdf_date(created.group(1)), 'pdf:CreationDate'
+    for window in (tail, head):
+        created = PDF_CREATION.findall(window)
+        if created:
+            return parse_pdf_date(created[-1]), 'pdf:CreationDate'
+    for window in (head, tail):
+        xmp = XMP_CREATE.search(window)
+        if xmp:
+            return parse_iso_date((xmp.group(1) or xmp.group(2)).decode('ascii', 'replace')), 'pdf:xmp'
+    return None, None
+
+
+def exif_date(path):
+    """Capture date of an image from its EXIF block.
+
+    ``Image.open`` only parses the header, and the pixel data is never
+    decoded.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        exif = img.getexif()
+        sub = exif.get_ifd(EXIF_IFD)
+        for tag, source in ((EXIF_DATETIME_ORIGINAL, 'exif:DateTimeOriginal'),
+                            (EXIF_DATETIME_DIGITIZED, 'exif:DateTimeDigitized')):
+            if sub.get(tag):
+                raw, offset = sub[tag], sub.get(EXIF_OFFSET_ORIGINAL)
+                break
+        else:
+            raw, offset, source = exif.get(EXIF_DATETIME), None, 'exif:DateTime'
+    if not raw:
+        return None, None
+    try:
+        moment = datetime.strptime(str(raw).strip('\x00 ')[:19], '%Y:%m:%d %H:%M:%S')
+    except ValueError:
+        return None, None
+    if offset:
+        aware = parse_iso_date(moment.isoformat() + str(offset).strip('\x00 '))
+        if aware:
+            return aware, source
+    return moment.isoformat(), source
+
+
+def ooxml_date(path):
+    """``dcterms:created`` from ``docProps/core.xml``.
+
+    Only the ZIP central directory and that one member are read.
+    """
+    with zipfile.ZipFile(path) as archive:
+        try:
+            data = archive.read(CORE_XML)
+        except KeyError:
+            return None, None
+    created = ElementTree.fromstring(data).find(DCTERMS_CREATED)
+    if created is None or not created.text:
+        return None, None
+    return parse_iso_date(created.text), 'docx:created'
+
+
+EXTRACTORS = [(PDF_EXTENSIONS, pdf_date), (EXIF_EXTENSIONS, exif_date), (OOXML_EXTENSIONS, ooxml_date)]
+
+
+def document_date(path):
+    """Return ``(iso_date, source)`` recorded inside the file, or ``(None, None)``.
+
+    Unreadable, truncated or malformed files count as having no date.
+    """
+    lower = path.lower()
+    for extensions, extractor in EXTRACTORS:
+        if lower.endswith(extensions):
+            try:
+                created, source = extractor(path)
+            except Exception:
+                return None, None
+            return (created, source) if created else (None, None)
+    return None, None
+
+
+def extract_dates(paths, workers=DEFAULT_WORKERS):
+    """Yield ``(path, iso_date, source)`` for ``paths``, extracted on a thread pool.
+
+    Paths are submitted ``BATCH_SIZE`` at a time, so the input can be a
+    stream of millions of files.
+    """
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(paths, BATCH_SIZE))
+            if not batch:
+                return
+            for path, (created, source) in zip(batch, pool.map(document_date, batch)):
+                yield path, created, source
+
+
+def index_metadata(index, paths=None, workers=DEFAULT_WORKERS):
+    """Fill in document dates for indexed files that have not been examined yet.
+
+    Args:
+        index: The ``ScanIndex`` to update.
+        paths: Restrict the stage to these paths; by default every pending
+            row with a supported extension is examined.
+
+    Returns:
+        The number of files examined.
+    """
+    if paths is None:
+        pending = index.iter_missing_metadata(METADATA_EXTENSIONS)
+    else:
+        pending = (p for p in paths if p.lower().endswith(METADATA_EXTENSIONS))
+    examined = 0
+    results = extract_dates(pending, workers)
+    while True:
+        batch = list(islice(results, BATCH_SIZE))
+        if not batch:
+            return examined
+        index.set_metadata(batch)
+        examined += len(batch)
@@ -1,46 +1,144 @@
 import os
-import json
 from datetime import datetime
 
+from scanner.incremental import (DEFAULT_CHANGES, DEFAULT_STATE, incremental_scan, iter_files, load_state,
+                                 save_state, write_json_atomic)
+from scanner.metadata import index_metadata
+from scanner.scan_index import DEFAULT_INDEX, ScanIndex, make_row, row_from_stat
+from scanner.walker import DEFAULT_EXTENSIONS, DEFAULT_WORKERS, walk_files
+
 DEFAULT_OUTPUT = os.path.join('data', 'scan_index.json')
 
 
-def scan_directory(root_dir: str, index: dict) -> None:
-    for dirpath, _, filenames in os.walk(root_dir):
-        for name in filenames:
-            if name.lower().endswith(('.docx', '.pdf', '.txt')):
-                path = os.path.join(dirpath, name)
-                try:
-                    created = datetime.fromtimestamp(os.path.getctime(path)).isoformat()
-                    index[path] = {'created': created}
-                except OSError:
-                    pass
+def index_entry(stat) -> dict:
+    return {'created': datetime.fromtimestamp(stat.st_ctime).isoformat()}
+
+
+def scan_directory(root_dir: str, index: dict, extensions=DEFAULT_EXTENSIONS, exclude=(),
+                   workers: int = DEFAULT_WORKERS) -> None:
+    for path, stat in walk_files([root_dir], extensions, exclude, workers):
+        index[path] = index_entry(stat)
+
+
+def index_beside(output):
+    """Path of the scan database that goes with the JSON index ``output``."""
+    if not output:
+        return DEFAULT_INDEX
+    return os.path.join(os.path.dirname(output), os.path.basename(DEFAULT_INDEX))
+
+
+def default_drives():
+    env_drives = os.getenv('SCAN_DRIVES')
+    if env_drives:
+        return env_drives.split(os.pathsep)
+    return ['F:/', 'D:/']
+
+
+def run_scan(drives=None, output: str = DEFAULT_OUTPUT, extensions=DEFAULT_EXTENSIONS, exclude=(),
+             workers: int = DEFAULT_WORKERS, incremental: bool = False, verify: bool = False,
+             state_path: str = DEFAULT_STATE, changes_path: str = DEFAULT_CHANGES, index_path: str = None,
+             metadata: bool = True):
+    """Scan the provided drives and write an index of legal files.
+
+    All drives are walked at once on a shared pool of ``workers`` threads.
+    ``extensions`` selects the files to index and ``exclude`` lists glob
+    patterns for files and directories to skip.  The index is written to the
+    SQLite database at ``index_path`` and exported to the legacy JSON file
+    ``output`` unless ``output`` is ``None``.  ``index_path`` defaults to
+    ``scan_index.db`` beside ``output``, or ``DEFAULT_INDEX`` without one.
 
+    With ``metadata`` the creation dates recorded inside PDFs, images and
+    Office documents are read into the index for files that are new or
+    changed since they were last examined.  Only headers and trailers are
+    read, never the full payload.
 
-def run_scan(drives=None, output: str = DEFAULT_OUTPUT) -> None:
-    """Scan the provided drives and write an index of legal files."""
+    With ``incremental`` the scan is compared against the state saved by the
+    previous incremental run, directories whose mtime is unchanged are not
+    listed again, and the added/modified/removed files are written to
+    ``changes_path``.  Editing a file in place does not change its
+    directory's mtime; ``verify`` lists every directory to catch such edits.
+
+    Returns:
+        The change set for incremental scans, otherwise ``None``.
+    """
 
     if drives is None:
-        env_drives = os.getenv('SCAN_DRIVES')
-        if env_drives:
-            drives = env_drives.split(os.pathsep)
-        else:
-            drives = ['F:/', 'D:/']
+        drives = default_drives()
+    if index_path is None:
+        index_path = index_beside(output)
 
-    index = {}
+    roots = []
     for drive in drives:
         if os.path.exists(drive):
-            scan_directory(drive, index)
+            roots.append(drive)
         else:
             print(f'Skip missing drive: {drive}')
 
-    os.makedirs(os.path.dirname(output), exist_ok=True)
-    with open(output, 'w') as f:
-        json.dump(index, f, indent=2)
-    print(f'Scan complete. Indexed {len(index)} files to {output}')
+    with ScanIndex(index_path) as index:
+        if incremental:
+            return run_incremental_scan(index, roots, output, extensions, exclude, workers, verify, state_path,
+                                        changes_path, metadata)
+
+        count = index.replace_all(row_from_stat(path, stat) for path, stat in walk_files(roots, extensions, exclude,
+                                                                                         workers))
+        if metadata:
+            index_metadata(index, workers=workers)
+        if output:
+            index.export_json(output)
+    print(f'Scan complete. Indexed {count} files to {index_path}')
+
+
+def state_row(path, signature):
+    size, mtime_ns, _, ctime = signature
+    return make_row(path, size, ctime, mtime_ns / 1e9)
+
+
+def run_incremental_scan(index, roots, output, extensions, exclude, workers, verify, state_path, changes_path,
+                         metadata=True):
+    state, changes = incremental_scan(roots, load_state(state_path), extensions, exclude, workers, verify)
+    if len(index) == 0:
+        index.upsert_many(state_row(path, signature) for path, signature in iter_files(state))
+    else:
+        dirs = state['dirs']
+        index.update((state_row(p, dirs[os.path.dirname(p)]['files'][os.path.basename(p)])
+                      for p in changes['added'] + changes['modified']), changes['removed'])
+    if metadata:
+        index_metadata(index, workers=workers)
+    if output:
+        index.export_json(output)
+    save_state(state, state_path)
+    write_json_atomic(changes, changes_path, indent=2)
+    print(f"Incremental scan complete. {len(changes['added'])} added, {len(changes['modified'])} modified, "
+          f"{len(changes['removed'])} removed; listed {changes['listed']} of "
+          f"{changes['listed'] + changes['skipped']} directories")
+    return changes
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Index legal files on the evidence drives')
+    parser.add_argument('drives', nargs='*', help='Drives or directories to scan (default: SCAN_DRIVES or F:/ D:/)')
+    parser.add_argument('--ext', action='append', dest='extensions',
+                        help=f'File extension to index; repeatable (default: {" ".join(DEFAULT_EXTENSIONS)})')
+    parser.add_argument('--exclude', action='append', default=[],
+                        help='Glob of file or directory names/paths to skip; repeatable')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Directory listing threads')
+    parser.add_argument('--index', help='Scan index database to write (default: scan_index.db beside --output)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='Legacy JSON index to export')
+    parser.add_argument('--no-json', action='store_true', help='Skip the legacy JSON export')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Only list directories changed since the last run and write {DEFAULT_CHANGES}')
+    parser.add_argument('--verify', action='store_true',
+                        help='With --incremental, list every directory to catch files edited in place')
+    parser.add_argument('--no-metadata', action='store_true',
+                        help='Do not read creation dates from PDF, EXIF and Office document headers')
+    return parser.parse_args(argv)
 
 
 if __name__ == '__main__':
-    import sys
-    drives = sys.argv[1:] or None
-    run_scan(drives)
+    args = parse_args()
+    extensions = tuple(e if e.startswith('.') else f'.{e}' for e in args.extensions) if args.extensions else None
+    run_scan(args.drives or None, None if args.no_json else args.output, extensions or DEFAULT_EXTENSIONS,
+             args.exclude, args.workers, incremental=args.incremental, verify=args.verify,
+             index_path=args.index or index_beside(args.output), metadata=not args.no_metadata)
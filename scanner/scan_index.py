@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from modules.atomic_write import atomic_open
+
+DEFAULT_INDEX = os.path.join('data', 'scan_index.db')
+BATCH_SIZE = 10000
+ORDERINGS = {'path', 'basename', 'ext', 'size', 'created', 'modified', 'date'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    basename TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER,
+    created TEXT,
+    modified TEXT,
+    hash TEXT,
+    doc_created TEXT,
+    doc_source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_basename ON files (basename);
+CREATE INDEX IF NOT EXISTS idx_files_ext ON files (ext);
+CREATE INDEX IF NOT EXISTS idx_files_created ON files (created);
+CREATE INDEX IF NOT EXISTS idx_files_hash ON files (hash);
+"""
+
+# Added after the first release of the index; older databases are migrated.
+LATE_COLUMNS = {'doc_created': 'TEXT', 'doc_source': 'TEXT'}
+LATE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_files_date ON files (COALESCE(doc_created, created));
+CREATE INDEX IF NOT EXISTS idx_files_pending ON files (path) WHERE doc_source IS NULL;
+CREATE INDEX IF NOT EXISTS idx_files_size ON files (size);
+"""
+
+# ``hash``, ``doc_created`` and ``doc_source`` are derived from the file's
+# content.  Re-indexing a file whose size and mtime are unchanged keeps them,
+# so a rescan does not throw away hashing and metadata work; any other change
+# clears them for recomputation.
+UPSERT = """
+INSERT INTO files (path, basename, ext, size, created, modified, hash) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (path) DO UPDATE SET
+    size = excluded.size,
+    created = excluded.created,
+    modified = excluded.modified,
+    hash = COALESCE(excluded.hash, CASE WHEN size IS excluded.size AND modified IS excluded.modified THEN hash END),
+    doc_created = CASE WHEN size IS excluded.size AND modified IS excluded.modified THEN doc_created END,
+    doc_source = CASE WHEN size IS excluded.size AND modified IS excluded.modified THEN doc_source END
+"""
+
+Row = Tuple[str, str, str, Optional[int], Optional[str], Optional[str], Optional[str]]
+
+
+def make_row(path: str, size: Optional[int] = None, ctime: Optional[float] = None, mtime: Optional[float] = None,
+             file_hash: Optional[str] = None) -> Row:
+    """Build an index row; times are stored as ISO strings like ``scan_index.json``."""
+    return (
+        path,
+        os.path.basename(path),
+        os.path.splitext(path)[1].lower(),
+        size,
+        datetime.fromtimestamp(ctime).isoformat() if ctime is not None else None,
+        datetime.fromtimestamp(mtime).isoformat() if mtime is not None else None,
+        file_hash,
+    )
+
+
+def row_from_stat(path: str, stat: os.stat_result, file_hash: Optional[str] = None) -> Row:
+    return make_row(path, stat.st_size, stat.st_ctime, stat.st_mtime, file_hash)
+
+
+class ScanIndex:
+    """File index for the scanner backed by SQLite.
+
+    One row per file with indexes on basename, extension, creation time,
+    document date and content hash, so consumers can stream rows or run
+    targeted queries
+    instead of loading the whole index.  Writes go through ``executemany`` in
+    transactions of ``BATCH_SIZE`` rows; WAL mode lets readers keep working
+    while a scan writes.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_INDEX) -> None:
+        self.db_path = str(db_path)
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        present = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        for column, kind in LATE_COLUMNS.items():
+            if column not in present:
+                self.conn.execute(f"ALTER TABLE files ADD COLUMN {column} {kind}")
+        self.conn.executescript(LATE_INDEXES)
+        self.conn.commit()
+
+    @classmethod
+    def from_json(cls, json_path: Union[str, Path], db_path: Union[str, Path] = ':memory:') -> "ScanIndex":
+        """Load a legacy ``scan_index.json`` (``{path: {"created": iso}}``)."""
+        index = cls(db_path)
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        index.upsert_many(
+            (path, os.path.basename(path), os.path.splitext(path)[1].lower(), None, meta.get('created'), None, None)
+            for path, meta in data.items()
+        )
+        return index
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ScanIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def upsert_many(self, rows: Iterable[Row], batch_size: int = BATCH_SIZE) -> int:
+        """Insert or replace rows, committing every ``batch_size`` rows."""
+        rows = iter(rows)
+        written = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return written
+            with self.conn:
+                self.conn.executemany(UPSERT, batch)
+            written += len(batch)
+
+    def replace_all(self, rows: Iterable[Row]) -> int:
+        """Swap the whole index for ``rows`` in one transaction.
+
+        Readers keep seeing the previous index until the new one is complete.
+        Files that are still present keep their content-derived columns.
+        """
+        rows = iter(rows)
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS scanned (path TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM scanned")
+            while True:
+                batch = list(islice(rows, BATCH_SIZE))
+                if not batch:
+                    break
+                self.conn.executemany(UPSERT, batch)
+                self.conn.executemany("INSERT OR IGNORE INTO scanned VALUES (?)", ((row[0],) for row in batch))
+            self.conn.execute("DELETE FROM files WHERE path NOT IN (SELECT path FROM scanned)")
+            count = self.conn.execute("SELECT COUNT(*) FROM scanned").fetchone()[0]
+            self.conn.execute("DELETE FROM scanned")
+        return count
+
+    def update(self, rows: Iterable[Row], removed: Iterable[str] = ()) -> None:
+        """Remove ``removed`` and upsert ``rows`` in a single transaction."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+            self.conn.executemany(UPSERT, rows)
+
+    def remove_many(self, paths: Iterable[str]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in paths))
+
+    def paths_under(self, directory: str) -> List[str]:
+        """Return the indexed paths below ``directory`` using a primary-key range scan."""
+        prefix = os.path.join(directory, '')
+        rows = self.conn.execute(
+            "SELECT path FROM files WHERE path >= ? AND path < ?", (prefix, prefix + '\U0010ffff')
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def set_hashes(self, hashes: Iterable[Tuple[str, str]]) -> None:
+        """Record content hashes as ``(path, hash)`` pairs."""
+        with self.conn:
+            self.conn.executemany("UPDATE files SET hash = ? WHERE path = ?", ((h, p) for p, h in hashes))
+
+    def set_metadata(self, dates: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> None:
+        """Record document dates as ``(path, iso_date, source)`` triples.
+
+        A file with no date inside it is stored with an empty source, so it
+        is not examined again until it changes.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE files SET doc_created = ?, doc_source = ? WHERE path = ?",
+                ((created, source or '', path) for path, created, source in dates),
+            )
+
+    def iter_missing_metadata(self, ext: Sequence[str], page_size: int = BATCH_SIZE) -> Iterator[str]:
+        """Stream the paths with extension in ``ext`` that have not had their metadata read.
+
+        Paths are fetched a page at a time, so the caller may record
+        metadata while iterating.
+        """
+        ext = [e.lower() for e in ext]
+        query = (f"SELECT path FROM files WHERE doc_source IS NULL AND ext IN ({', '.join('?' * len(ext))}) "
+                 "AND path > ? ORDER BY path LIMIT ?")
+        last = ''
+        while True:
+            page = [row[0] for row in self.conn.execute(query, (*ext, last, page_size))]
+            if not page:
+                return
+            yield from page
+            last = page[-1]
+
+    def iter_unhashed_duplicates(self, page_size: int = BATCH_SIZE) -> Iterator[str]:
+        """Stream the unhashed paths that share their name or size with another file.
+
+        Only these can belong to a duplicate group, so nothing else needs
+        reading.  The candidates are collected up front, so the caller may
+        record hashes while iterating.
+        """
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS temp.unhashed")
+            self.conn.execute("CREATE TEMP TABLE unhashed (path TEXT)")
+            self.conn.execute(
+                "INSERT INTO unhashed SELECT path FROM files WHERE hash IS NULL AND ("
+                "basename IN (SELECT basename FROM files GROUP BY basename HAVING COUNT(*) > 1) OR "
+                "size IN (SELECT size FROM files WHERE size IS NOT NULL GROUP BY size HAVING COUNT(*) > 1)"
+                ") ORDER BY path"
+            )
+        last = 0
+        while True:
+            page = self.conn.execute(
+                "SELECT rowid, path FROM unhashed WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, page_size)
+            ).fetchall()
+            if not page:
+                break
+            yield from (row[1] for row in page)
+            last = page[-1][0]
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS temp.unhashed")
+
+    def iter_name_groups(self, basenames: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of every file name held by more than one file, ordered by name.
+
+        Args:
+            basenames: Only consider these names.
+        """
+        where, params = "", []
+        if basenames is not None:
+            where = f" WHERE basename IN ({', '.join('?' * len(basenames))})"
+            params = list(basenames)
+        query = (
+            "SELECT path, basename, size, hash FROM files WHERE basename IN "
+            f"(SELECT basename FROM files{where} GROUP BY basename HAVING COUNT(*) > 1) ORDER BY basename, path"
+        )
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+
+    def iter_content_groups(self, hashes: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of every content hash found under more than one name, ordered by hash.
+
+        Args:
+            hashes: Only consider these hashes.
+        """
+        where, params = "", []
+        if hashes is not None:
+            where = f" AND hash IN ({', '.join('?' * len(hashes))})"
+            params = list(hashes)
+        query = (
+            "SELECT path, basename, size, hash FROM files WHERE hash IN (SELECT hash FROM files WHERE hash IS NOT "
+            f"NULL{where} GROUP BY hash HAVING COUNT(DISTINCT basename) > 1) ORDER BY hash, path"
+        )
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+
+    def get_many(self, paths: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT * FROM files WHERE path IN ({placeholders})", chunk):
+                found[row["path"]] = dict(row)
+        return found
+
+    def iter_files(
+        self,
+        ext: Optional[Union[str, Sequence[str]]] = None,
+        basename: Optional[Union[str, Sequence[str]]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        order_by: str = 'path',
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream rows matching every given filter.
+
+        Args:
+            ext: Extension(s) including the dot, e.g. ``".pdf"``.
+            basename: File name(s) to match exactly.
+            created_from, created_to: Inclusive ISO date(-time) bounds on the
+                creation time; a bare date as ``created_to`` covers that day.
+            order_by: Column to sort by; ``date`` is the document's own
+                creation date where known, else the filesystem's.
+        """
+        if order_by not in ORDERINGS:
+            raise ValueError(f"cannot order by {order_by!r}")
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (('ext', ext), ('basename', basename)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(v.lower() if column == 'ext' else v for v in values)
+        if created_from is not None:
+            clauses.append("created >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created <= ?")
+            params.append(created_to if 'T' in created_to else created_to + 'T\uffff')
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        if order_by == 'date':
+            order_by = 'COALESCE(doc_created, created)'
+        for row in self.conn.execute(f"SELECT * FROM files{where} ORDER BY {order_by}, path", params):
+            yield dict(row)
+
+    def export_json(self, json_path: Union[str, Path]) -> int:
+        """Stream the index to the legacy ``scan_index.json`` format.
+
+        The output matches ``json.dump(index, f, indent=2, sort_keys=True)``
+        without materialising the index in memory.
+
+        Returns:
+            The number of files written.
+        """
+        json_path = str(json_path)
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+        count = 0
+        with atomic_open(json_path) as f:
+            f.write("{")
+            for row in self.conn.execute("SELECT path, created FROM files ORDER BY path"):
+                f.write("," if count else "")
+                f.write(f"\n  {json.dumps(row[0])}: {{\n    \"created\": {json.dumps(row[1])}\n  }}")
+                count += 1
+            f.write("\n}" if count else "}")
+        return count
+
+
+def open_index(path: Union[str, Path]) -> ScanIndex:
+    """Open a scan index, loading a legacy ``.json`` index into memory if given one."""
+    if str(path).endswith('.json'):
+        return ScanIndex.from_json(path)
+    return ScanIndex(path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query or export the scan index')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Scan index database')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_p = sub.add_parser('export', help='Write the legacy scan_index.json')
+    export_p.add_argument('output', nargs='?', default=os.path.join('data', 'scan_index.json'))
+    query_p = sub.add_parser('query', help='List indexed files')
+    query_p.add_argument('--ext', action='append', help='Extension to match; repeatable')
+    query_p.add_argument('--name', action='append', help='File name to match; repeatable')
+    query_p.add_argument('--from', dest='created_from', help='Earliest creation date (ISO)')
+    query_p.add_argument('--to', dest='created_to', help='Latest creation date (ISO)')
+    query_p.add_argument('--order-by', default='path', choices=sorted(ORDERINGS))
+    args = parser.parse_args()
+    with ScanIndex(args.index) as index:
+        if args.command == 'export':
+            print(f'Exported {index.export_json(args.output)} files to {args.output}')
+        else:
+            for row in index.iter_files(args.ext, args.name, args.created_from, args.created_to, args.order_by):
+                print(f"{row['doc_created'] or row['created'] or '':26}  {row['path']}")
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+
+DEFAULT_EXTENSIONS = ('.docx', '.pdf', '.txt')
+DEFAULT_WORKERS = 16
+
+
+def is_excluded(path, name, exclude):
+    """True if ``name`` or the full ``path`` matches one of the exclude globs."""
+    return any(fnmatch(name, pattern) or fnmatch(path, pattern) for pattern in exclude)
+
+
+def scan_dir(path, extensions, exclude):
+    """List one directory, returning the matching files and subdirectories.
+
+    ``DirEntry.stat()`` reuses the data the directory listing already carries
+    (on Windows it needs no extra syscall at all), so each file is stat'ed at
+    most once.  Unreadable directories and files are skipped, as ``os.walk``
+    does.
+
+    Returns:
+        ``(files, subdirs)`` where ``files`` is a list of ``(path, stat)``.
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if exclude and is_excluded(entry.path, entry.name, exclude):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(extensions):
+                        files.append((entry.path, entry.stat()))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def walk_files(roots, extensions=DEFAULT_EXTENSIONS, exclude=(), workers=DEFAULT_WORKERS):
+    """Yield ``(path, stat)`` for every matching file below ``roots``.
+
+    Every directory is listed as its own task on a shared thread pool, so
+    idle threads pick up whatever subtree is waiting, whichever drive it is
+    on.  Directory listing releases the GIL, which lets the threads overlap
+    their I/O.  Files are yielded as their directory finishes, in no
+    particular order.
+
+    Args:
+        roots: Directories to scan; they are walked concurrently.
+        extensions: Lower-case suffixes to keep; ``None`` keeps every file.
+        exclude: Glob patterns matched against entry names and full paths;
+            matching directories are not descended into.
+        workers: Number of threads listing directories.
+    """
+    extensions = tuple(e.lower() for e in extensions) if extensions is not None else ''
+    exclude = tuple(exclude or ())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan_dir, root, extensions, exclude) for root in roots}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                files, subdirs = future.result()
+                for subdir in subdirs:
+                    pending.add(pool.submit(scan_dir, subdir, extensions, exclude))
+                yield from files
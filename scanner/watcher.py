@@ -0,0 +1,308 @@
+import os
+import threading
+import time
+
+from scanner.metadata import index_metadata
+from scanner.scan_engine import default_drives
+from scanner.scan_index import DEFAULT_INDEX, ScanIndex, row_from_stat
+from scanner.walker import DEFAULT_EXTENSIONS, is_excluded, walk_files
+
+DEBOUNCE = 0.2
+MAX_DELAY = 0.8
+SETTLE = 0.5
+POLL_INTERVAL = 0.05
+
+
+class ChangeBatcher:
+    """Coalesce filesystem events into batched change sets.
+
+    Events for the same path are folded together (created then deleted is
+    nothing, deleted then created is a modification), and a batch is handed
+    to ``on_batch`` once events stop arriving for ``debounce`` seconds or
+    ``max_delay`` seconds after the first pending event, whichever comes
+    first.  A copy of thousands of files therefore becomes a handful of
+    batches while a single dropped file is reported in well under a second.
+    Files whose mtime is younger than ``settle`` seconds are held back for
+    the next batch so half-copied files are not picked up.
+
+    Batches have the shape of a scan change set: ``added``, ``modified`` and
+    ``removed`` file lists, plus ``removed_dirs`` for directories that were
+    deleted or moved away.
+    """
+
+    def __init__(self, on_batch, debounce=DEBOUNCE, max_delay=MAX_DELAY, settle=SETTLE, clock=time.monotonic):
+        self.on_batch = on_batch
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.settle = settle
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._removed_dirs = set()
+        self._first = None
+        self._last = None
+
+    def _touch(self):
+        now = self.clock()
+        if self._first is None:
+            self._first = now
+        self._last = now
+
+    def add(self, path):
+        with self._lock:
+            previous = self._pending.get(path)
+            self._pending[path] = 'modified' if previous in ('removed', 'modified') else 'added'
+            self._touch()
+
+    def modify(self, path):
+        with self._lock:
+            if self._pending.get(path) != 'added':
+                self._pending[path] = 'modified'
+            self._touch()
+
+    def remove(self, path):
+        with self._lock:
+            if self._pending.get(path) == 'added':
+                del self._pending[path]
+            else:
+                self._pending[path] = 'removed'
+            self._touch()
+
+    def remove_dir(self, path):
+        prefix = os.path.join(path, '')
+        with self._lock:
+            for pending in [p for p in self._pending if p.startswith(prefix)]:
+                del self._pending[pending]
+            self._removed_dirs.add(path)
+            self._touch()
+
+    def due(self):
+        with self._lock:
+            if self._first is None:
+                return False
+            now = self.clock()
+            return now - self._last >= self.debounce or now - self._first >= self.max_delay
+
+    def flush(self):
+        """Hand the settled pending changes to ``on_batch``.
+
+        Returns:
+            The batch, or ``None`` if nothing was ready.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            removed_dirs, self._removed_dirs = sorted(self._removed_dirs), set()
+            self._first = self._last = None
+        batch = {'added': [], 'modified': [], 'removed': [], 'removed_dirs': removed_dirs}
+        held = {}
+        wall_now = time.time()
+        for path, kind in sorted(pending.items()):
+            if kind != 'removed':
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    if kind == 'modified':
+                        batch['removed'].append(path)
+                    continue
+                if wall_now - mtime < self.settle:
+                    held[path] = kind
+                    continue
+            batch[kind].append(path)
+        if held:
+            with self._lock:
+                for path, kind in held.items():
+                    self._pending.setdefault(path, kind)
+                self._touch()
+        if not any(batch.values()):
+            return None
+        self.on_batch(batch)
+        return batch
+
+    def run(self, stop):
+        """Flush batches as they come due until ``stop`` is set."""
+        while not stop.wait(POLL_INTERVAL):
+            if self.due():
+                self.flush()
+        self.flush()
+
+
+def make_handler(batcher, extensions=DEFAULT_EXTENSIONS, exclude=()):
+    """Build a watchdog event handler that feeds ``batcher``."""
+    from watchdog.events import FileSystemEventHandler
+
+    extensions = tuple(e.lower() for e in extensions)
+    exclude = tuple(exclude)
+
+    def wanted(path, is_directory=False):
+        if exclude and is_excluded(path, os.path.basename(path), exclude):
+            return False
+        return is_directory or path.lower().endswith(extensions)
+
+    class EvidenceEventHandler(FileSystemEventHandler):
+        def added(self, path, is_directory):
+            if not wanted(path, is_directory):
+                return
+            if is_directory:
+                # Folders moved in whole only report themselves, not their files.
+                for file_path, _ in walk_files([path], extensions, exclude, workers=4):
+                    batcher.add(file_path)
+            else:
+                batcher.add(path)
+
+        def removed(self, path, is_directory):
+            if is_directory:
+                batcher.remove_dir(path)
+            elif wanted(path):
+                batcher.remove(path)
+
+        def on_created(self, event):
+            self.added(event.src_path, event.is_directory)
+
+        def on_modified(self, event):
+            if not event.is_directory and wanted(event.src_path):
+                batcher.modify(event.src_path)
+
+        def on_deleted(self, event):
+            self.removed(event.src_path, event.is_directory)
+
+        def on_moved(self, event):
+            self.removed(event.src_path, event.is_directory)
+            self.added(event.dest_path, event.is_directory)
+
+    return EvidenceEventHandler()
+
+
+class ScanIndexUpdater:
+    """Apply watcher batches to the scan index, one transaction per batch.
+
+    With ``extensions`` only matching files are indexed, which lets a watcher
+    follow more file types than the index holds.  Document dates of indexed
+    files are read as they arrive.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX, extensions=None):
+        self.index = ScanIndex(index_path)
+        self.extensions = tuple(e.lower() for e in extensions) if extensions is not None else ''
+
+    def apply(self, batch):
+        """Update the index and return the batch with ``removed_dirs`` expanded to files."""
+        removed = list(batch['removed'])
+        for directory in batch.get('removed_dirs', ()):
+            removed.extend(self.index.paths_under(directory))
+        rows = []
+        present = set()
+        for path in (*batch['added'], *batch['modified']):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            present.add(path)
+            if path.lower().endswith(self.extensions):
+                rows.append(row_from_stat(path, stat))
+        self.index.update(rows, removed)
+        index_metadata(self.index, [row[0] for row in rows], workers=4)
+        return {
+            'added': [p for p in batch['added'] if p in present],
+            'modified': [p for p in batch['modified'] if p in present],
+            'removed': sorted(set(removed) - present),
+        }
+
+    def close(self):
+        self.index.close()
+
+
+class DropFolderWatcher:
+    """Watch folders for new evidence and report batched changes.
+
+    Args:
+        paths: Drives or folders to watch recursively.
+        on_batch: Called from the batching thread with each change set.
+        extensions, exclude: The same filters the scanner uses.
+    """
+
+    def __init__(self, paths, on_batch, extensions=DEFAULT_EXTENSIONS, exclude=(), debounce=DEBOUNCE,
+                 max_delay=MAX_DELAY, settle=SETTLE):
+        from watchdog.observers import Observer
+
+        self.paths = [p for p in paths if os.path.isdir(p)]
+        self.batcher = ChangeBatcher(on_batch, debounce, max_delay, settle)
+        self.observer = Observer()
+        handler = make_handler(self.batcher, extensions, exclude)
+        for path in self.paths:
+            self.observer.schedule(handler, path, recursive=True)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.batcher.run, args=(self._stop,), daemon=True)
+
+    def start(self):
+        self.observer.start()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def enqueue_files(queue, paths):
+    """Queue files for OCR and classification under their absolute paths.
+
+    Returns:
+        The number of files that were not already queued with the same content.
+    """
+    from modules.text_cache import file_sha256
+
+    queued = 0
+    for path in paths:
+        try:
+            file_hash = file_sha256(path)
+        except OSError:
+            continue
+        queued += queue.enqueue(os.path.abspath(path), file_hash)
+    return queued
+
+
+def watch(paths=None, index_path=DEFAULT_INDEX, queue_path=None, extensions=DEFAULT_EXTENSIONS, exclude=()):
+    """Keep the scan index (and optionally the epoch queue) current until interrupted."""
+    paths = paths or default_drives()
+    updater = ScanIndexUpdater(index_path)
+    queue = None
+    if queue_path:
+        from modules.epoch_queue import EpochQueue
+        queue = EpochQueue(queue_path)
+
+    def on_batch(batch):
+        changes = updater.apply(batch)
+        queued = enqueue_files(queue, changes['added'] + changes['modified']) if queue else 0
+        print(f"{len(changes['added'])} added, {len(changes['modified'])} modified, "
+              f"{len(changes['removed'])} removed, {queued} queued for OCR")
+
+    with DropFolderWatcher(paths, on_batch, extensions, exclude) as watcher:
+        print(f"Watching {', '.join(watcher.paths)}; Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    updater.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep the scan index current as evidence arrives')
+    parser.add_argument('paths', nargs='*', help='Drives or folders to watch (default: SCAN_DRIVES or F:/ D:/)')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Scan index database to keep updated')
+    parser.add_argument('--queue', help='Epoch queue database to feed new files into for OCR')
+    parser.add_argument('--ext', action='append', dest='extensions', help='File extension to index; repeatable')
+    parser.add_argument('--exclude', action='append', default=[], help='Glob of paths to ignore; repeatable')
+    args = parser.parse_args()
+    extensions = tuple(e if e.startswith('.') else f'.{e}' for e in args.extensions) if args.extensions else None
+    watch(args.paths, args.index, args.queue, extensions or DEFAULT_EXTENSIONS, args.exclude)
@@ -1,20 +1,21 @@
 import os
-import json
 from datetime import datetime
 from docx import Document
 
+from timeline.columnar import DEFAULT_COLUMNS
+from timeline.columnar import load_events as load_timeline
+
 BASE_DIR = os.getenv('LEGAL_RESULTS_DIR', os.path.join('F:/', 'LegalResults'))
 OUTPUT_DIR = os.path.join(BASE_DIR, 'SCHEDULING')
 ICS_PATH = os.path.join(OUTPUT_DIR, 'housing_case_timeline.ics')
 DOCX_PATH = os.path.join(OUTPUT_DIR, 'court_calendar_printable.docx')
 TIMELINE_FILE = os.path.join('data', 'timeline.json')
+TIMELINE_COLUMNS = DEFAULT_COLUMNS
 
 
-def load_events():
-    if os.path.exists(TIMELINE_FILE):
-        with open(TIMELINE_FILE, 'r') as f:
-            return json.load(f)
-    return []
+def load_events(start=None, end=None):
+    """Return the timeline events dated in ``[start, end)`` (ISO dates, either may be ``None``)."""
+    return load_timeline(start, end, TIMELINE_COLUMNS, TIMELINE_FILE)
 
 
 def export_ics(events):
@@ -42,8 +43,8 @@ def export_docx(events):
     print(f'Printable calendar saved to {DOCX_PATH}')
 
 
-def build_schedule():
-    events = load_events()
+def build_schedule(start=None, end=None):
+    events = load_events(start, end)
     export_ics(events)
     export_docx(events)
 
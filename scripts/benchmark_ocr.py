@@ -0,0 +1,59 @@
+import difflib
+import time
+from pathlib import Path
+
+from modules.image_preprocess import DEFAULT_SETTINGS, ocr_image
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
+
+def text_similarity(expected: str, actual: str) -> float:
+    """Character-level similarity of two OCR outputs, ignoring whitespace layout."""
+    a = ' '.join(expected.split()).lower()
+    b = ' '.join(actual.split()).lower()
+    if not a and not b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def benchmark_preprocessing(sample_dir: str, settings: dict | None = None) -> dict:
+    """Time raw versus pre-processed OCR on every image in ``sample_dir``.
+
+    Every image needs a ``<image>.txt`` ground-truth transcript next to it;
+    both OCR outputs are scored against that file.
+
+    Raises:
+        ValueError: If an image has no ground-truth file.
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    images = [p for p in sorted(Path(sample_dir).iterdir()) if p.suffix.lower() in IMAGE_SUFFIXES]
+    missing = [p.name for p in images if not p.with_suffix('.txt').exists()]
+    if missing:
+        raise ValueError(f"No <image>.txt ground truth for: {', '.join(missing)}")
+    rows = []
+    for image_path in images:
+        truth = image_path.with_suffix('.txt').read_text(encoding='utf-8', errors='ignore')
+        start = time.perf_counter()
+        raw = ocr_image(image_path, {'enabled': False})
+        raw_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        processed = ocr_image(image_path, settings)
+        processed_seconds = time.perf_counter() - start
+        rows.append({
+            'file': image_path.name,
+            'raw_seconds': raw_seconds,
+            'processed_seconds': processed_seconds,
+            'raw_accuracy': text_similarity(truth, raw),
+            'processed_accuracy': text_similarity(truth, processed),
+        })
+    raw_total = sum(r['raw_seconds'] for r in rows)
+    processed_total = sum(r['processed_seconds'] for r in rows)
+    return {
+        'settings': settings,
+        'samples': rows,
+        'raw_seconds': raw_total,
+        'processed_seconds': processed_total,
+        'speedup': raw_total / processed_total if processed_total else None,
+        'mean_raw_accuracy': sum(r['raw_accuracy'] for r in rows) / len(rows) if rows else None,
+        'mean_accuracy': sum(r['processed_accuracy'] for r in rows) / len(rows) if rows else None,
+    }
@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from modules import hash_service, text_cache
+
+
+def _write_pdf(path: Path, pages: list) -> None:
+    """Write a PDF whose pages carry the given text (``None`` for a scanned page)."""
+    writer = PdfWriter()
+    for text in pages:
+        page = PageObject.create_blank_page(width=612, height=792)
+        if text is None:
+            writer.add_page(page)
+            continue
+        font = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})}
+        )
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 700 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+@pytest.fixture
+def write_pdf() -> Callable[[Path, list], None]:
+    """Builder for small PDFs with a text layer on some pages and none on others."""
+    return _write_pdf
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Keep the shared caches under ~/.litigation_os out of the test run."""
+    root = tmp_path_factory.mktemp("litigation_os")
+    monkeypatch.setattr(text_cache, "DEFAULT_CACHE_DIR", root / "text_cache")
+    service = hash_service.HashService(root / "hash_cache.db")
+    monkeypatch.setattr(hash_service, "_default", service)
+    yield root
+    service.close()
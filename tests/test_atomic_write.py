@@ -0,0 +1,33 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from modules.atomic_write import atomic_open, write_json_array
+
+
+def test_write_json_array_matches_json_dump(tmp_path: Path) -> None:
+    items = [{"date": "2024-01-02", "files": [{"path": "a"}, {"path": "b"}]}, {"n": 1}]
+    path = tmp_path / "out.json"
+    assert write_json_array(iter(items), path) == 2
+    assert path.read_text() == json.dumps(items, indent=2)
+    assert write_json_array([], path) == 0
+    assert path.read_text() == "[]"
+
+
+def test_failed_write_keeps_the_old_file(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+    path.write_text("old")
+
+    def items():
+        yield {"n": 1}
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        write_json_array(items(), path)
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("partial")
+            raise RuntimeError("source failed")
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
@@ -0,0 +1,54 @@
+import pytest
+from PIL import Image
+
+from modules import batch_ocr
+from modules.batch_ocr import PAGE_BREAK, _split_pages, ocr_batch
+
+
+def test_split_pages_tolerates_trailing_separator() -> None:
+    output = f"one{PAGE_BREAK}two{PAGE_BREAK}"
+    assert _split_pages(output, 2) == ["one", "two"]
+    assert _split_pages(f"one{PAGE_BREAK}two", 2) == ["one", "two"]
+    assert _split_pages("one", 2) is None
+
+
+def test_ocr_batch_falls_back_per_image(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytesseract = pytest.importorskip("pytesseract")
+    images = [Image.new("L", (10, 10), shade) for shade in (0, 128, 255)]
+
+    def failing_list_file(batch, config, timeout):
+        raise RuntimeError("batch failed")
+
+    def image_to_string(image, config="", timeout=0):
+        if image.getpixel((0, 0)) == 128:
+            raise pytesseract.TesseractError(1, "unreadable")
+        return f" page {image.getpixel((0, 0))} "
+
+    monkeypatch.setattr(batch_ocr, "ocr_list_file", failing_list_file)
+    monkeypatch.setattr(pytesseract, "image_to_string", image_to_string)
+    texts = ocr_batch(images, return_exceptions=True)
+    assert texts[0] == "page 0"
+    assert isinstance(texts[1], pytesseract.TesseractError)
+    assert texts[2] == "page 255"
+    with pytest.raises(pytesseract.TesseractError):
+        ocr_batch(images)
+
+
+def test_submit_items_returns_lists_for_every_item(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from concurrent.futures import Future
+
+    import EPOCH_UNPACKER_ENGINE_v1 as engine
+
+    class InlinePool:
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    monkeypatch.setattr(engine, "EXTRACT_DIR", tmp_path)
+    (tmp_path / "note.txt").write_text("hello")
+    submitted = engine.submit_items(InlinePool(), [{"filename": "note.txt", "hash": "h1"}])
+    [(future, items)] = submitted
+    [result] = future.result()
+    assert items[0]["filename"] == "note.txt"
+    assert result["text"] == "hello"
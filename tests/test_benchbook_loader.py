@@ -3,6 +3,7 @@ from pathlib import Path
 from PyPDF2 import PdfWriter
 
 from modules.benchbook_loader import load_benchbook_texts
+from modules.text_cache import TextCache
 
 
 def test_load_benchbook_texts(tmp_path: Path) -> None:
@@ -11,5 +12,5 @@ def test_load_benchbook_texts(tmp_path: Path) -> None:
     writer.add_blank_page(width=72, height=72)
     with open(pdf_path, "wb") as f:
         writer.write(f)
-    texts = load_benchbook_texts(str(tmp_path))
+    texts = load_benchbook_texts(str(tmp_path), cache=TextCache(tmp_path / "cache"))
     assert pdf_path.name in texts
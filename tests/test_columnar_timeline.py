@@ -0,0 +1,77 @@
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from timeline.columnar import ColumnarTimeline, load_events, write_columns
+from timeline.store import epoch_key
+
+
+def _events(count: int) -> list:
+    rng = random.Random(5)
+    start = datetime(2024, 1, 1)
+    events = []
+    for i in range(count):
+        moment = start + timedelta(minutes=rng.randrange(500_000))
+        event = {"date": moment.isoformat(), "description": f"Filing №{i}", "path": f"/ev/{i}.pdf"}
+        if i % 3 == 0:
+            event.update(type=rng.choice(["Environmental", "Economic Coercion"]), entity=rng.choice(["HOA", "EGLE"]))
+        if i % 7 == 0:
+            event["linked_motions"] = [f"Motion {i}"]
+        events.append(event)
+    events.append({"date": "2024-03-04", "description": "Hearing"})
+    return sorted(events, key=lambda e: epoch_key(e["date"]))
+
+
+def test_columns_round_trip_and_answer_date_windows(tmp_path: Path) -> None:
+    events = _events(3000)
+    assert write_columns(events, tmp_path / "cols") == len(events)
+    timeline = ColumnarTimeline(tmp_path / "cols")
+
+    assert len(timeline) == len(events)
+    assert list(timeline.events()) == events
+    window = [e for e in events if "2024-03-01" <= e["date"] < "2024-04-01"]
+    assert list(timeline.events("2024-03-01", "2024-04-01")) == window
+    assert load_events("2024-03-01", "2024-04-01", tmp_path / "cols") == window
+    assert load_events("2024-03-01", "2024-04-01", tmp_path / "missing", tmp_path / "missing.json") == []
+
+
+def test_histograms_match_a_plain_count(tmp_path: Path) -> None:
+    events = _events(3000)
+    write_columns(events, tmp_path / "cols")
+    timeline = ColumnarTimeline(tmp_path / "cols")
+
+    weeks, counts = timeline.weekly_counts("2024-02-01", "2024-06-01")
+    assert counts.sum() == sum("2024-02-01" <= e["date"] < "2024-06-01" for e in events)
+    assert all(np.datetime64(w, "D").astype(datetime).weekday() == 0 for w in weeks)
+    for week, count in zip(weeks, counts):
+        first = week.astype(datetime).isoformat()
+        last = (week + 7).astype(datetime).isoformat()
+        assert count == sum(max(first, "2024-02-01") <= e["date"] < min(last, "2024-06-01") for e in events)
+
+    expected = {}
+    for e in events:
+        if e.get("entity"):
+            expected[e["entity"]] = expected.get(e["entity"], 0) + 1
+    assert timeline.category_counts("entity") == expected
+
+
+def test_unsorted_events_are_rejected_and_leave_no_temp_files(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        write_columns([{"date": "2025-02-01"}, {"date": "2025-01-01"}], tmp_path / "cols")
+    assert list((tmp_path / "cols").iterdir()) == []
+    assert not ColumnarTimeline.exists(tmp_path / "cols")
+
+
+def test_rewrites_publish_a_new_generation(tmp_path: Path) -> None:
+    cols = tmp_path / "cols"
+    write_columns([{"date": "2025-01-01", "description": "first"}], cols)
+    reader = ColumnarTimeline(cols)
+    write_columns([{"date": "2025-01-02", "description": "second"}], cols)
+    assert [e["description"] for e in reader.events()] == ["first"]
+    assert [e["description"] for e in ColumnarTimeline(cols).events()] == ["second"]
+    write_columns([{"date": "2025-01-03", "description": "third"}], cols)
+    generations = {p.name.split(".")[1] for p in cols.iterdir() if p.name != "meta.json"}
+    assert len(generations) == 2
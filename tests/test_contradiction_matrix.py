@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+from contradictions.contradiction_matrix import detect_contradictions, read_groups, write_groups
+from scanner.scan_index import ScanIndex, row_from_stat
+
+
+def _index(db: Path, files: dict) -> None:
+    with ScanIndex(db) as index:
+        index.replace_all(row_from_stat(str(path), path.stat()) for path in files)
+
+
+def _write(root: Path, files: dict) -> dict:
+    written = {}
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        written[path] = text
+    return written
+
+
+def test_groups_by_name_and_content(tmp_path: Path) -> None:
+    root = tmp_path / "F"
+    files = _write(root, {
+        "a/order.pdf": "signed order",
+        "b/order.pdf": "draft order",
+        "c/order_final.pdf": "signed order",
+        "d/notice.pdf": "notice",
+        "e/notice.pdf": "notice",
+        "f/unique.pdf": "nothing else like it",
+    })
+    db = tmp_path / "scan_index.db"
+    matrix = tmp_path / "matrix.json"
+    _index(db, files)
+
+    assert detect_contradictions(str(db), str(matrix)) == 3
+    groups = json.loads(matrix.read_text())
+    assert [(g["contradiction"], g.get("basename")) for g in groups] == [
+        ("identical copies", "notice.pdf"),
+        ("same name, different content", "order.pdf"),
+        ("same content, different names", None),
+    ]
+    assert {f["basename"] for f in groups[2]["files"]} == {"order.pdf", "order_final.pdf"}
+    with ScanIndex(db) as index:
+        assert index.get(str(root / "f" / "unique.pdf"))["hash"] is None
+
+    # Renaming the draft away splits the name group but leaves the rest alone.
+    (root / "b" / "order.pdf").rename(root / "b" / "draft.pdf")
+    files = {path: None for path in root.rglob("*.pdf")}
+    _index(db, files)
+    changes = {"added": [str(root / "b" / "draft.pdf")], "modified": [], "removed": [str(root / "b" / "order.pdf")]}
+    assert detect_contradictions(str(db), str(matrix), changes=changes) == 2
+    groups = json.loads(matrix.read_text())
+    assert [g["contradiction"] for g in groups] == ["identical copies", "same content, different names"]
+
+
+def test_read_groups_streams_across_chunk_boundaries(tmp_path: Path) -> None:
+    groups = [{"contradiction": "identical copies", "basename": f"n{i}.pdf",
+               "files": [{"path": f"a/n{i}.pdf", "size": i, "hash": "h"}] * 3} for i in range(20)]
+    written = tmp_path / "written.json"
+    write_groups(iter(groups), str(written))
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps(groups, separators=(",", ":")))
+    empty = tmp_path / "empty.json"
+    empty.write_text("[]")
+
+    assert list(read_groups(str(written), chunk_size=7)) == groups
+    assert list(read_groups(str(compact), chunk_size=7)) == groups
+    assert list(read_groups(str(empty), chunk_size=1)) == []
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+from modules.result_store import ResultStore
+from timeline.columnar import load_events
+from timeline.date_extraction import extract_events, extract_timeline_events, parse_date
+
+
+def test_parses_every_layout_and_rejects_impossible_dates() -> None:
+    assert parse_date("2025-05-20") == "2025-05-20"
+    assert parse_date("5/20/25") == "2025-05-20"
+    assert parse_date("Sept. 3rd, 2024") == "2024-09-03"
+    assert parse_date("3 September 2024") == "2024-09-03"
+    assert parse_date("2/30/2025") is None
+
+
+def test_events_carry_page_and_offset_once_per_date() -> None:
+    text = "Lease signed 1/2/2024.\fWater shut off on May 20, 2025 with a child present. Next\f" \
+           "Notice dated 2025-05-20; hearing on 6/3/2025."
+    events = extract_events("letter.pdf", text)
+    assert [(e["date"], e["page"], e["offset"]) for e in events] == [
+        ("2024-01-02", 1, 13),
+        ("2025-05-20", 2, 18),
+        ("2025-06-03", 3, 36),
+    ]
+    assert events[1]["description"] == "Water shut off on May 20, 2025 with a child present."
+    assert events[2]["description"] == "hearing on 6/3/2025."
+    assert all(e["path"] == "letter.pdf" for e in events)
+
+
+def test_text_events_are_merged_into_the_timeline(tmp_path: Path) -> None:
+    results = tmp_path / "epoch_results.jsonl"
+    output = tmp_path / "data" / "timeline.json"
+    with ResultStore(results) as store:
+        store.append("a.pdf", "Shutoff notice served 2025-05-20.", [], [])
+        store.append("b.pdf", "Writ executed May 24, 2025.", [], [])
+    assert extract_timeline_events(results, str(output), workers=1) == 2
+    assert [e["date"] for e in json.loads(output.read_text())] == ["2025-05-20", "2025-05-24"]
+
+    with ResultStore(results) as store:
+        store.append("a.pdf", "Shutoff notice served 2025-05-21.", [], [])
+    assert extract_timeline_events(results, str(output), workers=1) == 1
+    events = json.loads(output.read_text())
+    assert [(e["path"], e["date"]) for e in events] == [("a.pdf", "2025-05-21"), ("b.pdf", "2025-05-24")]
+    assert load_events(columns_path=tmp_path / "data" / "timeline_columns") == events
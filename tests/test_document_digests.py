@@ -0,0 +1,17 @@
+import sqlite3
+
+from modules.document_digests import DocumentDigests, text_digest
+
+
+def test_changed_skips_recorded_texts_and_lists_gone_documents() -> None:
+    conn = sqlite3.connect(":memory:")
+    DocumentDigests(conn).save([("a", text_digest("same")), ("b", text_digest("old")), ("c", text_digest("x"))])
+
+    digests = DocumentDigests(conn)
+    records = [("a", "same"), ("b", "new"), ("d", "added")]
+    batches = list(digests.changed(records, batch_size=1))
+    assert batches == [[("b", text_digest("new"), "new")], [("d", text_digest("added"), "added")]]
+    assert digests.gone() == ["c"]
+
+    digests.forget(digests.gone())
+    assert digests.known(["a", "b", "c"]) == {"a": text_digest("same"), "b": text_digest("old")}
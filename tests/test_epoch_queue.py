@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from modules.epoch_queue import EpochQueue
+
+
+def test_enqueue_deduplicates_by_hash(tmp_path: Path) -> None:
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        assert queue.enqueue("a.txt", "h1") is True
+        assert queue.enqueue("copy_of_a.txt", "h1") is False
+        assert queue.enqueue_many([("b.txt", "h2"), ("c.txt", "h1")]) == 1
+        assert queue.counts() == {"pending": 2}
+
+
+def test_dequeue_in_order_and_status_updates(tmp_path: Path) -> None:
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        queue.enqueue_many([("a.txt", "h1"), ("b.txt", "h2")])
+        assert queue.next_pending()["filename"] == "a.txt"
+        queue.mark_done("h1")
+        assert queue.next_pending()["filename"] == "b.txt"
+        queue.mark_error("h2", "boom")
+        assert queue.next_pending() is None
+        items = list(queue.items())
+        assert items[1] == {"filename": "b.txt", "hash": "h2", "status": "error", "error": "boom"}
+
+
+def test_import_legacy_json(tmp_path: Path) -> None:
+    legacy = tmp_path / "epoch_queue.json"
+    legacy.write_text(json.dumps({"index": [{"filename": "a.pdf", "hash": "x", "status": "done"}]}))
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        assert queue.import_legacy(legacy) == 1
+        assert list(queue.items("done"))[0] == {"filename": "a.pdf", "hash": "legacy:x", "status": "done"}
+
+
+def test_claim_release_and_batch_commit(tmp_path: Path) -> None:
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        queue.enqueue_many([("a.txt", "h1"), ("b.txt", "h2"), ("c.txt", "h3")])
+        claimed = queue.claim(2)
+        assert [item["hash"] for item in claimed] == ["h1", "h2"]
+        assert queue.claim(5)[0]["hash"] == "h3"
+        queue.release(["h3"])
+        queue.mark_many(["h1"], [("h2", "unreadable")])
+        assert queue.counts() == {"done": 1, "error": 1, "pending": 1}
+
+
+def test_requeue_processing_after_crash(tmp_path: Path) -> None:
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        queue.enqueue_many([("a.txt", "h1"), ("b.txt", "h2")])
+        queue.claim(2)
+        queue.mark_done("h1")
+    with EpochQueue(tmp_path / "queue.db") as queue:
+        assert queue.requeue_processing() == 1
+        assert queue.next_pending()["hash"] == "h2"
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from contradictions.fact_index import FactIndex, detect_fact_conflicts, extract_facts
+from contradictions.near_duplicates import result_texts
+from modules.result_store import ResultStore
+
+
+def test_extracts_labelled_facts() -> None:
+    text = "Homes of America, LLC: the monthly rent for Lot 42 is $1,395. Water shut off on May 20, 2025. Fee $5."
+    facts = {(kind, label, entity, value) for kind, label, entity, value, _ in extract_facts(text)}
+    assert facts == {
+        ("amount", "rent", "homes of america", "1395.00"),
+        ("lot", "lot", "homes of america", "42"),
+        ("date", "shutoff", "homes of america", "2025-05-20"),
+    }
+
+
+def test_conflicts_need_different_values_in_different_documents(tmp_path: Path) -> None:
+    results = tmp_path / "epoch_results.jsonl"
+    with ResultStore(results) as store:
+        store.append("lease.pdf", "Lease with Homes of America. Monthly rent: $395.00 due on the 1st.", [], [])
+        store.append("notice.pdf", "Homes of America notice: rent is now $695 per month.", [], [])
+        store.append("letter.pdf", "HOA shut off the water on 5/20/2025, raising rent from $395 to $695.", [], [])
+        store.append("log.txt", "HOA records show the water shut-off on 2025-05-21.", [], [])
+        store.append("receipt.pdf", "HOA: payment of $100 received; payment of $200 pending.", [], [])
+
+    index_path = tmp_path / "facts.db"
+    matrix = tmp_path / "matrix.json"
+    assert detect_fact_conflicts(results, index_path, matrix) == 2
+    groups = json.loads(matrix.read_text())
+    assert [(g["kind"], g["label"], g["entity"]) for g in groups] == [
+        ("amount", "rent", "homes of america"),
+        ("date", "shutoff", "hoa"),
+    ]
+    assert [(f["path"], f["value"]) for f in groups[1]["files"]] == [
+        ("letter.pdf", "2025-05-20"),
+        ("log.txt", "2025-05-21"),
+    ]
+
+    with FactIndex(index_path) as index:
+        assert index.update(result_texts(results)) == 0
+        assert [row[0] for row in index.facts_for("amount", "rent", "homes of america")] == ["395.00", "695.00"]
+
+
+def test_update_drops_documents_that_are_gone(tmp_path: Path) -> None:
+    with FactIndex(tmp_path / "facts.db") as index:
+        index.update([
+            ("lease.pdf", "Lease with Homes of America. Monthly rent: $395.00 due on the 1st."),
+            ("notice.pdf", "Homes of America notice: rent is now $695 per month."),
+        ])
+        assert len(list(index.conflicts())) == 1
+        assert index.update([("lease.pdf", "Lease with Homes of America. Monthly rent: $395.00 due on the 1st.")]) == 0
+        assert list(index.conflicts()) == []
+        assert index.digests(["lease.pdf", "notice.pdf"]).keys() == {"lease.pdf"}
@@ -0,0 +1,45 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from modules import hash_service
+from modules.hash_service import HashService
+
+
+def _old_file(path: Path, data: bytes, mtime: int = 1_600_000_000) -> str:
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_hashes_match_hashlib_and_skip_missing(tmp_path: Path) -> None:
+    paths = [_old_file(tmp_path / f"{n}.bin", os.urandom(n * 1000)) for n in range(1, 6)]
+    with HashService(tmp_path / "cache.db", workers=3, chunk_size=1024) as service:
+        hashes = service.hash_many(paths + [str(tmp_path / "missing.bin")])
+        assert hashes == {p: hashlib.sha256(Path(p).read_bytes()).hexdigest() for p in paths}
+        assert service.hash_file(paths[0]) == hashes[paths[0]]
+
+
+def test_unchanged_files_are_not_read_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = _old_file(tmp_path / "evidence.pdf", b"original")
+    reads = []
+    real = hash_service.stream_sha256
+    monkeypatch.setattr(hash_service, "stream_sha256", lambda p, c: reads.append(p) or real(p, c))
+    with HashService(tmp_path / "cache.db") as service:
+        first = service.hash_file(path)
+    with HashService(tmp_path / "cache.db") as service:
+        assert service.hash_many([path]) == {path: first}
+        assert len(reads) == 1
+        _old_file(Path(path), b"tampered", mtime=1_600_000_100)
+        assert service.hash_file(path) == hashlib.sha256(b"tampered").hexdigest()
+        assert len(reads) == 2
+
+
+def test_recently_modified_files_are_not_cached(tmp_path: Path) -> None:
+    path = tmp_path / "fresh.txt"
+    path.write_text("still being written")
+    with HashService(tmp_path / "cache.db") as service:
+        service.hash_file(path)
+        assert service.conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] == 0
@@ -0,0 +1,51 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from modules.image_preprocess import adaptive_binarize, preprocess_image
+
+
+def _photo(width: int, height: int) -> Image.Image:
+    """A dark-text-on-gradient stand-in for a phone photo of a page."""
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    for x in range(width):
+        shade = 120 + int(120 * x / width)
+        draw.line([(x, 0), (x, height)], fill=(shade, shade, shade))
+    draw.rectangle([width // 4, height // 2, width // 2, height // 2 + 20], fill=(20, 20, 20))
+    return image
+
+
+def test_preprocess_downscales_and_binarizes() -> None:
+    processed = preprocess_image(_photo(4000, 3000), {"target_dpi": 200, "page_inches": 11.0})
+    assert processed.mode == "L"
+    assert max(processed.size) == 2200
+    assert sum(processed.histogram()[1:255]) == 0
+
+
+def test_adaptive_binarize_survives_uneven_lighting() -> None:
+    binary = adaptive_binarize(_photo(400, 300), radius=15, offset=10)
+    assert binary.getpixel((10, 10)) == 255
+    assert binary.getpixel((390, 10)) == 255
+    assert binary.getpixel((150, 155)) == 0
+
+
+def test_disabled_settings_return_original() -> None:
+    image = _photo(100, 80)
+    assert preprocess_image(image, {"enabled": False}) is image
+
+
+def test_benchmark_scores_against_ground_truth(tmp_path, monkeypatch) -> None:
+    from scripts import benchmark_ocr
+
+    _photo(40, 30).save(tmp_path / "page.png")
+    with pytest.raises(ValueError, match="page.png"):
+        benchmark_ocr.benchmark_preprocessing(str(tmp_path))
+    (tmp_path / "page.txt").write_text("Notice to quit")
+
+    def ocr_image(path, settings):
+        return "Notice to qu1t" if settings.get("enabled") is False else "Notice to quit"
+
+    monkeypatch.setattr(benchmark_ocr, "ocr_image", ocr_image)
+    report = benchmark_ocr.benchmark_preprocessing(str(tmp_path))
+    assert report["mean_accuracy"] == 1.0
+    assert report["mean_raw_accuracy"] < 1.0
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from contradictions.contradiction_matrix import detect_contradictions
+from scanner.scan_engine import run_scan
+from timeline.builder import build_timeline
+from timeline.columnar import load_events
+
+
+def _write(path: Path, text: str = "x") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _scan(tmp_path: Path, **kwargs):
+    data = tmp_path / "data"
+    return run_scan([str(tmp_path / "F")], str(data / "scan_index.json"), incremental=True,
+                    state_path=str(data / "scan_state.json"), changes_path=str(data / "scan_changes.json"),
+                    index_path=str(data / "scan_index.db"), **kwargs)
+
+
+def test_incremental_scan_reports_changes_and_skips_unchanged_dirs(tmp_path: Path) -> None:
+    root = tmp_path / "F"
+    _write(root / "a.pdf")
+    _write(root / "sub" / "b.txt")
+    _write(root / "other" / "c.txt")
+    first = _scan(tmp_path)
+    assert len(first["added"]) == 3 and first["listed"] == 3
+
+    assert _scan(tmp_path) == {"added": [], "modified": [], "removed": [], "listed": 0, "skipped": 3}
+
+    _write(root / "sub" / "new.docx")
+    (root / "other" / "c.txt").unlink()
+    second = _scan(tmp_path)
+    assert second["added"] == [str(root / "sub" / "new.docx")]
+    assert second["removed"] == [str(root / "other" / "c.txt")]
+    assert second["listed"] == 2
+
+    _write(root / "a.pdf", "edited in place")
+    assert _scan(tmp_path)["modified"] == []
+    assert _scan(tmp_path, verify=True)["modified"] == [str(root / "a.pdf")]
+    index = json.loads((tmp_path / "data" / "scan_index.json").read_text())
+    assert sorted(index) == sorted(str(p) for p in [root / "a.pdf", root / "sub" / "b.txt", root / "sub" / "new.docx"])
+
+
+def test_consumers_apply_change_sets(tmp_path: Path) -> None:
+    root = tmp_path / "F"
+    index = tmp_path / "data" / "scan_index.db"
+    timeline = tmp_path / "data" / "timeline.json"
+    matrix = tmp_path / "data" / "matrix.json"
+    _write(root / "one" / "dup.pdf")
+    _write(root / "two" / "dup.pdf")
+    changes = _scan(tmp_path)
+    build_timeline(str(index), str(timeline), changes=changes)
+    assert detect_contradictions(str(index), str(matrix), changes=changes) == 1
+
+    _write(root / "three" / "dup.pdf")
+    (root / "one" / "dup.pdf").unlink()
+    changes = _scan(tmp_path)
+    build_timeline(str(index), str(timeline), changes=changes)
+    assert detect_contradictions(str(index), str(matrix), changes=changes) == 1
+    (group,) = json.loads(matrix.read_text())
+    assert group["contradiction"] == "identical copies"
+    assert {f["path"] for f in group["files"]} == {str(root / "two" / "dup.pdf"), str(root / "three" / "dup.pdf")}
+    events = json.loads(timeline.read_text())
+    indexed = json.loads((tmp_path / "data" / "scan_index.json").read_text())
+    assert sorted(e["path"] for e in events) == sorted(indexed)
+    assert load_events(columns_path=tmp_path / "data" / "timeline_columns") == events
+
+
+def test_change_set_after_full_build_is_idempotent(tmp_path: Path) -> None:
+    root = tmp_path / "F"
+    index = tmp_path / "data" / "scan_index.db"
+    timeline = tmp_path / "data" / "timeline.json"
+    matrix = tmp_path / "data" / "matrix.json"
+    _write(root / "one" / "dup.pdf")
+    _write(root / "two" / "dup.pdf")
+    changes = _scan(tmp_path)
+    build_timeline(str(index), str(timeline))
+    detect_contradictions(str(index), str(matrix))
+
+    build_timeline(str(index), str(timeline), changes=changes)
+    assert detect_contradictions(str(index), str(matrix), changes=changes) == 1
+    assert len(json.loads(timeline.read_text())) == 2
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / ".github" / "workflows" / "legacy_build.py"
+
+
+def test_script_loads_by_path_outside_the_repo(tmp_path: Path) -> None:
+    code = f"import runpy; ns = runpy.run_path({str(SCRIPT)!r}); print(ns['hash_file'].__module__)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                            env={"PATH": "", "HOME": str(tmp_path)})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "modules.hash_service"
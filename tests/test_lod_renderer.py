@@ -0,0 +1,73 @@
+import random
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from timeline.columnar import ColumnarTimeline, write_columns
+from timeline.store import epoch_key
+from warboard.lod_renderer import MAX_DETAIL_EVENTS, EventList, TiledWarboard, render_dates, tile_span
+
+
+def _events(count: int) -> list:
+    rng = random.Random(11)
+    start = datetime(2020, 1, 1)
+    events = [
+        {"date": (start + timedelta(minutes=rng.randrange(3_000_000))).isoformat(),
+         "description": f"Notice <{i}> & reply", "path": f"/ev/{i}.pdf"}
+        for i in range(count)
+    ]
+    events.sort(key=lambda e: epoch_key(e["date"]))
+    events[0]["linked_motions"] = ["Emergency Motion"]
+    return events
+
+
+def _nodes(svg: str) -> int:
+    return sum(1 for _ in ET.fromstring(svg).iter())
+
+
+def test_size_stays_bounded_as_the_timeline_grows() -> None:
+    small = render_dates(EventList(_events(5_000)))
+    large = render_dates(EventList(_events(50_000)))
+    assert _nodes(large) <= 2 * 200 + 50
+    assert len(large) < 2 * len(small)
+    detail = render_dates(EventList(_events(50)))
+    assert "&lt;7&gt; &amp; reply" in detail
+    assert _nodes(detail) >= 3 * 50
+
+
+def test_tiles_render_lazily_and_zoom_down_to_single_events(tmp_path: Path) -> None:
+    events = _events(20_000)
+    write_columns(events, tmp_path / "cols")
+    board = TiledWarboard.from_columns(tmp_path / "cols", tmp_path / "tiles", link=lambda e: "file:///m.docx"
+                                       if e.get("linked_motions") else None)
+    assert not list((tmp_path / "tiles").glob("*/*.svg"))
+
+    keys = board.source.keys
+    first = int(keys[0])
+    level, x = board.locate(first, first + 1)
+    tile = Path(board.tile(level, x)).read_text()
+    assert [p.name for p in (tmp_path / "tiles").glob("*/*.svg")] == [f"{x}.svg"]
+    lo, hi = tile_span(keys, level, x)
+    assert lo <= first < hi
+    count = ((keys >= lo) & (keys < hi)).sum()
+    assert count <= MAX_DETAIL_EVENTS or "<rect" in tile
+    if count <= MAX_DETAIL_EVENTS:
+        assert 'xlink:href="file:///m.docx"' in tile
+
+    deep = Path(board.tile(14, 0)).read_text()
+    assert "<rect" not in deep and "<circle" in deep
+
+    write_columns(events[:10], tmp_path / "cols")
+    TiledWarboard.from_columns(tmp_path / "cols", tmp_path / "tiles")
+    assert not list((tmp_path / "tiles").glob("*/*.svg"))
+    assert len(ColumnarTimeline(tmp_path / "cols")) == 10
+
+
+def test_stale_tiles_are_cleared_without_touching_other_files(tmp_path: Path) -> None:
+    write_columns(_events(100), tmp_path / "cols")
+    tiles = tmp_path / "exports"
+    (tiles / "reports").mkdir(parents=True)
+    (tiles / "warboard.svg").write_text("<svg/>")
+    TiledWarboard.from_columns(tmp_path / "cols", tiles).tile(1, 0)
+    TiledWarboard(ColumnarTimeline(tmp_path / "cols"), tiles, stamp="changed")
+    assert sorted(p.name for p in tiles.iterdir()) == ["reports", "stamp", "warboard.svg"]
@@ -0,0 +1,47 @@
+import json
+import random
+from pathlib import Path
+
+from contradictions.contradiction_matrix import write_groups
+from contradictions.near_duplicates import detect_near_duplicates, minhash
+from modules.result_store import ResultStore
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def _text(rng: random.Random, length: int = 400) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def test_edited_copies_are_paired_with_a_similarity(tmp_path: Path) -> None:
+    rng = random.Random(7)
+    lease = _text(rng)
+    words = lease.split()
+    words[100:103] = ["amended", "rent", "clause"]
+    edited = " ".join(words)
+    results = tmp_path / "epoch_results.jsonl"
+    with ResultStore(results) as store:
+        store.append("lease.pdf", lease, [], [])
+        store.append("scans/lease_rescan.pdf", edited.upper(), [], [])
+        for n in range(50):
+            store.append(f"other_{n}.pdf", _text(rng), [], [])
+        store.append("cover.pdf", "EXHIBIT A", [], [])
+
+    matrix = tmp_path / "matrix.json"
+    existing = {"contradiction": "identical copies", "basename": "a.pdf", "files": [{"path": "x/a.pdf"}]}
+    write_groups([existing], str(matrix))
+    assert detect_near_duplicates(results, str(matrix), workers=1) == 1
+    groups = json.loads(matrix.read_text())
+    assert groups[0] == existing
+    assert groups[1]["contradiction"] == "near-duplicate text"
+    assert [f["path"] for f in groups[1]["files"]] == ["lease.pdf", "scans/lease_rescan.pdf"]
+    assert 0.8 <= groups[1]["similarity"] < 1.0
+
+    # Re-running replaces the previous near-duplicate groups instead of adding to them.
+    assert detect_near_duplicates(results, str(matrix), workers=1) == 1
+    assert len(json.loads(matrix.read_text())) == 2
+
+
+def test_short_texts_have_no_signature() -> None:
+    assert minhash("EXHIBIT A") is None
+    assert minhash(_text(random.Random(1))).shape == (128,)
@@ -0,0 +1,47 @@
+import io
+import zipfile
+from pathlib import Path
+
+from modules.parallel_unzip import partition_members, unpack_parallel
+
+
+def _list_members(zip_path, indices, prefix):
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = zf.infolist()
+        return [{"name": prefix + infos[i].filename, "data": zf.read(infos[i])} for i in indices]
+
+
+def test_partition_members_balances_compressed_size() -> None:
+    infos = []
+    for name, size in [("a", 100), ("b", 60), ("c", 50), ("d", 40), ("e", 10)]:
+        info = zipfile.ZipInfo(name)
+        info.compress_size = size
+        infos.append(info)
+    ranges = partition_members(infos, 2)
+    loads = sorted(sum(infos[i].compress_size for i in r) for r in ranges)
+    assert loads == [120, 140]
+    assert sorted(i for r in ranges for i in r) == [0, 1, 2, 3, 4]
+    assert all(r == sorted(r) for r in ranges)
+
+
+def test_unpack_parallel_recurses_into_nested_archives(tmp_path: Path) -> None:
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("inner.txt", "nested")
+    nested_path = tmp_path / "inner.zip"
+    nested_path.write_bytes(inner.getvalue())
+    outer = tmp_path / "outer.zip"
+    with zipfile.ZipFile(outer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(10):
+            zf.writestr(f"file{i}.txt", "x" * (i + 1) * 100)
+        zf.writestr("bundle.zip", inner.getvalue())
+
+    seen = []
+
+    def on_records(records):
+        seen.extend(record["name"] for record in records)
+        return [(nested_path, "bundle.zip!/") for record in records if record["name"] == "bundle.zip"]
+
+    assert unpack_parallel(outer, _list_members, on_records, workers=2) == 12
+    assert "bundle.zip!/inner.txt" in seen
+    assert len(set(seen)) == 12
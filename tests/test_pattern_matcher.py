@@ -0,0 +1,29 @@
+import json
+from pathlib import Path
+
+from modules.pattern_matcher import PatternMatcher
+
+
+def test_find_all_reports_overlapping_hits_with_offsets() -> None:
+    matcher = PatternMatcher({"Judicial Order": ["order", "court order"], "Rent Ledger": ["rent"]})
+    hits = matcher.find_all("The Court Order on RENT")
+    assert [(h.start, h.end, h.term) for h in hits] == [(4, 15, "court order"), (10, 15, "order"), (19, 23, "rent")]
+    assert hits[0].categories == ("Judicial Order",)
+
+
+def test_shared_terms_and_prefixes() -> None:
+    matcher = PatternMatcher({"a": ["due", "due process"], "b": ["process"], "c": ["due"]})
+    hits = matcher.find_all("denied due process")
+    assert [(h.term, h.categories) for h in hits] == [
+        ("due", ("a", "c")),
+        ("due process", ("a",)),
+        ("process", ("b",)),
+    ]
+    assert matcher.categories("nothing here") == set()
+
+
+def test_from_json(tmp_path: Path) -> None:
+    config = tmp_path / "triggers.json"
+    config.write_text(json.dumps({"exhibit_keywords": {"Utility Bill": ["Sewer", "7-day (notice)"]}}))
+    matcher = PatternMatcher.from_json(config, "exhibit_keywords")
+    assert matcher.categories("Sewer backup after 7-day (notice)") == {"Utility Bill"}
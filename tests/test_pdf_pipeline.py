@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from modules import pdf_pipeline
+
+
+def test_read_text_layer_flags_scanned_pages(tmp_path: Path, write_pdf) -> None:
+    pdf = tmp_path / "mixed.pdf"
+    write_pdf(pdf, ["Notice to quit served on the tenant", None])
+    texts, missing = pdf_pipeline.read_text_layer(str(pdf))
+    assert "Notice to quit" in texts[0]
+    assert missing == [1]
+
+
+def test_extract_pdf_text_only_ocrs_missing_pages(tmp_path: Path, monkeypatch, write_pdf) -> None:
+    pdf = tmp_path / "mixed.pdf"
+    write_pdf(pdf, [None, "Judgment of possession entered by the court", None])
+    calls = []
+
+    def fake_ocr_pages(path, numbers, workers, dpi):
+        calls.append(numbers)
+        return [f"ocr page {n}" for n in numbers]
+
+    monkeypatch.setattr(pdf_pipeline, "ocr_pages", fake_ocr_pages)
+    text = pdf_pipeline.extract_pdf_text(str(pdf))
+    pages = text.split(pdf_pipeline.PAGE_SEPARATOR)
+    assert calls == [[0, 2]]
+    assert pages[0] == "ocr page 0"
+    assert "Judgment of possession" in pages[1]
+    assert pages[2] == "ocr page 2"
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from modules.result_store import ResultStore
+
+
+def test_append_and_lookup(tmp_path: Path) -> None:
+    with ResultStore(tmp_path / "results.jsonl", batch_size=2) as store:
+        store.append("a.txt", "rent due", [], ["Rent Ledger"])
+        assert store.get("a.txt")["exhibits"] == ["Rent Ledger"]
+        store.append("b.txt", "bias", ["flag"], [])
+        store.append("a.txt", "rent paid", [], [])
+    with ResultStore(tmp_path / "results.jsonl") as store:
+        assert store.get("a.txt")["text"] == "rent paid"
+        assert store.get("missing.txt") is None
+
+
+def test_recovers_unindexed_tail(tmp_path: Path) -> None:
+    data = tmp_path / "results.jsonl"
+    with ResultStore(data) as store:
+        store.append("a.txt", "one", [], [])
+    with open(data, "a") as f:
+        f.write(json.dumps({"filename": "b.txt", "text": "two", "canon": [], "exhibits": []}) + "\n")
+        f.write('{"filename": "c.txt", "te')
+    with ResultStore(data) as store:
+        assert store.get("b.txt")["text"] == "two"
+        assert store.get("c.txt") is None
+        store.append("c.txt", "three", [], [])
+    with ResultStore(data) as store:
+        assert [r["filename"] for r in store.records()] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_export_legacy_matches_json_dump(tmp_path: Path) -> None:
+    outputs = [tmp_path / "ocr.json", tmp_path / "canon.json", tmp_path / "exhibit.json"]
+    with ResultStore(tmp_path / "results.jsonl") as store:
+        store.append("a.txt", "rent", [], ["Rent Ledger"])
+        store.append("b.txt", "bias", ["flag"], [])
+        assert store.export_legacy(*outputs) == 2
+    expected = {"a.txt": ["Rent Ledger"], "b.txt": []}
+    assert outputs[2].read_text() == json.dumps(expected, indent=2)
+    assert json.loads(outputs[0].read_text()) == {"a.txt": "rent", "b.txt": "bias"}
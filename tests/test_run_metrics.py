@@ -0,0 +1,38 @@
+from modules.run_metrics import RunMetrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_throughput_stages_and_eta() -> None:
+    clock = FakeClock()
+    metrics = RunMetrics(total=10, window=60.0, clock=clock)
+    for _ in range(4):
+        clock.now += 1.0
+        metrics.record(nbytes=1000, stages={"extract": 0.1, "ocr": 0.5, "classify": 0.01})
+    snap = metrics.snapshot()
+    assert snap["files_per_sec"] == 1.0
+    assert snap["bytes_per_sec"] == 1000.0
+    assert snap["eta_seconds"] == 6.0
+    assert snap["bottleneck"] == "ocr"
+    assert snap["stages"]["ocr"]["mean_ms"] == 500.0
+    assert "bottleneck: ocr" in metrics.summary()
+
+
+def test_eta_follows_recent_rate() -> None:
+    clock = FakeClock()
+    metrics = RunMetrics(total=100, window=10.0, clock=clock)
+    for _ in range(10):
+        clock.now += 1.0
+        metrics.record()
+    for _ in range(10):
+        clock.now += 5.0
+        metrics.record()
+    snap = metrics.snapshot()
+    assert snap["recent_files_per_sec"] < 0.5
+    assert snap["eta_seconds"] > 80 / 0.5
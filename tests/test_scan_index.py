@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from scanner.scan_index import ScanIndex, make_row
+
+
+def _index(tmp_path: Path) -> ScanIndex:
+    index = ScanIndex(tmp_path / "scan_index.db")
+    index.upsert_many(
+        [
+            make_row("/ev/b/notice.pdf", 10, 1_700_000_000.0),
+            make_row("/ev/a/notice.pdf", 20, 1_600_000_000.0),
+            make_row("/ev/a/ledger.TXT", 30, 1_650_000_000.0),
+        ],
+        batch_size=2,
+    )
+    return index
+
+
+def test_queries_stream_in_requested_order(tmp_path: Path) -> None:
+    with _index(tmp_path) as index:
+        assert len(index) == 3
+        by_date = [row["path"] for row in index.iter_files(order_by="created")]
+        assert by_date == ["/ev/a/notice.pdf", "/ev/a/ledger.TXT", "/ev/b/notice.pdf"]
+        assert [row["path"] for row in index.iter_files(ext=".txt")] == ["/ev/a/ledger.TXT"]
+        assert len(list(index.iter_files(basename="notice.pdf"))) == 2
+        ledger_day = index.get("/ev/a/ledger.TXT")["created"][:10]
+        assert [row["basename"] for row in index.iter_files(created_from=ledger_day, created_to=ledger_day)] == [
+            "ledger.TXT"
+        ]
+        assert index.paths_under("/ev/a") == ["/ev/a/ledger.TXT", "/ev/a/notice.pdf"]
+
+
+def test_update_and_json_export_round_trip(tmp_path: Path) -> None:
+    with _index(tmp_path) as index:
+        index.update([make_row("/ev/c/order.pdf", 5, 1_690_000_000.0)], removed=["/ev/b/notice.pdf"])
+        exported = tmp_path / "scan_index.json"
+        assert index.export_json(exported) == 3
+        expected = {row["path"]: {"created": row["created"]} for row in index.iter_files()}
+        assert exported.read_text() == json.dumps(expected, indent=2, sort_keys=True)
+        legacy = ScanIndex.from_json(exported)
+        assert [row["created"] for row in legacy.iter_files()] == [row["created"] for row in index.iter_files()]
@@ -0,0 +1,86 @@
+import json
+import zipfile
+from pathlib import Path
+
+from PIL import Image
+
+from scanner.metadata import document_date, parse_pdf_date
+from scanner.scan_engine import run_scan
+from scanner.scan_index import ScanIndex
+from timeline.builder import build_timeline
+
+
+def _pdf(path: Path, created: str) -> None:
+    """Write a PDF with a classic xref whose Info object sits after the page payload."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [] /Count 0 >>",
+        b"<< /Length 2000 >>\nstream\n" + b"%" * 2000 + b"\nendstream",
+        b"<< /Producer (Scanner) /CreationDate (" + created.encode() + b") >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    startxref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, startxref)
+    path.write_bytes(bytes(out))
+
+
+def _docx(path: Path, created: str) -> None:
+    core = (
+        '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f'<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created></cp:coreProperties>'
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", "<w:document/>")
+        archive.writestr("docProps/core.xml", core)
+
+
+def _jpeg(path: Path, taken: str) -> None:
+    exif = Image.Exif()
+    exif.get_ifd(0x8769)[36867] = taken
+    Image.new("RGB", (8, 8)).save(path, exif=exif)
+
+
+def test_dates_are_read_from_headers(tmp_path: Path) -> None:
+    _pdf(tmp_path / "order.pdf", "D:20190304101100Z")
+    _docx(tmp_path / "motion.docx", "2020-05-06T07:08:09Z")
+    _jpeg(tmp_path / "photo.jpg", "2018:01:02 03:04:05")
+    (tmp_path / "broken.docx").write_text("not a zip")
+
+    assert document_date(str(tmp_path / "order.pdf")) == (parse_pdf_date(b"D:20190304101100Z"), "pdf:CreationDate")
+    assert document_date(str(tmp_path / "motion.docx"))[1] == "docx:created"
+    assert document_date(str(tmp_path / "photo.jpg")) == ("2018-01-02T03:04:05", "exif:DateTimeOriginal")
+    assert document_date(str(tmp_path / "broken.docx")) == (None, None)
+    assert parse_pdf_date(b"D:20190304101100+02'00'") == parse_pdf_date(b"D:20190304081100Z")
+
+
+def test_scan_stores_dates_and_timeline_prefers_them(tmp_path: Path) -> None:
+    root = tmp_path / "F"
+    root.mkdir()
+    _pdf(root / "late.pdf", "D:20210101000000")
+    _docx(root / "early.docx", "2001-01-01T00:00:00")
+    (root / "notes.txt").write_text("copied today")
+    db = tmp_path / "data" / "scan_index.db"
+    run_scan([str(root)], None, extensions=(".pdf", ".docx", ".txt"), index_path=str(db))
+
+    with ScanIndex(db) as index:
+        rows = {row["basename"]: row for row in index.iter_files()}
+        assert rows["late.pdf"]["doc_created"] == "2021-01-01T00:00:00"
+        assert rows["notes.txt"]["doc_source"] is None
+        # A rescan of unchanged files keeps the dates without reopening them.
+        index.set_metadata([(rows["late.pdf"]["path"], "2022-02-02T00:00:00", "pdf:CreationDate")])
+    run_scan([str(root)], None, extensions=(".pdf", ".docx", ".txt"), index_path=str(db))
+    with ScanIndex(db) as index:
+        assert index.get(rows["late.pdf"]["path"])["doc_created"] == "2022-02-02T00:00:00"
+
+    timeline = tmp_path / "data" / "timeline.json"
+    build_timeline(str(db), str(timeline))
+    events = json.loads(timeline.read_text())
+    assert [e["description"] for e in events] == ["early.docx", "late.pdf", "notes.txt"]
+    assert events[0]["date"] == "2001-01-01T00:00:00"
@@ -0,0 +1,34 @@
+import json
+import os
+from pathlib import Path
+
+from scanner.scan_engine import run_scan
+from scanner.walker import walk_files
+
+
+def _tree(root: Path) -> None:
+    for rel in ["a.pdf", "sub/b.DOCX", "sub/deep/c.txt", "sub/skip.jpg", "$RECYCLE.BIN/d.pdf", "tmp/e.txt.tmp"]:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def test_walk_files_filters_and_excludes(tmp_path: Path) -> None:
+    _tree(tmp_path / "F")
+    _tree(tmp_path / "D")
+    roots = [str(tmp_path / "F"), str(tmp_path / "D")]
+    found = {os.path.relpath(path, tmp_path) for path, _ in walk_files(roots, exclude=["$RECYCLE.BIN"], workers=4)}
+    expected = {os.path.join(d, rel) for d in "FD" for rel in ["a.pdf", "sub/b.DOCX", "sub/deep/c.txt"]}
+    assert found == {os.path.normpath(p) for p in expected}
+    pdfs = {os.path.basename(path) for path, _ in walk_files(roots, extensions=[".pdf"], workers=2)}
+    assert pdfs == {"a.pdf", "d.pdf"}
+
+
+def test_run_scan_writes_compatible_index(tmp_path: Path) -> None:
+    _tree(tmp_path / "F")
+    output = tmp_path / "data" / "scan_index.json"
+    run_scan([str(tmp_path / "F"), str(tmp_path / "missing")], str(output), exclude=["*RECYCLE*"])
+    assert (tmp_path / "data" / "scan_index.db").exists()
+    index = json.loads(output.read_text())
+    assert len(index) == 3
+    assert all(set(meta) == {"created"} for meta in index.values())
@@ -0,0 +1,49 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from timeline.columnar import write_columns
+from warboard import svg_renderer
+from warboard.svg_motion_binder import bind_motion_links
+from warboard.svg_renderer import render_warboard
+
+XLINK = "{http://www.w3.org/1999/xlink}href"
+
+EVENTS = [
+    {"date": "2024-03-26", "description": "Parenting time blocked"},
+    {"date": "2024-04-02", "description": "Filed <original> custody motion & brief"},
+    {"date": "2025-02-12", "description": "Contempt ruling", "linked_motions": ["Motion to Vacate"]},
+]
+
+
+def test_renders_given_events_with_links_and_escaping(tmp_path: Path) -> None:
+    svg = tmp_path / "board.svg"
+    links = {"Parenting time blocked": "Motion for Parenting Time"}
+    assert render_warboard(EVENTS, str(svg), links) == 3
+
+    root = ET.parse(svg).getroot()
+    texts = [t.text for t in root.iter("{http://www.w3.org/2000/svg}text")]
+    assert "Filed <original> custody motion & brief"[:45] in texts
+    hrefs = [a.get(XLINK) for a in root.iter("{http://www.w3.org/2000/svg}a")]
+    assert [h.rsplit("/", 1)[1] for h in hrefs] == ["Motion_for_Parenting_Time.docx", "Motion_to_Vacate.docx"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_timeline_is_read_once_from_the_columns(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    write_columns(EVENTS, tmp_path / "cols")
+    monkeypatch.setattr(svg_renderer, "TIMELINE_COLUMNS", str(tmp_path / "cols"))
+    monkeypatch.setattr(svg_renderer, "TIMELINE_FILE", str(tmp_path / "missing.json"))
+    one_pass = tmp_path / "one.svg"
+    assert render_warboard(svg_path=str(one_pass), start="2024-04-01") == 2
+    bind_motion_links(str(tmp_path / "wrapped.svg"), start="2024-04-01")
+    assert one_pass.read_text() == (tmp_path / "wrapped.svg").read_text()
+    assert one_pass.read_text().count("<circle") == 2
+
+
+def test_large_timelines_render_the_bounded_overview(tmp_path: Path) -> None:
+    events = [{"date": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "description": "x"} for i in range(1000)]
+    svg = tmp_path / "board.svg"
+    render_warboard(events, str(svg))
+    text = svg.read_text()
+    assert "<rect" in text and text.count("<circle") == 0
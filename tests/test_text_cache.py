@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from modules.text_cache import TextCache
+
+
+def test_get_or_extract_hits_cache(tmp_path: Path) -> None:
+    source = tmp_path / "exhibit.bin"
+    source.write_bytes(b"scanned bytes")
+    calls = []
+
+    def extract(path: Path) -> str:
+        calls.append(path)
+        return "Rent raised from $395 to $695"
+
+    cache = TextCache(tmp_path / "cache")
+    assert cache.get_or_extract(source, "ocr/1", extract) == "Rent raised from $395 to $695"
+    copy = tmp_path / "renamed.bin"
+    copy.write_bytes(b"scanned bytes")
+    assert cache.get_or_extract(copy, "ocr/1", extract) == "Rent raised from $395 to $695"
+    assert len(calls) == 1
+    cache.get_or_extract(source, "ocr/1", extract, settings={"dpi": 150})
+    assert len(calls) == 2
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    cache = TextCache(tmp_path / "cache", max_bytes=30)
+    cache.put("a" * 64, "x" * 200)
+    cache.put("b" * 64, "y" * 200)
+    assert cache.get("a" * 64) is not None
+    cache.put("c" * 64, "z" * 200)
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+
+
+def test_running_total_tracks_replaced_entries(tmp_path: Path) -> None:
+    cache = TextCache(tmp_path / "cache")
+    cache.put("a" * 64, "x" * 200)
+    cache.put("a" * 64, "y" * 500)
+    cache.put("b" * 64, "z" * 300)
+    assert cache._total == cache._stored_bytes()
+    assert TextCache(tmp_path / "cache")._total == cache._total
+
+
+def test_eviction_trims_to_the_low_water_mark(tmp_path: Path) -> None:
+    cache = TextCache(tmp_path / "cache", max_bytes=1000)
+    evictions = []
+    evict = cache._evict
+    cache._evict = lambda: evictions.append(1) or evict()
+    for i in range(300):
+        cache.put(f"{i:064d}", f"entry {i} " * 4)
+        assert cache._stored_bytes() <= 1000
+    # Each entry is a few dozen bytes, so trimming 10% frees room for several puts.
+    assert 0 < len(evictions) < 100
@@ -0,0 +1,53 @@
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from timeline.fusion_engine import merge_events
+from timeline.store import TimelineStore, epoch_key
+
+
+def _events(rng: random.Random, count: int, prefix: str) -> list:
+    start = datetime(2020, 1, 1)
+    return [
+        {"date": (start + timedelta(minutes=rng.randrange(2_000_000))).isoformat(), "description": f"{prefix}{i}",
+         "path": f"/ev/{prefix}{i}.pdf"}
+        for i in range(count)
+    ]
+
+
+def test_batches_merge_into_one_sorted_timeline(tmp_path: Path) -> None:
+    rng = random.Random(3)
+    store = TimelineStore(tmp_path / "store")
+    expected = _events(rng, 5000, "base")
+    assert store.replace(expected) == 5000
+    for batch in range(30):
+        fresh = _events(rng, 100, f"b{batch}-")
+        removed = {e["path"] for e in rng.sample(expected, 20)}
+        store.update(fresh, removed=removed)
+        expected = [e for e in expected if e["path"] not in removed] + fresh
+        assert len(store.runs) <= 8
+
+    events = list(TimelineStore(tmp_path / "store").events())
+    assert [epoch_key(e["date"]) for e in events] == sorted(epoch_key(e["date"]) for e in expected)
+    assert sorted(e["path"] for e in events) == sorted(e["path"] for e in expected)
+    assert sorted(p.name for p in (tmp_path / "store").iterdir()) == sorted(
+        ["manifest.json"] + [f"{run['name']}.{suffix}" for run in store.runs
+                             for suffix in ("tl", "del") if suffix == "tl" or run["removed"]]
+    )
+
+
+def test_presorted_rebuild_rejects_unsorted_input(tmp_path: Path) -> None:
+    store = TimelineStore(tmp_path / "store")
+    with pytest.raises(ValueError):
+        store.replace([{"date": "2025-02-01"}, {"date": "2025-01-01"}], presorted=True)
+    assert not (tmp_path / "store").exists() or not any(p.suffix == ".tmp" for p in (tmp_path / "store").iterdir())
+
+
+def test_merge_events_only_sorts_the_new_events() -> None:
+    existing = [{"date": "2025-01-01"}, {"date": "2025-03-01T12:00:00"}]
+    new = [{"date": "2025-05-20"}, {"date": "2025-02-01"}]
+    assert [e["date"] for e in merge_events(existing, new)] == [
+        "2025-01-01", "2025-02-01", "2025-03-01T12:00:00", "2025-05-20"
+    ]
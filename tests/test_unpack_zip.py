@@ -0,0 +1,83 @@
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import EPOCH_UNPACKER_ENGINE_v1 as engine
+from modules.text_cache import TextCache
+
+
+@pytest.fixture
+def base_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    original = engine.BASE_DIR
+    engine.set_base_dir(tmp_path)
+    monkeypatch.setattr(engine, "_text_cache", TextCache(tmp_path / "cache"))
+    yield tmp_path
+    engine.set_base_dir(original)
+
+
+def _zip(path: Path, members) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_unpack_zip_extracts_and_queues_new_members(base_dir: Path) -> None:
+    archive = _zip(base_dir / "in.zip", {"a.txt": "alpha", "copy.txt": "alpha", "b.txt": "beta"})
+    engine.unpack_zip(archive)
+    queued = {item["filename"]: item["status"] for item in engine.get_queue().items()}
+    assert queued == {"a.txt": "pending", "b.txt": "pending"}
+    assert engine.member_path("b.txt").read_text() == "beta"
+
+
+def test_unpack_zip_batches_members_and_recurses(base_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(engine, "ENQUEUE_BATCH", 2)
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("inner.txt", "nested")
+        zf.writestr("again.txt", "alpha")
+    archive = _zip(base_dir / "in.zip", {"a.txt": "alpha", "copy.txt": "alpha", "nested.zip": inner.getvalue()})
+    engine.unpack_zip(archive)
+    queued = {item["filename"]: item["status"] for item in engine.get_queue().items()}
+    assert queued == {"a.txt": "pending", "nested.zip": "done", "nested.zip!/inner.txt": "pending"}
+    assert engine.member_path("nested.zip!/inner.txt").read_text() == "nested"
+
+
+def test_parallel_unpack_drops_duplicates_across_ranges(base_dir: Path) -> None:
+    members = {f"copy{i}.txt": "same evidence" for i in range(8)}
+    members.update({f"unique{i}.txt": f"exhibit {i}" for i in range(8)})
+    engine.unpack_zip(_zip(base_dir / "in.zip", members), workers=2)
+    queued = [item["filename"] for item in engine.get_queue().items()]
+    assert len(queued) == 9
+    extracted = sorted(p.name for p in engine.EXTRACT_DIR.iterdir())
+    assert extracted == sorted(queued)
+
+
+def test_stream_mode_parses_text_layers_and_defers_the_rest(
+    base_dir: Path, monkeypatch: pytest.MonkeyPatch, write_pdf
+) -> None:
+    monkeypatch.setattr(engine, "STREAM_BUFFER_LIMIT", 4096)
+    write_pdf(base_dir / "text.pdf", ["Notice to quit served on the tenant"])
+    write_pdf(base_dir / "scan.pdf", [None])
+    archive = _zip(base_dir / "in.zip", {
+        "text.pdf": (base_dir / "text.pdf").read_bytes(),
+        "scan.pdf": (base_dir / "scan.pdf").read_bytes(),
+        "bad.pdf": b"%PDF-1.4 truncated",
+        "big.txt": "notice " * 1000,
+        "note.txt": "Notice to quit",
+        "copy.txt": "Notice to quit",
+    })
+    engine.unpack_zip(archive, stream=True)
+    queued = {item["filename"]: item["status"] for item in engine.get_queue().items()}
+    assert queued == {
+        "text.pdf": "done", "note.txt": "done",
+        "scan.pdf": "pending", "bad.pdf": "pending", "big.txt": "pending",
+    }
+    assert not engine.member_path("text.pdf").exists()
+    assert not engine.member_path("note.txt").exists()
+    assert engine.member_path("scan.pdf").exists()
+    assert engine.member_path("bad.pdf").read_bytes() == b"%PDF-1.4 truncated"
+    assert engine.member_path("big.txt").stat().st_size == len("notice " * 1000)
+    assert "Notice to quit" in engine.get_results().get("text.pdf")["text"]
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from scanner.scan_index import ScanIndex, make_row
+from scanner.watcher import ChangeBatcher, DropFolderWatcher, ScanIndexUpdater
+
+
+def _write(path: Path) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x")
+    os.utime(path, (0, 0))
+    return str(path)
+
+
+def test_batcher_coalesces_bursts(tmp_path: Path) -> None:
+    now = [0.0]
+    batches = []
+    batcher = ChangeBatcher(batches.append, debounce=0.2, max_delay=0.8, settle=0, clock=lambda: now[0])
+    kept = _write(tmp_path / "kept.pdf")
+    replaced = _write(tmp_path / "replaced.pdf")
+    for _ in range(3):
+        batcher.add(kept)
+        batcher.modify(kept)
+    batcher.add(str(tmp_path / "temp.pdf"))
+    batcher.remove(str(tmp_path / "temp.pdf"))
+    batcher.remove(replaced)
+    batcher.add(replaced)
+    batcher.remove_dir(str(tmp_path / "gone"))
+    now[0] = 0.1
+    assert not batcher.due()
+    now[0] = 0.3
+    assert batcher.due()
+    batcher.flush()
+    gone = str(tmp_path / "gone")
+    assert batches == [{"added": [kept], "modified": [replaced], "removed": [], "removed_dirs": [gone]}]
+    assert batcher.flush() is None
+
+
+def test_batcher_holds_files_still_being_written(tmp_path: Path) -> None:
+    batches = []
+    batcher = ChangeBatcher(batches.append, settle=60)
+    path = tmp_path / "copying.pdf"
+    path.write_text("partial")
+    batcher.add(str(path))
+    assert batcher.flush() is None
+    os.utime(path, (0, 0))
+    assert batcher.flush()["added"] == [str(path)]
+
+
+def test_index_updater_expands_removed_dirs(tmp_path: Path) -> None:
+    index_path = tmp_path / "scan_index.db"
+    with ScanIndex(index_path) as index:
+        index.upsert_many([make_row(str(tmp_path / "old" / "a.pdf"), 1, 0.0)])
+    new = _write(tmp_path / "new.pdf")
+    image = _write(tmp_path / "photo.jpg")
+    updater = ScanIndexUpdater(str(index_path), extensions=[".pdf"])
+    batch = {"added": [new, image], "modified": [], "removed": [], "removed_dirs": [str(tmp_path / "old")]}
+    changes = updater.apply(batch)
+    assert changes == {"added": [new, image], "modified": [], "removed": [str(tmp_path / "old" / "a.pdf")]}
+    assert [row["path"] for row in updater.index.iter_files()] == [new]
+    updater.close()
+
+
+def test_watcher_reports_new_files_within_a_second(tmp_path: Path) -> None:
+    pytest.importorskip("watchdog")
+    arrived = threading.Event()
+    batches = []
+
+    def on_batch(batch):
+        batches.append(batch)
+        arrived.set()
+
+    with DropFolderWatcher([str(tmp_path)], on_batch, settle=0):
+        started = time.monotonic()
+        (tmp_path / "drop.pdf").write_text("x")
+        assert arrived.wait(5)
+        latency = time.monotonic() - started
+    assert batches[0]["added"] == [str(tmp_path / "drop.pdf")]
+    assert latency < 1.0
@@ -1,29 +1,106 @@
-import json
 import os
-from datetime import datetime
+from typing import Optional
 
-SCAN_INDEX = os.path.join('data', 'scan_index.json')
+from scanner.scan_index import DEFAULT_INDEX, open_index
+from timeline.columnar import DEFAULT_COLUMNS, ColumnWriter
+from timeline.store import DEFAULT_STORE, TimelineStore, merge_sorted, write_events
+
+SCAN_INDEX = DEFAULT_INDEX
 TIMELINE_OUTPUT = os.path.join('data', 'timeline.json')
+# Events found in the documents' text by ``timeline.date_extraction``.
+TEXT_STORE = os.path.join('data', 'timeline_text_store')
+
+
+def event_date(row):
+    """Date of the file's event: the creation date recorded in the document, else the filesystem's."""
+    return row.get('doc_created') or row['created']
+
+
+def make_event(row):
+    return {'date': event_date(row), 'description': row['basename'], 'path': row['path']}
+
+
+def update_store(store, index, changes):
+    """Apply a scan change set to the timeline store.
+
+    Events for removed, modified and added files are dropped and events for
+    added and modified files are added as one sorted batch, so only the
+    changed files are touched and applying the same change set twice is
+    harmless.
+    """
+    stale = set(changes.get('removed', ())) | set(changes.get('modified', ())) | set(changes.get('added', ()))
+    rows = index.get_many([*changes.get('added', ()), *changes.get('modified', ())])
+    return store.update((make_event(row) for row in rows.values() if event_date(row)), removed=stale)
+
 
+def beside(output, default):
+    return os.path.join(os.path.dirname(output), os.path.basename(default))
 
-def build_timeline(scan_index: str = SCAN_INDEX, output: str = TIMELINE_OUTPUT) -> None:
+
+def export_timeline(output: str = TIMELINE_OUTPUT, store_path: Optional[str] = None,
+                    columns_path: Optional[str] = None, text_store_path: Optional[str] = None) -> int:
+    """Export the stored events to ``output`` and the columns in one date-ordered pass.
+
+    File events from the timeline store and text events from the text store
+    (by default ``timeline_store`` and ``timeline_text_store`` beside
+    ``output``) are merged as they stream, so neither is loaded whole.
+
+    Returns:
+        The number of events written.
+    """
+    store = TimelineStore(store_path or beside(output, DEFAULT_STORE))
+    text_store = TimelineStore(text_store_path or beside(output, TEXT_STORE))
+    columns = ColumnWriter(columns_path or beside(output, DEFAULT_COLUMNS))
+
+    def exported():
+        for event in merge_sorted(store.events(), text_store.events()):
+            columns.add(event)
+            yield event
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    try:
+        count = write_events(exported(), output)
+    except BaseException:
+        columns.abort()
+        raise
+    columns.close()
+    return count
+
+
+def build_timeline(scan_index: str = SCAN_INDEX, output: str = TIMELINE_OUTPUT, changes=None,
+                   store_path: Optional[str] = None, columns_path: Optional[str] = None) -> None:
+    """Build the timeline from the scan index.
+
+    Events are dated by the creation date recorded inside each document
+    where the scan found one, since the filesystem creation time on the
+    evidence drives is usually when the file was copied there.  They are
+    kept sorted in the timeline store at ``store_path`` (by default
+    ``timeline_store`` beside ``output``) and exported, together with the
+    events ``timeline.date_extraction`` found in the documents' text, to
+    ``output`` and to the memory-mapped columns at ``columns_path`` (by
+    default ``timeline_columns`` beside ``output``) that the schedule and
+    warboards query by date.  Pass the change set of an incremental scan as
+    ``changes`` to add only the changed files' events to the store instead
+    of rebuilding it; a missing store is rebuilt in full.  A legacy
+    ``scan_index.json`` is still accepted as ``scan_index``.
+    """
     if not os.path.exists(scan_index):
         print('Scan index not found; run the scan engine first.')
         return
-    with open(scan_index, 'r') as f:
-        data = json.load(f)
-
-    events = []
-    for path, meta in data.items():
-        date = meta.get('created')
-        if date:
-            events.append({'date': date, 'description': os.path.basename(path)})
-
-    events.sort(key=lambda e: datetime.fromisoformat(e['date']))
-    os.makedirs(os.path.dirname(output), exist_ok=True)
-    with open(output, 'w') as f:
-        json.dump(events, f, indent=2)
-    print(f'Timeline written to {output} with {len(events)} events')
+
+    store_path = store_path or beside(output, DEFAULT_STORE)
+    store = TimelineStore(store_path)
+    with open_index(scan_index) as index:
+        if changes is None or not store.exists():
+            # Document and filesystem dates are both stored as local ISO
+            # strings, which sort chronologically, so the index's date order
+            # is already the timeline order and is streamed straight in.
+            rows = index.iter_files(order_by='date')
+            store.replace((make_event(row) for row in rows if event_date(row)), presorted=True)
+        else:
+            update_store(store, index, changes)
+    count = export_timeline(output, store_path, columns_path)
+    print(f'Timeline written to {output} with {count} events')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,316 @@
+import json
+import os
+import re
+import time
+from array import array
+from datetime import timedelta
+
+import numpy as np
+
+from modules.atomic_write import atomic_open
+
+from timeline.store import EPOCH, epoch_key
+
+DEFAULT_COLUMNS = os.path.join('data', 'timeline_columns')
+TIMELINE_FILE = os.path.join('data', 'timeline.json')
+META = 'meta.json'
+COLUMNS_VERSION = 2
+CATEGORICAL = ('type', 'entity')
+STRINGS = ('description', 'path', 'extra')
+KNOWN_KEYS = {'date', 'description', 'path', *CATEGORICAL}
+
+# Layout of a column directory, one row per event in date order:
+#   date.<gen>.npy              int64 microseconds since 1970 (read as datetime64[us])
+#   date_only.<gen>.npy         bool, the event's date had no time part
+#   type.<gen>.npy, entity...   int32 codes into the "categories" lists in meta.json
+#   <string>_offsets.<gen>.npy  int64, n + 1 offsets into <string>.<gen>.bin (UTF-8)
+#   meta.json                   {"version": 2, "generation": gen, "count": n, "categories": {...}}
+# ``extra`` holds any other event keys (e.g. linked_motions) as JSON; it is
+# empty for events that have none.  Every write produces a new generation of
+# files, and replacing meta.json is what publishes it, so a reader sees the
+# old set of columns or the new one, never a mix.  The previous generation is
+# kept for readers that loaded meta.json just before the switch; older ones
+# are deleted.  Version 1 directories have no generation in their file names.
+GENERATION_FILE = re.compile(r'^\w+\.([0-9a-f]+-\d+)\.(?:npy|bin)$')
+
+
+def column_file(name, generation=None):
+    """File name of ``name`` (e.g. ``date.npy``) in one generation of a column directory."""
+    if generation is None:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{generation}{ext}'
+
+
+def read_generation(path):
+    """Generation published in the column directory ``path``, or ``None`` without one."""
+    try:
+        with open(os.path.join(str(path), META), 'r') as f:
+            return json.load(f).get('generation')
+    except (OSError, ValueError):
+        return None
+
+
+class ColumnWriter:
+    """Write date-sorted events to a column directory one event at a time.
+
+    Columns are accumulated in compact typed arrays and the strings are
+    streamed to their blobs, so writing costs a few bytes per event rather
+    than a dict per event.
+    """
+
+    def __init__(self, path=DEFAULT_COLUMNS):
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+        self.generation = f'{time.time_ns():x}-{os.getpid()}'
+        self.dates = array('q')
+        self.date_only = array('b')
+        self.codes = {name: array('i') for name in CATEGORICAL}
+        self.categories = {name: {'': 0} for name in CATEGORICAL}
+        self.offsets = {name: array('q', [0]) for name in STRINGS}
+        self.blobs = {name: open(self._file(f'{name}.bin'), 'wb') for name in STRINGS}
+
+    def _file(self, name):
+        return os.path.join(self.path, column_file(name, self.generation))
+
+    def add(self, event):
+        """Append one event; events must arrive in date order.
+
+        Raises:
+            ValueError: If the event is dated before the previous one.
+        """
+        key = epoch_key(event['date'])
+        if self.dates and key < self.dates[-1]:
+            raise ValueError(f"event dated {event['date']} is out of order")
+        self.dates.append(key)
+        self.date_only.append('T' not in event['date'] and ' ' not in event['date'])
+        for name in CATEGORICAL:
+            codes = self.categories[name]
+            self.codes[name].append(codes.setdefault(event.get(name) or '', len(codes)))
+        extra = {k: v for k, v in event.items() if k not in KNOWN_KEYS}
+        values = {
+            'description': event.get('description') or '',
+            'path': event.get('path') or '',
+            'extra': json.dumps(extra) if extra else '',
+        }
+        for name, value in values.items():
+            data = value.encode('utf-8')
+            self.blobs[name].write(data)
+            self.offsets[name].append(self.offsets[name][-1] + len(data))
+
+    def abort(self):
+        """Drop the partly written columns, leaving the published ones in place."""
+        for name, blob in self.blobs.items():
+            blob.close()
+            os.remove(self._file(f'{name}.bin'))
+
+    def close(self):
+        """Finish the columns and publish them."""
+        for blob in self.blobs.values():
+            blob.close()
+        arrays = {
+            'date': np.frombuffer(self.dates, dtype=np.int64),
+            'date_only': np.frombuffer(self.date_only, dtype=np.int8).astype(bool),
+            **{name: np.frombuffer(codes, dtype=np.int32) for name, codes in self.codes.items()},
+            **{f'{name}_offsets': np.frombuffer(offsets, dtype=np.int64) for name, offsets in self.offsets.items()},
+        }
+        for name, values in arrays.items():
+            with open(self._file(f'{name}.npy'), 'wb') as f:
+                np.save(f, values)
+        meta = {
+            'version': COLUMNS_VERSION,
+            'generation': self.generation,
+            'count': len(self.dates),
+            'categories': {name: list(codes) for name, codes in self.categories.items()},
+        }
+        previous = read_generation(self.path)
+        meta_path = os.path.join(self.path, META)
+        with atomic_open(meta_path) as f:
+            json.dump(meta, f)
+        self._remove_stale({self.generation, previous})
+        return len(self.dates)
+
+    def _remove_stale(self, keep):
+        """Delete column files of generations other than ``keep``."""
+        legacy = {f'{name}.npy' for name in ('date', 'date_only', *CATEGORICAL)}
+        legacy |= {f'{name}_offsets.npy' for name in STRINGS} | {f'{name}.bin' for name in STRINGS}
+        for name in os.listdir(self.path):
+            match = GENERATION_FILE.match(name)
+            if match:
+                stale = match.group(1) not in keep
+            else:
+                stale = name in legacy and None not in keep
+            if stale:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass  # still mapped by a reader on Windows; the next write retries
+
+
+def write_columns(events, path=DEFAULT_COLUMNS):
+    """Write date-sorted ``events`` as columns; returns the number written."""
+    writer = ColumnWriter(path)
+    try:
+        for event in events:
+            writer.add(event)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def to_datetime64(value):
+    """Convert an ISO string, ``datetime`` or ``datetime64`` to ``datetime64[us]``."""
+    if isinstance(value, str):
+        return np.datetime64(epoch_key(value), 'us')
+    return np.datetime64(value, 'us')
+
+
+class ColumnarTimeline:
+    """Read-only view of a column directory, memory-mapped from disk.
+
+    Only the pages a query touches are read: a date window is two binary
+    searches on the sorted date column, and histograms are ``bincount``
+    over slices of the code columns.
+
+    Args:
+        path: Column directory written by ``ColumnWriter``.
+        mmap: Map the columns instead of reading them into memory.
+    """
+
+    def __init__(self, path=DEFAULT_COLUMNS, mmap=True):
+        self.path = str(path)
+        with open(os.path.join(self.path, META), 'r') as f:
+            meta = json.load(f)
+        mode = 'r' if mmap else None
+        self.count = meta['count']
+        self.categories = meta['categories']
+        generation = meta.get('generation')
+
+        def load(name):
+            return np.load(os.path.join(self.path, column_file(f'{name}.npy', generation)),
+                           mmap_mode=mode if self.count else None)
+
+        self.dates = load('date').view('datetime64[us]')
+        self.date_only = load('date_only')
+        self.codes = {name: load(name) for name in CATEGORICAL}
+        self.offsets = {name: load(f'{name}_offsets') for name in STRINGS}
+        self.blobs = {}
+        for name in STRINGS:
+            blob_path = os.path.join(self.path, column_file(f'{name}.bin', generation))
+            size = os.path.getsize(blob_path)
+            self.blobs[name] = np.memmap(blob_path, dtype=np.uint8, mode='r') if size else np.empty(0, np.uint8)
+
+    @classmethod
+    def exists(cls, path=DEFAULT_COLUMNS):
+        return os.path.exists(os.path.join(str(path), META))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def keys(self):
+        """The date column as ``epoch_key`` integers, without copying."""
+        return self.dates.view(np.int64)
+
+    def window(self, start=None, end=None):
+        """Return the ``(lo, hi)`` row range of events dated in ``[start, end)``."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, to_datetime64(start), side='left'))
+        hi = self.count if end is None else int(np.searchsorted(self.dates, to_datetime64(end), side='left'))
+        return lo, max(lo, hi)
+
+    def _string(self, name, i):
+        offsets = self.offsets[name]
+        return self.blobs[name][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def event(self, i):
+        """Rebuild row ``i`` as the event dict it was written from."""
+        moment = EPOCH + timedelta(microseconds=int(self.dates[i].astype(np.int64)))
+        event = {'date': moment.date().isoformat() if self.date_only[i] else moment.isoformat(),
+                 'description': self._string('description', i)}
+        for name in CATEGORICAL:
+            code = int(self.codes[name][i])
+            if code:
+                event[name] = self.categories[name][code]
+        path = self._string('path', i)
+        if path:
+            event['path'] = path
+        extra = self._string('extra', i)
+        if extra:
+            event.update(json.loads(extra))
+        return event
+
+    def events(self, start=None, end=None):
+        """Yield the events dated in ``[start, end)``, in date order."""
+        lo, hi = self.window(start, end)
+        for i in range(lo, hi):
+            yield self.event(i)
+
+    def weekly_counts(self, start=None, end=None):
+        """Count events per ISO week (weeks start on Monday) in ``[start, end)``.
+
+        Returns:
+            ``(week_starts, counts)`` as ``datetime64[D]`` and ``int64`` arrays,
+            covering every week from the first event to the last.
+        """
+        lo, hi = self.window(start, end)
+        if lo == hi:
+            return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.int64)
+        # datetime64 weeks begin on Thursday 1970-01-01; shift so they begin on Monday.
+        days = self.dates[lo:hi].astype('datetime64[D]').astype(np.int64) + 3
+        weeks = days // 7
+        counts = np.bincount(weeks - weeks[0])
+        week_starts = (np.arange(weeks[0], weeks[-1] + 1) * 7 - 3).astype('datetime64[D]')
+        return week_starts, counts
+
+    def category_counts(self, name, start=None, end=None):
+        """Count events per ``type`` or ``entity`` in ``[start, end)``, skipping events without one."""
+        lo, hi = self.window(start, end)
+        counts = np.bincount(self.codes[name][lo:hi], minlength=len(self.categories[name]))
+        return {label: int(count) for label, count in zip(self.categories[name], counts) if label and count}
+
+
+def has_timeline(columns_path=DEFAULT_COLUMNS, timeline_file=TIMELINE_FILE):
+    return ColumnarTimeline.exists(columns_path) or os.path.exists(timeline_file)
+
+
+def load_events(start=None, end=None, columns_path=DEFAULT_COLUMNS, timeline_file=TIMELINE_FILE):
+    """Return the timeline events dated in ``[start, end)``.
+
+    Reads the memory-mapped columns when they exist, so only the requested
+    window is decoded; otherwise falls back to filtering ``timeline_file``.
+    """
+    if ColumnarTimeline.exists(columns_path):
+        return list(ColumnarTimeline(columns_path).events(start, end))
+    if not os.path.exists(timeline_file):
+        return []
+    with open(timeline_file, 'r') as f:
+        events = json.load(f)
+    if start is None and end is None:
+        return events
+    lo = None if start is None else int(to_datetime64(start).astype(np.int64))
+    hi = None if end is None else int(to_datetime64(end).astype(np.int64))
+    keys = ((epoch_key(e['date']), e) for e in events)
+    return [e for key, e in keys if (lo is None or key >= lo) and (hi is None or key < hi)]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the columnar timeline')
+    parser.add_argument('--columns', default=DEFAULT_COLUMNS, help='Column directory')
+    parser.add_argument('--from', dest='start', help='First date to include (ISO)')
+    parser.add_argument('--to', dest='end', help='Date to stop before (ISO)')
+    parser.add_argument('--weekly', action='store_true', help='Print events per week')
+    parser.add_argument('--by', choices=CATEGORICAL, help='Print events per type or entity')
+    args = parser.parse_args()
+    timeline = ColumnarTimeline(args.columns)
+    if args.weekly:
+        for week, count in zip(*timeline.weekly_counts(args.start, args.end)):
+            print(f'{week}  {count}')
+    elif args.by:
+        for label, count in sorted(timeline.category_counts(args.by, args.start, args.end).items()):
+            print(f'{count:8}  {label}')
+    else:
+        for event in timeline.events(args.start, args.end):
+            print(f"{event['date']}  {event['description']}")
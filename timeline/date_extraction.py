@@ -0,0 +1,199 @@
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+from contradictions.near_duplicates import RESULTS_FILE, result_texts
+from modules.document_digests import DocumentDigests
+from modules.pdf_pipeline import PAGE_SEPARATOR
+from timeline.builder import TEXT_STORE, TIMELINE_OUTPUT, beside, export_timeline
+from timeline.store import TimelineStore
+
+BATCH_SIZE = 2048
+PARSE_CACHE = 1 << 16
+# Characters of text kept on either side of a date for its description,
+# cut back to the enclosing sentence.
+CONTEXT_CHARS = 120
+TEXT_EVENT_TYPE = 'Date in text'
+DIGESTS = 'documents.db'
+
+MONTHS = {name: number for number, names in enumerate(
+    [('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'), ('may',), ('jun', 'june'),
+     ('jul', 'july'), ('aug', 'august'), ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'),
+     ('dec', 'december')], 1) for name in names}
+# Factored by prefix rather than a flat alternation of the names in
+# ``MONTHS``, so a word that is not a month fails after a letter or two.
+MONTH_NAMES = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+               r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+
+# One alternation over every supported layout, so each text is scanned once:
+# 2025-05-20, 5/20/2025 (or 5/20/25), May 20, 2025 and 20 May 2025.  The
+# lookahead skips positions that cannot start a date without entering the
+# alternation.
+DATE = re.compile(
+    r'(?=[\dadfjmnos])\b(?:(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})'
+    r'|(?P<us_m>\d{1,2})/(?P<us_d>\d{1,2})/(?P<us_y>\d{4}|\d{2})'
+    rf'|(?P<named_m>{MONTH_NAMES})\.?\s+(?P<named_d>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<named_y>\d{{4}})'
+    rf'|(?P<first_d>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<first_m>{MONTH_NAMES})\.?,?\s+(?P<first_y>\d{{4}}))\b',
+    re.IGNORECASE,
+)
+SENTENCE_BREAK = re.compile(r'[.;!?]\s|\n\s*\n')
+
+
+def make_date(year, month, day):
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+    try:
+        return date(year, int(month), int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE)
+def parse_date(token):
+    """Normalize one date as written in a document to an ISO date, or ``None`` if it is not a real date.
+
+    Letterheads, footers and form fields repeat the same few dates across
+    thousands of pages, so results are cached by the exact text matched.
+    """
+    match = DATE.fullmatch(token)
+    if not match:
+        return None
+    parts = match.groupdict()
+    if parts['iso_y']:
+        return make_date(parts['iso_y'], parts['iso_m'], parts['iso_d'])
+    if parts['us_y']:
+        return make_date(parts['us_y'], parts['us_m'], parts['us_d'])
+    if parts['named_y']:
+        return make_date(parts['named_y'], MONTHS[parts['named_m'].lower()], parts['named_d'])
+    return make_date(parts['first_y'], MONTHS[parts['first_m'].lower()], parts['first_d'])
+
+
+def find_dates(text):
+    """Yield ``(iso_date, start, end)`` for every valid date written in ``text``."""
+    for match in DATE.finditer(text):
+        value = parse_date(match.group())
+        if value:
+            yield value, match.start(), match.end()
+
+
+def context(text, start, end):
+    """The sentence around ``text[start:end]``, at most ``CONTEXT_CHARS`` either side, whitespace collapsed."""
+    lo = max(0, start - CONTEXT_CHARS)
+    breaks = list(SENTENCE_BREAK.finditer(text, lo, start))
+    if breaks:
+        lo = breaks[-1].end()
+    stop = SENTENCE_BREAK.search(text, end, end + CONTEXT_CHARS)
+    hi = stop.start() + 1 if stop else min(len(text), end + CONTEXT_CHARS)
+    return ' '.join(text[lo:hi].split())
+
+
+def extract_events(file, text):
+    """Return a timeline event for each distinct date mentioned in one document.
+
+    A date repeated in the document (a letterhead or footer on every page)
+    yields one event, at its first mention.  Each event records where that
+    mention is: ``page`` counts from 1 over the ``PAGE_SEPARATOR``-joined
+    pages the unpacker stores, and ``offset`` is the character offset within
+    that page.
+    """
+    events = []
+    seen = set()
+    for page_number, page in enumerate(text.split(PAGE_SEPARATOR), 1):
+        for value, start, end in find_dates(page):
+            if value in seen:
+                continue
+            seen.add(value)
+            events.append({'date': value, 'description': context(page, start, end), 'type': TEXT_EVENT_TYPE,
+                           'path': file, 'page': page_number, 'offset': start})
+    return events
+
+
+def _extract(record):
+    return extract_events(*record)
+
+
+def open_digests(store_path):
+    """Open the text digests of the documents the text store holds events for."""
+    os.makedirs(store_path, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(store_path, DIGESTS), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def update_text_store(store, records, workers=None, batch_size=BATCH_SIZE):
+    """Extract events from ``(file, text)`` records into ``store``, skipping unchanged texts.
+
+    Changed documents are handed to a process pool a batch at a time and
+    each batch's events are added to the store as one sorted run, with a
+    tombstone dropping the documents' previous events.  Documents no longer
+    in ``records`` lose their events.
+
+    Returns:
+        ``(documents, events)``: the number of documents (re-)extracted and
+        of events added.
+    """
+    conn = open_digests(store.path)
+    digests = DocumentDigests(conn)
+    documents = added = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        for changed in digests.changed(records, batch_size):
+            texts = [(file, text) for file, _, text in changed]
+            results = pool.map(_extract, texts, chunksize=16) if pool else map(_extract, texts)
+            events = [event for found in results for event in found]
+            added += store.update(events, removed=[file for file, _ in texts])
+            # Digests are saved after the events, so an interrupted run
+            # re-extracts the batch; the tombstone makes that harmless.
+            digests.save((file, digest) for file, digest, _ in changed)
+            documents += len(changed)
+        gone = digests.gone()
+        if gone:
+            store.update(removed=gone)
+            digests.forget(gone)
+    finally:
+        if pool:
+            pool.shutdown()
+        conn.close()
+    return documents, added
+
+
+def extract_timeline_events(results_path=RESULTS_FILE, output=TIMELINE_OUTPUT, store_path=None, workers=None):
+    """Add the dates mentioned in the OCR text to the timeline.
+
+    Every date written in a document, in ISO, US numeric or spelled-out
+    form, becomes an event described by its sentence and carrying its
+    file, page and offset.  The events are kept in the text store (by
+    default ``timeline_text_store`` beside ``output``), and the timeline is
+    re-exported to ``output`` and its columns, from which the schedule,
+    warboards and fusion timeline read.
+
+    Returns:
+        The number of events added.
+    """
+    if not Path(results_path).exists():
+        print(f'No OCR results at {results_path}; run the unpacker first.')
+        return 0
+    store = TimelineStore(store_path or beside(output, TEXT_STORE))
+    documents, added = update_text_store(store, result_texts(results_path), workers)
+    count = export_timeline(output, text_store_path=store.path)
+    print(f'Extracted {added} dated events from {documents} changed documents; '
+          f'timeline written to {output} with {count} events')
+    return added
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Add the dates mentioned in the OCR text to the timeline')
+    parser.add_argument('--results', default=str(RESULTS_FILE), help='Unpacker result store (epoch_results.jsonl)')
+    parser.add_argument('--output', default=TIMELINE_OUTPUT, help='Timeline JSON to export')
+    parser.add_argument('--store', help='Text event store (default: timeline_text_store beside --output)')
+    parser.add_argument('--workers', type=int, help='Extraction processes (default: one per CPU)')
+    args = parser.parse_args()
+    extract_timeline_events(args.results, args.output, args.store, args.workers)
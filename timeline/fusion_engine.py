@@ -1,11 +1,15 @@
 import json
 import os
-from datetime import datetime
+
+from timeline.columnar import DEFAULT_COLUMNS, load_events, write_columns
+from timeline.store import keyed, merge_sorted
+from warboard.lod_renderer import MAX_DETAIL_EVENTS, EventList, render_dates
 
 BASE_DIR = os.getenv('LEGAL_RESULTS_DIR', os.path.join('F:/', 'LegalResults'))
 OUTPUT_DIR = os.path.join(BASE_DIR, 'TIMELINES')
 FUSION_JSON = os.path.join(OUTPUT_DIR, 'timeline_fusion_shady_oaks.json')
 FUSION_SVG = os.path.join(OUTPUT_DIR, 'shady_oaks_timeline_fusion.svg')
+FUSION_COLUMNS = os.path.join(OUTPUT_DIR, 'timeline_fusion_columns')
 
 DEFAULT_EVENTS = [
     {'date': '2025-02-01', 'description': 'EGLE sewer contamination begins', 'type': 'Environmental', 'entity': 'HOA'},
@@ -15,15 +19,26 @@ DEFAULT_EVENTS = [
 ]
 
 TIMELINE_FILE = os.path.join('data', 'timeline.json')
+TIMELINE_COLUMNS = DEFAULT_COLUMNS
 
 
 def merge_events(existing, new):
-    merged = existing + new
-    merged.sort(key=lambda x: datetime.fromisoformat(x['date']))
-    return merged
+    """Merge ``new`` events into the date-sorted ``existing`` timeline.
+
+    Only the new events are sorted; the two lists are then merged in one
+    pass, with each date parsed once.
+    """
+    new = [event for _, event in sorted(keyed(new), key=lambda item: item[0])]
+    return list(merge_sorted(existing, new))
 
 
 def write_svg(events, path):
+    if len(events) > MAX_DETAIL_EVENTS:
+        # One node per event stops being readable long before this; draw
+        # the density overview instead.
+        with open(path, 'w') as f:
+            f.write(render_dates(EventList(events)))
+        return
     lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="600">',
              '<style>text{font-size:12px;}</style>']
     for i, e in enumerate(events):
@@ -38,14 +53,12 @@ def write_svg(events, path):
 
 
 def build_fusion_timeline():
-    existing = []
-    if os.path.exists(TIMELINE_FILE):
-        with open(TIMELINE_FILE, 'r') as f:
-            existing = json.load(f)
+    existing = load_events(columns_path=TIMELINE_COLUMNS, timeline_file=TIMELINE_FILE)
     events = merge_events(existing, DEFAULT_EVENTS)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     with open(FUSION_JSON, 'w') as f:
         json.dump(events, f, indent=2)
+    write_columns(events, FUSION_COLUMNS)
     write_svg(events, FUSION_SVG)
     print(f'Fusion timeline saved to {FUSION_JSON} and {FUSION_SVG}')
 
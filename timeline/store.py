@@ -0,0 +1,206 @@
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+
+from modules.atomic_write import atomic_open, write_json_array
+
+DEFAULT_STORE = os.path.join('data', 'timeline_store')
+MANIFEST = 'manifest.json'
+STORE_VERSION = 1
+# After a batch is added, the newest two runs are merged while the older is
+# no more than this many times larger, so run sizes grow geometrically and a
+# timeline of n events is spread over O(log n) runs.
+MERGE_RATIO = 4
+MAX_RUNS = 16
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Layout of a store directory:
+#   manifest.json   {"version": 1, "next": n, "runs": [{"name": ..., "count": n, "removed": bool}, ...]}
+#   run-000001.tl   one event per line as "<epoch key>\t<event json>", sorted by key
+#   run-000001.del  JSON list of paths whose events in *older* runs are dropped
+# Runs are listed oldest first; for equal keys older runs come first.
+
+
+def epoch_key(date):
+    """Integer sort key of an ISO date(-time): microseconds since 1970, zone ignored.
+
+    Event dates are naive local times, so only their order matters.
+    """
+    moment = datetime.fromisoformat(date)
+    if moment.tzinfo is not None:
+        moment = moment.replace(tzinfo=None)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def keyed(events):
+    """Decorate events with their epoch keys, parsing each date once."""
+    return [(epoch_key(event['date']), event) for event in events]
+
+
+def merge_sorted(*streams):
+    """K-way merge of already sorted event lists by date, parsing each date once."""
+    merged = heapq.merge(*(((epoch_key(e['date']), i, e) for e in stream) for i, stream in enumerate(streams)))
+    return (event for _, _, event in merged)
+
+
+class TimelineStore:
+    """Timeline events kept sorted on disk as a stack of sorted runs.
+
+    Adding a batch sorts it in memory and writes it as a new run, and reads
+    k-way merge the runs with a heap; existing events are never re-sorted
+    or rewritten on insert.  Removing a file's events writes a tombstone
+    with the batch instead of touching older runs.  Small runs are merged
+    as they accumulate, so the number of runs stays logarithmic in the size
+    of the timeline.
+    """
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = str(path)
+        manifest = os.path.join(self.path, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest, 'r') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'version': STORE_VERSION, 'next': 1, 'runs': []}
+
+    @property
+    def runs(self):
+        return self.manifest['runs']
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, MANIFEST))
+
+    def _file(self, name, suffix):
+        return os.path.join(self.path, f'{name}.{suffix}')
+
+    def _new_name(self):
+        name = f"run-{self.manifest['next']:06d}"
+        self.manifest['next'] += 1
+        return name
+
+    def _write_atomic(self, path, lines):
+        count = 0
+        with atomic_open(path) as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        return count
+
+    def _save_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._write_atomic(os.path.join(self.path, MANIFEST), [json.dumps(self.manifest)])
+
+    def _write_run(self, keyed_events, removed=()):
+        os.makedirs(self.path, exist_ok=True)
+        name = self._new_name()
+        count = self._write_atomic(self._file(name, 'tl'),
+                                   (f'{key}\t{json.dumps(event)}\n' for key, event in keyed_events))
+        removed = sorted(set(removed))
+        if removed:
+            self._write_atomic(self._file(name, 'del'), [json.dumps(removed)])
+        return {'name': name, 'count': count, 'removed': bool(removed)}
+
+    def _removed(self, run):
+        if not run['removed']:
+            return set()
+        with open(self._file(run['name'], 'del'), 'r') as f:
+            return set(json.load(f))
+
+    def _read_run(self, run, dropped):
+        with open(self._file(run['name'], 'tl'), 'r') as f:
+            for line in f:
+                key, body = line.split('\t', 1)
+                if dropped and json.loads(body).get('path') in dropped:
+                    continue
+                yield int(key), line
+
+    def _delete_run(self, run):
+        for suffix in ('tl', 'del'):
+            try:
+                os.remove(self._file(run['name'], suffix))
+            except FileNotFoundError:
+                pass
+
+    def iter_lines(self, runs=None):
+        """Yield the stored lines of ``runs`` (default all) in key order, tombstones applied."""
+        runs = self.runs if runs is None else runs
+        streams = []
+        dropped = set()
+        for run in reversed(runs):
+            streams.append(self._read_run(run, frozenset(dropped)))
+            dropped |= self._removed(run)
+        streams.reverse()
+        for _, line in heapq.merge(*streams, key=lambda item: item[0]):
+            yield line
+
+    def events(self):
+        """Stream every event in date order."""
+        for line in self.iter_lines():
+            yield json.loads(line.split('\t', 1)[1])
+
+    def replace(self, events, presorted=False):
+        """Replace the whole timeline with ``events``.
+
+        With ``presorted`` the events are streamed straight to disk, so a
+        timeline of any size can be rebuilt in constant memory.
+
+        Raises:
+            ValueError: If ``presorted`` events are out of order.
+        """
+        def checked():
+            last = None
+            for event in events:
+                key = epoch_key(event['date'])
+                if last is not None and key < last:
+                    raise ValueError(f"event dated {event['date']} is out of order")
+                last = key
+                yield key, event
+
+        old = list(self.runs)
+        items = checked() if presorted else sorted(keyed(events), key=lambda item: item[0])
+        self.manifest['runs'] = [self._write_run(items)]
+        self._save_manifest()
+        for run in old:
+            self._delete_run(run)
+        return self.runs[0]['count']
+
+    def update(self, events=(), removed=()):
+        """Add a batch of events, first dropping the events of the ``removed`` paths.
+
+        The batch is sorted in memory and written as one new run; the cost
+        depends on the batch, not on the size of the timeline.
+
+        Returns:
+            The number of events added.
+        """
+        items = sorted(keyed(events), key=lambda item: item[0])
+        if not items and not removed:
+            return 0
+        self.runs.append(self._write_run(items, removed))
+        self._compact()
+        self._save_manifest()
+        return len(items)
+
+    def _compact(self):
+        runs = self.runs
+        while len(runs) > 1 and (runs[-2]['count'] <= MERGE_RATIO * runs[-1]['count'] or len(runs) > MAX_RUNS):
+            older, newer = runs[-2], runs[-1]
+            # The merged run stands in for both, so it carries both sets of
+            # tombstones for the runs below it; the oldest run needs none.
+            removed = self._removed(older) | self._removed(newer) if len(runs) > 2 else ()
+            name = self._new_name()
+            count = self._write_atomic(self._file(name, 'tl'), self.iter_lines([older, newer]))
+            if removed:
+                self._write_atomic(self._file(name, 'del'), [json.dumps(sorted(removed))])
+            runs[-2:] = [{'name': name, 'count': count, 'removed': bool(removed)}]
+            self._save_manifest()
+            self._delete_run(older)
+            self._delete_run(newer)
+
+
+def write_events(events, output):
+    """Stream events to ``output`` as an indented JSON array, replacing it atomically once complete."""
+    return write_json_array(events, output)
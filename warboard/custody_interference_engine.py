@@ -1,8 +1,7 @@
 import os
 import json
 from docx import Document
-from .svg_builder import generate_svg_warboard
-from .svg_motion_binder import bind_motion_links
+from .svg_renderer import render_warboard
 
 CUSTODY_EVENTS = [
     {"date": "2024-03-26", "description": "Parenting time blocked"},
@@ -24,8 +23,7 @@ def build_custody_warboard():
         doc.add_paragraph(f"{e['date']} - {e['description']}")
     doc.save(DOCX_EXPORT)
 
-    generate_svg_warboard(svg_path=SVG_EXPORT, events=CUSTODY_EVENTS)
-    bind_motion_links(svg_path=SVG_EXPORT)
+    render_warboard(events=CUSTODY_EVENTS, svg_path=SVG_EXPORT)
     print(f'Custody interference map generated at {DOCX_EXPORT}')
 
 
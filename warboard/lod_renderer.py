@@ -0,0 +1,207 @@
+import os
+import shutil
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+from modules.atomic_write import atomic_open
+from timeline.columnar import DEFAULT_COLUMNS, META, ColumnarTimeline, to_datetime64
+from timeline.store import keyed
+
+DEFAULT_TILES = os.path.join('warboard', 'exports', 'tiles')
+WIDTH = 2000
+HEIGHT = 600
+MARGIN = 50
+# A window with at most this many events draws each one; a busier window
+# draws one density bar per time bin instead.  Either way a tile holds a
+# few hundred nodes however long the timeline is.
+MAX_DETAIL_EVENTS = 200
+TILE_BINS = 200
+# Each level halves the time a tile covers; 2**30 tiles split even a
+# century into spans of a few seconds.
+MAX_LEVEL = 30
+LANES = 4
+TICKS = 8
+LABEL_CHARS = 45
+STAMP = 'stamp'
+
+
+class EventList:
+    """An in-memory list of events with the ``keys``/``event`` interface of ``ColumnarTimeline``."""
+
+    def __init__(self, events):
+        items = sorted(keyed(events), key=lambda item: item[0])
+        self.events = [event for _, event in items]
+        self.keys = np.fromiter((key for key, _ in items), dtype=np.int64, count=len(items))
+
+    def __len__(self):
+        return len(self.events)
+
+    def event(self, i):
+        return self.events[i]
+
+
+def full_span(keys):
+    """The ``[start, end)`` key range covering every event, padded to at least a day."""
+    if not len(keys):
+        return 0, 86_400_000_000
+    start, end = int(keys[0]), int(keys[-1]) + 1
+    return start, max(end, start + 86_400_000_000)
+
+
+def tile_span(keys, level, x):
+    """The ``[start, end)`` key range of tile ``x`` of the ``2**level`` tiles at ``level``."""
+    start, end = full_span(keys)
+    tiles = 1 << level
+    width = (end - start) / tiles
+    return start + int(width * x), end if x == tiles - 1 else start + int(width * (x + 1))
+
+
+def day(key):
+    return str(np.datetime64(int(key), 'us').astype('datetime64[D]'))
+
+
+def render_window(source, start, end, link=None, width=WIDTH, height=HEIGHT):
+    """Render the events keyed in ``[start, end)`` as one bounded SVG document.
+
+    Args:
+        source: A ``ColumnarTimeline`` or ``EventList``.
+        start, end: ``epoch_key`` bounds of the window.
+        link: Optional callable returning an href for an event, or ``None``;
+            linked events are wrapped in an ``<a>`` in the detailed view.
+
+    Returns:
+        The SVG text.
+    """
+    keys = source.keys
+    lo = int(np.searchsorted(keys, start, side='left'))
+    hi = int(np.searchsorted(keys, end, side='left'))
+    plot = width - 2 * MARGIN
+    scale = plot / max(end - start, 1)
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{width}" height="{height}">',
+        '<style>text{font-size:12px;}</style>',
+        f'<text x="{MARGIN}" y="30">{hi - lo} events, {day(start)} to {day(end - 1)}</text>',
+    ]
+    axis = height - 60
+    lines.append(f'<line x1="{MARGIN}" y1="{axis}" x2="{width - MARGIN}" y2="{axis}" stroke="#999" />')
+    for tick in range(TICKS + 1):
+        x = MARGIN + plot * tick // TICKS
+        lines.append(f'<text x="{x - 30}" y="{axis + 20}">{day(start + (end - start) * tick // TICKS)}</text>')
+
+    if hi - lo <= MAX_DETAIL_EVENTS:
+        for j, i in enumerate(range(lo, hi)):
+            event = source.event(i)
+            x = MARGIN + int((int(keys[i]) - start) * scale)
+            y = 100 + (j % LANES) * 80
+            href = link(event) if link else None
+            if href:
+                lines.append(f'<a xlink:href={quoteattr(href)}>')
+            lines.append(f'<circle cx="{x}" cy="{y}" r="20" fill="#4f46e5" />')
+            if href:
+                lines.append('</a>')
+            lines.append(f'<text x="{x - 40}" y="{y + 35}">{escape(event.get("date", "")[:10])}</text>')
+            lines.append(f'<text x="{x - 40}" y="{y + 50}">{escape(event.get("description", "")[:LABEL_CHARS])}</text>')
+    else:
+        bins = ((keys[lo:hi] - start) * TILE_BINS) // (end - start)
+        counts = np.bincount(bins, minlength=TILE_BINS)[:TILE_BINS]
+        tallest = int(counts.max())
+        bar = plot / TILE_BINS
+        room = axis - 60
+        for b in np.flatnonzero(counts):
+            count = int(counts[b])
+            h = max(1, round(room * count / tallest))
+            x = MARGIN + b * bar
+            first = start + (end - start) * int(b) // TILE_BINS
+            lines.append(f'<rect x="{x:.1f}" y="{axis - h}" width="{max(bar - 1, 1):.1f}" height="{h}" fill="#4f46e5">'
+                         f'<title>{count} events from {day(first)}</title></rect>')
+
+    lines.append('</svg>')
+    return '\n'.join(lines)
+
+
+def render_dates(source, start=None, end=None, link=None):
+    """Render the events dated in ``[start, end)`` (ISO dates; ``None`` for the timeline's own ends)."""
+    first, last = full_span(source.keys)
+    lo = first if start is None else int(to_datetime64(start).astype(np.int64))
+    hi = last if end is None else int(to_datetime64(end).astype(np.int64))
+    return render_window(source, lo, max(hi, lo + 1), link=link)
+
+
+def write_svg(svg, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with atomic_open(path) as f:
+        f.write(svg)
+
+
+class TiledWarboard:
+    """A zoomable warboard rendered as a pyramid of SVG tiles, each on first request.
+
+    Level 0 is one tile spanning the timeline; level ``z`` splits it into
+    ``2**z`` tiles of equal time.  Tiles are cached in numbered level
+    directories under ``tiles_dir`` and thrown away when ``stamp`` (a
+    fingerprint of the timeline) changes, so only the tiles somebody looks at
+    are ever rendered.  Nothing else in ``tiles_dir`` is touched.
+    """
+
+    def __init__(self, source, tiles_dir=DEFAULT_TILES, stamp='', link=None):
+        self.source = source
+        self.tiles_dir = str(tiles_dir)
+        self.link = link
+        stamp_path = os.path.join(self.tiles_dir, STAMP)
+        current = None
+        if os.path.exists(stamp_path):
+            with open(stamp_path, 'r') as f:
+                current = f.read()
+        if current != stamp:
+            os.makedirs(self.tiles_dir, exist_ok=True)
+            for name in os.listdir(self.tiles_dir):
+                level_dir = os.path.join(self.tiles_dir, name)
+                if name.isdigit() and os.path.isdir(level_dir):
+                    shutil.rmtree(level_dir, ignore_errors=True)
+            with open(stamp_path, 'w') as f:
+                f.write(stamp)
+
+    @classmethod
+    def from_columns(cls, columns_path=DEFAULT_COLUMNS, tiles_dir=DEFAULT_TILES, link=None):
+        """Open the tiles for the timeline columns, keyed to their ``meta.json``."""
+        meta = os.stat(os.path.join(str(columns_path), META))
+        return cls(ColumnarTimeline(columns_path), tiles_dir, f'{meta.st_mtime_ns}:{meta.st_size}', link)
+
+    def tile(self, level, x):
+        """Return the path of tile ``x`` at ``level``, rendering it if it is not cached.
+
+        Raises:
+            ValueError: If there is no such tile.
+        """
+        if not 0 <= level <= MAX_LEVEL or not 0 <= x < 1 << level:
+            raise ValueError(f'no tile {x} at level {level}')
+        path = os.path.join(self.tiles_dir, str(level), f'{x}.svg')
+        if not os.path.exists(path):
+            write_svg(render_window(self.source, *tile_span(self.source.keys, level, x), link=self.link), path)
+        return path
+
+    def locate(self, start, end):
+        """Return ``(level, x)`` of the deepest tile containing the key range ``[start, end)``."""
+        keys = self.source.keys
+        level, x = 0, 0
+        while level < MAX_LEVEL:
+            child = 2 * x if start < tile_span(keys, level + 1, 2 * x)[1] else 2 * x + 1
+            lo, hi = tile_span(keys, level + 1, child)
+            if not (lo <= start and end <= hi):
+                break
+            level, x = level + 1, child
+        return level, x
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render a warboard tile from the timeline columns')
+    parser.add_argument('--columns', default=DEFAULT_COLUMNS, help='Column directory')
+    parser.add_argument('--tiles', default=DEFAULT_TILES, help='Tile cache directory')
+    parser.add_argument('--level', type=int, default=0, help='Zoom level (0 is the whole timeline)')
+    parser.add_argument('--x', type=int, default=0, help='Tile index within the level')
+    args = parser.parse_args()
+    print(TiledWarboard.from_columns(args.columns, args.tiles).tile(args.level, args.x))
@@ -1,7 +1,6 @@
 import os
 from docx import Document
-from .svg_builder import generate_svg_warboard
-from .svg_motion_binder import bind_motion_links
+from .svg_renderer import render_warboard
 
 PPO_EVENTS = [
     {"date": "2023-10-15", "description": "Emily Watson filed false welfare call"},
@@ -28,8 +27,7 @@ def build_ppo_warboard():
         doc.add_paragraph(f"{date} - {desc}")
     doc.save(DOCX_EXPORT)
 
-    generate_svg_warboard(events=PPO_EVENTS, svg_path=SVG_EXPORT)
-    bind_motion_links(svg_path=SVG_EXPORT)
+    render_warboard(events=PPO_EVENTS, svg_path=SVG_EXPORT)
     print(f'PPO warboard generated at {DOCX_EXPORT}')
 
 
@@ -0,0 +1,131 @@
+import os
+from collections.abc import Mapping
+from xml.sax.saxutils import escape, quoteattr
+
+from modules.atomic_write import atomic_open
+from timeline.columnar import DEFAULT_COLUMNS, ColumnarTimeline, has_timeline, load_events
+from warboard.lod_renderer import MAX_DETAIL_EVENTS, EventList, render_dates, write_svg
+
+DEFAULT_SVG_EXPORT = os.path.join('warboard', 'exports', 'SHADY_OAKS_WARBOARD.svg')
+TIMELINE_FILE = os.path.join('data', 'timeline.json')
+TIMELINE_COLUMNS = DEFAULT_COLUMNS
+BASE_RESULTS_DIR = os.getenv('LEGAL_RESULTS_DIR', os.path.join('F:/', 'LegalResults'))
+MOTION_DIR = os.path.join(BASE_RESULTS_DIR, 'motions')
+
+WIDTH = 2200
+HEIGHT = 1000
+LANES = 4
+LABEL_CHARS = 45
+
+
+def motion_path(motion):
+    """``file:`` URL of the DOCX drafted for the motion titled ``motion``."""
+    href = os.path.join(MOTION_DIR, motion.replace(' ', '_') + '.docx')
+    return 'file:///' + href.replace('\\', '/')
+
+
+def motion_href(event):
+    """Link to the DOCX of the event's first linked motion, or ``None``."""
+    motions = event.get('linked_motions', [])
+    return motion_path(motions[0]) if motions else None
+
+
+def link_resolver(links=None):
+    """Turn a motion-link map into a function from event to href.
+
+    ``links`` may be ``None`` (use each event's ``linked_motions``), a
+    callable returning an href or ``None``, or a mapping from event
+    description to motion title; unmapped events fall back to their
+    ``linked_motions``.
+    """
+    if links is None:
+        return motion_href
+    if callable(links):
+        return links
+    if isinstance(links, Mapping):
+        def resolve(event):
+            motion = links.get(event.get('description'))
+            return motion_path(motion) if motion else motion_href(event)
+        return resolve
+    raise TypeError(f'motion links must be a mapping or callable, not {type(links).__name__}')
+
+
+def event_lines(events, count, link):
+    """Yield the SVG lines for ``count`` events, one circle and two labels each."""
+    spacing = max(100, 2000 // max(count, 1))
+    yield f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" ' \
+          f'width="{WIDTH}" height="{HEIGHT}">'
+    yield '<style>text{font-size:12px;}</style>'
+    for i, event in enumerate(events):
+        x = 100 + i * spacing
+        y = 100 + (i % LANES) * 120
+        href = link(event)
+        circle = f'<circle cx="{x}" cy="{y}" r="20" fill="#4f46e5" />'
+        yield f'<a xlink:href={quoteattr(href)}>{circle}</a>' if href else circle
+        yield f'<text x="{x - 40}" y="{y + 35}">{escape(event.get("date", "")[:10])}</text>'
+        yield f'<text x="{x - 40}" y="{y + 55}">{escape(event.get("description", "")[:LABEL_CHARS])}</text>'
+    yield '</svg>'
+
+
+def write_lines(lines, path):
+    """Stream ``lines`` to ``path`` and replace it atomically once complete."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with atomic_open(path) as f:
+        for i, line in enumerate(lines):
+            f.write(f'\n{line}' if i else line)
+
+
+def render_warboard(events=None, svg_path=DEFAULT_SVG_EXPORT, links=None, start=None, end=None):
+    """Render the warboard SVG, motion links included, in one pass.
+
+    Parameters
+    ----------
+    events : list[dict] | None
+        Events with ``date`` and ``description`` keys.  When ``None`` the
+        timeline is read once, from ``TIMELINE_COLUMNS`` or, if the columns
+        have not been built, ``TIMELINE_FILE``.
+    svg_path : str
+        Destination path for the SVG file.
+    links : Mapping | callable | None
+        Motion-link map; see ``link_resolver``.
+    start, end : str | None
+        ISO dates bounding the timeline events drawn, ``start`` inclusive
+        and ``end`` exclusive.
+
+    More than ``MAX_DETAIL_EVENTS`` events are drawn as the density
+    overview of ``warboard.lod_renderer``, whose zoomed-in tiles carry the
+    links.
+
+    Returns
+    -------
+    int | None
+        The number of events drawn, or ``None`` if there is no timeline.
+    """
+    link = link_resolver(links)
+    if events is None:
+        if not has_timeline(TIMELINE_COLUMNS, TIMELINE_FILE):
+            print('Timeline file not found; cannot build SVG warboard.')
+            return None
+        if ColumnarTimeline.exists(TIMELINE_COLUMNS):
+            timeline = ColumnarTimeline(TIMELINE_COLUMNS)
+            lo, hi = timeline.window(start, end)
+            if hi - lo > MAX_DETAIL_EVENTS:
+                write_svg(render_dates(timeline, start, end, link=link), svg_path)
+                print(f'SVG warboard overview of {hi - lo} events saved to {svg_path}')
+                return hi - lo
+            # Decoded straight from the columns as they are written out.
+            write_lines(event_lines(timeline.events(start, end), hi - lo, link), svg_path)
+            print(f'SVG warboard saved to {svg_path}')
+            return hi - lo
+        events = load_events(start, end, TIMELINE_COLUMNS, TIMELINE_FILE)
+    if len(events) > MAX_DETAIL_EVENTS:
+        write_svg(render_dates(EventList(events), link=link), svg_path)
+        print(f'SVG warboard overview of {len(events)} events saved to {svg_path}')
+        return len(events)
+    write_lines(event_lines(events, len(events), link), svg_path)
+    print(f'SVG warboard saved to {svg_path}')
+    return len(events)
+
+
+if __name__ == '__main__':
+    render_warboard()
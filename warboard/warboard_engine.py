@@ -8,16 +8,18 @@ results to Google Drive. Can be executed as a module or script."""
 # Import using an absolute path so execution as a script works as well
 from scanner.scan_engine import run_scan
 from timeline.builder import build_timeline
+from timeline.columnar import DEFAULT_COLUMNS, has_timeline, load_events
 from contradictions.contradiction_matrix import detect_contradictions
-from warboard.svg_builder import generate_svg_warboard
-from warboard.svg_motion_binder import bind_motion_links
+from warboard.svg_renderer import render_warboard
 from gdrive_sync import upload_to_drive
 
 DOCX_EXPORT = os.path.join('warboard', 'exports', 'SHADY_OAKS_WARBOARD.docx')
 SVG_EXPORT = os.path.join('warboard', 'exports', 'SHADY_OAKS_WARBOARD.svg')
 
 TIMELINE_FILE = os.path.join('data', 'timeline.json')
+TIMELINE_COLUMNS = DEFAULT_COLUMNS
 CONTRADICTIONS_FILE = os.path.join('data', 'contradiction_matrix.json')
+MAX_LISTED_FILES = 20
 
 
 def build_warboard_docx():
@@ -25,9 +27,8 @@ def build_warboard_docx():
     doc = Document()
     doc.add_heading('SHADY OAKS WARBOARD', 0)
 
-    if os.path.exists(TIMELINE_FILE):
-        with open(TIMELINE_FILE, 'r') as f:
-            timeline = json.load(f)
+    if has_timeline(TIMELINE_COLUMNS, TIMELINE_FILE):
+        timeline = load_events(columns_path=TIMELINE_COLUMNS, timeline_file=TIMELINE_FILE)
         doc.add_heading('Timeline of Events', level=1)
         for event in timeline:
             date = event.get('date', '')[:10]
@@ -39,10 +40,23 @@ def build_warboard_docx():
             contradictions = json.load(f)
         doc.add_heading('Contradictions', level=1)
         for c in contradictions:
-            a = os.path.basename(c.get('file_a', ''))
-            b = os.path.basename(c.get('file_b', ''))
             contr = c.get('contradiction', '')
-            doc.add_paragraph(f"{a} vs {b}: {contr}")
+            if 'files' not in c:
+                a = os.path.basename(c.get('file_a', ''))
+                b = os.path.basename(c.get('file_b', ''))
+                doc.add_paragraph(f"{a} vs {b}: {contr}")
+                continue
+            if 'similarity' in c:
+                label = f"{c['similarity']:.0%} similar text"
+            elif 'label' in c:
+                label = f"{c['label']} {c['kind']}" + (f" ({c['entity']})" if c.get('entity') else '')
+            else:
+                label = c.get('basename') or f"{c.get('hash', '')[:12]} ({c.get('size')} bytes)"
+            paths = [f"{f['path']} = {f['value']}" if 'value' in f else f['path'] for f in c['files']]
+            shown = ', '.join(paths[:MAX_LISTED_FILES])
+            if len(paths) > MAX_LISTED_FILES:
+                shown += f' and {len(paths) - MAX_LISTED_FILES} more'
+            doc.add_paragraph(f"{label}: {contr} ({len(paths)} files: {shown})")
 
     os.makedirs(os.path.dirname(DOCX_EXPORT), exist_ok=True)
     doc.save(DOCX_EXPORT)
@@ -50,13 +64,12 @@ def build_warboard_docx():
 
 
 def deploy_supra_warboard():
-    """Run full scan, timeline generation, warboard build, and optional upload."""
-    run_scan()
-    build_timeline()
-    detect_contradictions()
+    """Run an incremental scan, update the timeline and contradictions, build the warboard and optionally upload."""
+    changes = run_scan(incremental=True)
+    build_timeline(changes=changes)
+    detect_contradictions(changes=changes)
     build_warboard_docx()
-    generate_svg_warboard(svg_path=SVG_EXPORT)
-    bind_motion_links(svg_path=SVG_EXPORT)
+    render_warboard(svg_path=SVG_EXPORT)
     if os.path.exists('token.json'):
         upload_to_drive(DOCX_EXPORT)
         upload_to_drive(SVG_EXPORT)